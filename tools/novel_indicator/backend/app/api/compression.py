@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import Any
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install "novel-indicator-backend[compression]"
+    zstandard = None
+
+# Bodies that are already compressed, or event streams that must reach the client chunk by chunk.
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "application/gzip", "application/zip", "image/", "audio/", "video/", "font/")
+
+
+def accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() != encoding:
+            continue
+        q = params.strip().removeprefix("q=")
+        try:
+            return not params or float(q) > 0.0
+        except ValueError:
+            return True
+    return False
+
+
+def preferred_encoding(accept_encoding: str) -> str | None:
+    if zstandard is not None and accepts_encoding(accept_encoding, "zstd"):
+        return "zstd"
+    if accepts_encoding(accept_encoding, "gzip"):
+        return "gzip"
+    return None
+
+
+def encode_body(body: bytes, encoding: str, gzip_level: int = 6, zstd_level: int = 3) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=zstd_level).compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+def _stream_compressor(encoding: str, gzip_level: int, zstd_level: int) -> tuple[Any, int]:
+    # A compressobj plus the flush mode that ends a block without ending the stream.
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=zstd_level).compressobj(), zstandard.COMPRESSOBJ_FLUSH_BLOCK
+    return zlib.compressobj(gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16), zlib.Z_SYNC_FLUSH
+
+
+class _CompressingSend:
+    # Holds back http.response.start until the first body chunk shows whether the response is worth
+    # compressing, then encodes every chunk with one streaming compressor.
+    def __init__(self, send: Send, encoding: str, minimum_size: int, gzip_level: int, zstd_level: int) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self.start: Message | None = None
+        self.passthrough = False
+        self.compressor: Any = None
+        self.flush_mode = 0
+
+    async def __call__(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            self.passthrough = (
+                "content-encoding" in headers or message["status"] == 206 or media_type.startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if kind != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is None:
+            await self.send({**message, "body": self._compress(body, more_body)})
+            return
+        if not more_body and len(body) < self.minimum_size:
+            self.passthrough = True
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        start, self.start = self.start, None
+        self.compressor, self.flush_mode = _stream_compressor(self.encoding, self.gzip_level, self.zstd_level)
+        data = self._compress(body, more_body)
+        headers = MutableHeaders(raw=start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body or start.get("trailers", False):
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(data))
+        await self.send(start)
+        await self.send({**message, "body": data})
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if more_body:
+            return self.compressor.compress(body) + self.compressor.flush(self.flush_mode)
+        return self.compressor.compress(body) + self.compressor.flush()
+
+    async def _flush_start(self) -> None:
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
+
+
+class CompressionMiddleware:
+    # Gzip for every client that asks for it; zstd is preferred when the zstandard package is installed and
+    # the client lists it in Accept-Encoding. Small bodies, partial content, event streams and already-encoded
+    # bodies pass through untouched. Plain ASGI on purpose: Starlette's gzip responder internals change
+    # between releases.
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, zstd_level: int = 3) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = preferred_encoding(Headers(scope=scope).get("Accept-Encoding", "")) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        sender = _CompressingSend(send, encoding, self.minimum_size, self.gzip_level, self.zstd_level)
+        await self.app(scope, receive, sender)
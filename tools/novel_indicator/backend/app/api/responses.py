@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import orjson
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from app.api.compression import encode_body, preferred_encoding
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class OrjsonResponse(JSONResponse):
+    # App-wide default response class; NaN/inf become null instead of producing invalid JSON.
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    version: str
+    etag: str
+    body: bytes
+    encoded: dict[str, bytes] = field(default_factory=dict, compare=False)
+
+
+def body_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def cached_json_response(cached: CachedBody, request: Request, cache: PayloadCache) -> Response:
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("If-None-Match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    encoding = preferred_encoding(request.headers.get("Accept-Encoding", ""))
+    if encoding is None or len(cached.body) < cache.min_compress_bytes:
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+    # Pre-encoded bodies carry Content-Encoding, so the compression middleware passes them through as-is.
+    headers["Content-Encoding"] = encoding
+    return Response(content=cache.encoded(cached, encoding), media_type="application/json", headers=headers)
+
+
+class PayloadCache:
+    # LRU of pre-serialized response bodies. Entries carry the version they were built from (e.g. the row's
+    # updated_at), so a rewrite of the underlying row is picked up on the next lookup without explicit eviction.
+    # Compressed variants are built on first request per encoding and live as long as the entry.
+    def __init__(
+        self,
+        max_entries: int = 64,
+        min_compress_bytes: int = 1024,
+        gzip_level: int = 6,
+        zstd_level: int = 3,
+    ) -> None:
+        self.max_entries = max(1, max_entries)
+        self.min_compress_bytes = min_compress_bytes
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+        self._entries: OrderedDict[tuple[str, ...], CachedBody] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, ...], version: str, build: Callable[[], bytes]) -> CachedBody:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached.version == version:
+                self._entries.move_to_end(key)
+                return cached
+        body = build()
+        cached = CachedBody(version=version, etag=body_etag(body), body=body)
+        with self._lock:
+            self._entries[key] = cached
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return cached
+
+    def encoded(self, cached: CachedBody, encoding: str) -> bytes:
+        body = cached.encoded.get(encoding)
+        if body is None:
+            body = encode_body(cached.body, encoding, gzip_level=self.gzip_level, zstd_level=self.zstd_level)
+            cached.encoded[encoding] = body
+        return body
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -1,37 +1,72 @@
 ﻿from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
 import json
+import sqlite3
+import time
 import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime
-
-from fastapi import APIRouter, Depends, HTTPException
-
-from app.core.container import get_binance_client, get_db, get_run_manager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+
+from app.api.responses import ORJSON_OPTIONS, PayloadCache, body_etag, cached_json_response
+from app.core.container import (
+    get_binance_client,
+    get_cube_query_service,
+    get_db,
+    get_live_service,
+    get_payload_cache,
+    get_report_service,
+    get_run_manager,
+    get_store,
+)
 from app.core.schemas import (
+    CubeQuery,
+    CubeQueryResult,
     ExportConfig,
+    LiveBarBatch,
+    LiveForecastBatch,
+    LiveSessionStatus,
     PineBundle,
     PlotPayload,
     ReportArtifact,
     ResultSummary,
     RunConfig,
     RunCreated,
+    RunPriorityEnum,
+    RunProfile,
+    RunQueue,
     RunStageEnum,
     RunStageLog,
     RunStatus,
     RunStatusEnum,
+    RunSummary,
+    RunSummaryPage,
     TelemetryFeed,
     TelemetrySnapshot,
     UniversePreview,
 )
-from app.data.binance import BinanceClient
-from app.db.sqlite import Database
-from app.research.manager import RunManager
-from app.research.runner import config_hash
-from app.reporting.report_builder import ReportBuilder
-from app.data.storage import ArtifactStore
-from app.core.container import get_store
-from app.exporters.pine import PineExporter
-from app.research.search.optimizer import SearchOutcome
+from app.research.profiling import PROFILE_FILE, get_active_profiler
+from app.research.telemetry import TELEMETRY_FILE, get_live_telemetry, read_jsonl_since, read_jsonl_tail
+
+# Services, the research stack (polars/numpy), duckdb, requests and the PDF toolchain are imported by
+# the container or inside the handlers that use them, so importing the app stays cheap.
+if TYPE_CHECKING:
+    from app.data.binance import BinanceClient
+    from app.data.storage import ArtifactStore
+    from app.db.cube_query import CubeQueryService
+    from app.db.sqlite import Database
+    from app.reporting.report_service import ReportService
+    from app.research.live import LiveScoringService
+    from app.research.manager import RunManager
 
 router = APIRouter(prefix="/runs", tags=["runs"])
 
@@ -39,14 +74,30 @@ router = APIRouter(prefix="/runs", tags=["runs"])
 @router.post("", response_model=RunCreated)
 def create_run(
     config: RunConfig,
+    priority: RunPriorityEnum = RunPriorityEnum.normal,
+    cpu_quota: float | None = Query(default=None, gt=0.0, le=1.0),
     db: Database = Depends(get_db),
     manager: RunManager = Depends(get_run_manager),
 ) -> RunCreated:
     run_id = uuid.uuid4().hex[:12]
+    from app.research.manager import RunCapacityError
+    from app.research.runner import config_hash
+
     cfg_hash = config_hash(config)
     db.create_run(run_id=run_id, config_json=config.model_dump(mode="json"), config_hash=cfg_hash)
     db.add_log(run_id, RunStageEnum.created, "Run created")
-    manager.submit(run_id, config)
+    try:
+        manager.submit(run_id, config, priority=priority, cpu_quota=cpu_quota)
+    except RunCapacityError as exc:
+        db.record_progress(
+            run_id,
+            status=RunStatusEnum.failed,
+            stage=RunStageEnum.finished,
+            progress=0.0,
+            message="Run not started: too many active runs",
+            error=str(exc),
+        )
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
 
     row = db.get_run(run_id)
     if row is None:
@@ -56,7 +107,46 @@ def create_run(
 
 @router.get("", response_model=list[RunStatus])
 def list_runs(db: Database = Depends(get_db)) -> list[RunStatus]:
-    return [_row_to_run_status(db, row["run_id"]) for row in db.list_runs(limit=100)]
+    # The newest 100 runs with their logs, from one run query and one log query.
+    rows = db.list_run_summaries(limit=100)
+    logs = db.get_logs_for_runs([row["run_id"] for row in rows])
+    return [_to_run_status(row, logs[row["run_id"]]) for row in rows]
+
+
+@router.get("/summaries", response_model=RunSummaryPage)
+def list_run_summaries(
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    status: RunStatusEnum | None = None,
+    include_logs: bool = False,
+    db: Database = Depends(get_db),
+) -> RunSummaryPage:
+    rows = db.list_run_summaries(limit=limit, cursor=_decode_cursor(cursor) if cursor else None, status=status)
+    logs = db.get_logs_for_runs([row["run_id"] for row in rows]) if include_logs else {}
+    runs = [_row_to_run_summary(row, logs.get(row["run_id"], [])) for row in rows]
+    next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["run_id"]) if len(rows) == limit else None
+    return RunSummaryPage(runs=runs, next_cursor=next_cursor)
+
+
+@router.post("/query", response_model=CubeQueryResult)
+def query_indicator_cubes(
+    query: CubeQuery,
+    format: str = Query(default="json", pattern="^(json|arrow)$"),
+    service: CubeQueryService = Depends(get_cube_query_service),
+) -> CubeQueryResult | StreamingResponse:
+    try:
+        if format == "arrow":
+            return StreamingResponse(service.stream_arrow(query), media_type="application/vnd.apache.arrow.stream")
+        return service.execute(query)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/queue", response_model=RunQueue)
+def get_run_queue(manager: RunManager = Depends(get_run_manager)) -> RunQueue:
+    return manager.queue()
 
 
 @router.get("/{run_id}", response_model=RunStatus)
@@ -70,6 +160,8 @@ def get_run(run_id: str, db: Database = Depends(get_db)) -> RunStatus:
 @router.post("/{run_id}/resume", response_model=RunCreated)
 def resume_run(
     run_id: str,
+    priority: RunPriorityEnum = RunPriorityEnum.normal,
+    cpu_quota: float | None = Query(default=None, gt=0.0, le=1.0),
     db: Database = Depends(get_db),
     manager: RunManager = Depends(get_run_manager),
 ) -> RunCreated:
@@ -77,8 +169,15 @@ def resume_run(
     if row is None:
         raise HTTPException(status_code=404, detail="Run not found")
 
+    from app.research.manager import RunAlreadyActiveError, RunCapacityError
+
     config = RunConfig.model_validate(json.loads(row["config_json"]))
-    manager.resume(run_id, config)
+    try:
+        manager.resume(run_id, config, priority=priority, cpu_quota=cpu_quota)
+    except RunAlreadyActiveError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    except RunCapacityError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
     db.add_log(run_id, RunStageEnum.created, "Run resumed")
     return RunCreated(run_id=run_id, status=RunStatusEnum.queued, created_at=datetime.fromisoformat(row["created_at"]))
 
@@ -91,36 +190,93 @@ def cancel_run(run_id: str, manager: RunManager = Depends(get_run_manager)) -> d
     return {"ok": True}
 
 
+def _reencode(raw: str | bytes | None, detail: str) -> bytes:
+    from app.db.codec import decode_payload
+
+    if raw is None:
+        raise HTTPException(status_code=404, detail=detail)
+    return orjson.dumps(decode_payload(raw), option=ORJSON_OPTIONS)
+
+
 @router.get("/{run_id}/results", response_model=ResultSummary)
-def get_results(run_id: str, db: Database = Depends(get_db)) -> ResultSummary:
-    payload = db.get_result(run_id)
-    if payload is None:
+def get_results(
+    run_id: str,
+    request: Request,
+    db: Database = Depends(get_db),
+    cache: PayloadCache = Depends(get_payload_cache),
+) -> Response:
+    version = db.get_result_version(run_id)
+    if version is None:
         raise HTTPException(status_code=404, detail="Results not found")
-    return ResultSummary.model_validate(payload)
+    # Stored results are dumped from a validated ResultSummary, so they are re-encoded once per version and
+    # served as bytes rather than parsed and validated on every request.
+    cached = cache.get(("results", run_id), version, lambda: _reencode(db.get_result_raw(run_id), "Results not found"))
+    return cached_json_response(cached, request, cache)
 
 
 @router.get("/{run_id}/plots/{plot_id}", response_model=PlotPayload)
-def get_plot(run_id: str, plot_id: str, db: Database = Depends(get_db)) -> PlotPayload:
-    payload = db.get_plot(run_id, plot_id)
-    if payload is None:
+def get_plot(
+    run_id: str,
+    plot_id: str,
+    request: Request,
+    max_points: int | None = Query(default=None, ge=3, le=100_000),
+    mode: str = Query(default="lttb", pattern="^(lttb|envelope)$"),
+    db: Database = Depends(get_db),
+    cache: PayloadCache = Depends(get_payload_cache),
+) -> PlotPayload | Response:
+    from app.db.codec import decode_payload
+    from app.reporting.downsample import DEFAULT_MAX_POINTS, downsample_payload
+
+    # Line plots are stored at full resolution, so every request reduces from the real series.
+    if max_points is not None:
+        payload = db.get_plot(run_id, plot_id)
+        if payload is None:
+            raise HTTPException(status_code=404, detail="Plot not found")
+        payload = downsample_payload(payload, max_points, mode)
+        return PlotPayload(run_id=run_id, plot_id=plot_id, title=payload.get("title", plot_id), payload=payload)
+
+    raw = db.get_plot_raw(run_id, plot_id)
+    if raw is None:
         raise HTTPException(status_code=404, detail="Plot not found")
-    return PlotPayload(run_id=run_id, plot_id=plot_id, title=payload.get("title", plot_id), payload=payload)
+
+    def build() -> bytes:
+        payload = downsample_payload(decode_payload(raw), DEFAULT_MAX_POINTS)
+        plot = {"run_id": run_id, "plot_id": plot_id, "title": payload.get("title", plot_id), "payload": payload}
+        return orjson.dumps(plot, option=ORJSON_OPTIONS)
+
+    cached = cache.get(("plot", run_id, plot_id), body_etag(raw if isinstance(raw, bytes) else raw.encode("utf-8")), build)
+    return cached_json_response(cached, request, cache)
 
 
 @router.post("/{run_id}/report", response_model=ReportArtifact)
 def generate_report(
     run_id: str,
     db: Database = Depends(get_db),
-    store: ArtifactStore = Depends(get_store),
+    reports: ReportService = Depends(get_report_service),
 ) -> ReportArtifact:
     payload = db.get_result(run_id)
     if payload is None:
         raise HTTPException(status_code=404, detail="Results not found")
     summary = ResultSummary.model_validate(payload)
-    builder = ReportBuilder(store)
-    artifact = builder.build(run_id, summary)
-    db.add_artifact(run_id, "report_html", artifact.html_path)
-    db.add_artifact(run_id, "report_pdf", artifact.pdf_path)
+
+    def on_pdf(path: Path | None) -> None:
+        # The PDF is registered once the report worker has written it, and dropped when it goes stale.
+        if path is None:
+            db.delete_artifacts(run_id, "report_pdf")
+        else:
+            db.upsert_artifact(run_id, "report_pdf", str(path))
+
+    artifact = reports.request(run_id, summary, on_pdf=on_pdf)
+    if not artifact.cached:
+        db.upsert_artifact(run_id, "report_html", artifact.html_path)
+    return artifact
+
+
+@router.get("/{run_id}/report", response_model=ReportArtifact)
+def get_report_status(run_id: str, reports: ReportService = Depends(get_report_service)) -> ReportArtifact:
+    artifact = reports.status(run_id)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="Report has not been requested")
     return artifact
 
 
@@ -142,6 +298,9 @@ def export_pine(
         expression_map = store.load_json(expression_map_path)
 
     # Rebuild minimal synthetic outcomes from result summary for API-triggered export.
+    from app.exporters.pine import PineExporter
+    from app.research.search.optimizer import SearchOutcome
+
     synthetic_outcomes: list[SearchOutcome] = []
     exporter = PineExporter(store)
     bundle = exporter.export(
@@ -169,26 +328,111 @@ def preview_universe(
 def get_telemetry(
     run_id: str,
     limit: int = 200,
+    offset: int | None = None,
     store: ArtifactStore = Depends(get_store),
 ) -> TelemetryFeed:
-    path = store.run_dir(run_id) / "telemetry.jsonl"
-    if not path.exists():
+    path = store.run_dir(run_id) / TELEMETRY_FILE
+    feed = _read_telemetry(run_id, path, offset, max(1, min(limit, 5000)))
+    if feed is None:
         raise HTTPException(status_code=404, detail="Telemetry not found")
+    rows, next_offset = feed
 
-    lines = path.read_text(encoding="utf-8").splitlines()
-    tail = lines[-max(1, min(limit, 5000)) :]
     snapshots: list[TelemetrySnapshot] = []
-    for line in tail:
-        line = line.strip()
-        if not line:
-            continue
+    for obj in rows:
         try:
-            obj = json.loads(line)
             snapshots.append(TelemetrySnapshot.model_validate(obj))
         except Exception:
             continue
 
-    return TelemetryFeed(run_id=run_id, snapshots=snapshots)
+    return TelemetryFeed(run_id=run_id, snapshots=snapshots, next_offset=next_offset)
+
+
+@router.get("/{run_id}/telemetry/stream")
+def stream_telemetry(
+    run_id: str,
+    request: Request,
+    offset: int | None = None,
+    last_event_id: str | None = Header(default=None),
+    poll_seconds: float = Query(default=0.5, ge=0.05, le=10.0),
+    db: Database = Depends(get_db),
+    store: ArtifactStore = Depends(get_store),
+) -> StreamingResponse:
+    if db.get_run(run_id) is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    path = store.run_dir(run_id) / TELEMETRY_FILE
+    if last_event_id is not None and last_event_id.isdigit():
+        offset = int(last_event_id)
+    if offset is None:
+        # New subscribers start at the current end of the feed and only see fresh snapshots.
+        live = get_live_telemetry(run_id)
+        offset = live.recent(0)[1] if live is not None else (path.stat().st_size if path.exists() else 0)
+    return StreamingResponse(
+        _telemetry_events(request, db, run_id, path, offset, poll_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{run_id}/profile", response_model=RunProfile)
+def get_profile(run_id: str, store: ArtifactStore = Depends(get_store)) -> RunProfile:
+    profiler = get_active_profiler(run_id)
+    if profiler is not None:
+        return RunProfile.model_validate({**profiler.summary(), "run_id": run_id, "in_progress": True})
+    path = store.run_dir(run_id) / PROFILE_FILE
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return RunProfile.model_validate({**store.load_json(path), "run_id": run_id})
+
+
+@router.post("/{run_id}/live", response_model=LiveSessionStatus)
+def start_live_session(
+    run_id: str,
+    live: LiveScoringService = Depends(get_live_service),
+) -> LiveSessionStatus:
+    try:
+        session = live.start(run_id)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return LiveSessionStatus.model_validate(session.status())
+
+
+@router.get("/{run_id}/live", response_model=LiveSessionStatus)
+def get_live_session(run_id: str, live: LiveScoringService = Depends(get_live_service)) -> LiveSessionStatus:
+    session = live.get(run_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Live session not started")
+    return LiveSessionStatus.model_validate(session.status())
+
+
+@router.post("/{run_id}/live/bars", response_model=LiveForecastBatch)
+def ingest_live_bars(
+    run_id: str,
+    batch: LiveBarBatch,
+    live: LiveScoringService = Depends(get_live_service),
+) -> LiveForecastBatch:
+    session = live.get(run_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Live session not started")
+    try:
+        forecasts = session.ingest(batch.symbol, batch.timeframe, [bar.model_dump() for bar in batch.bars])
+    except KeyError as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    return LiveForecastBatch.model_validate({"run_id": run_id, "forecasts": forecasts})
+
+
+@router.post("/{run_id}/live/poll", response_model=LiveForecastBatch)
+def poll_live_session(run_id: str, live: LiveScoringService = Depends(get_live_service)) -> LiveForecastBatch:
+    session = live.get(run_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Live session not started")
+    return LiveForecastBatch.model_validate({"run_id": run_id, "forecasts": session.poll()})
+
+
+@router.delete("/{run_id}/live")
+def stop_live_session(run_id: str, live: LiveScoringService = Depends(get_live_service)) -> dict[str, bool]:
+    if not live.stop(run_id):
+        raise HTTPException(status_code=404, detail="Live session not started")
+    return {"ok": True}
 
 
 def _row_to_run_status(db: Database, run_id: str) -> RunStatus:
@@ -196,16 +440,12 @@ def _row_to_run_status(db: Database, run_id: str) -> RunStatus:
     if row is None:
         raise HTTPException(status_code=404, detail="Run not found")
 
-    logs = [
-        RunStageLog(
-            timestamp=datetime.fromisoformat(log["timestamp"]),
-            stage=RunStageEnum(log["stage"]),
-            message=log["message"],
-        )
-        for log in db.get_logs(run_id)
-    ]
+    return _to_run_status(row, db.get_logs(run_id))
+
+
+def _to_run_status(row: sqlite3.Row, logs: list[sqlite3.Row]) -> RunStatus:
     return RunStatus(
-        run_id=run_id,
+        run_id=row["run_id"],
         status=RunStatusEnum(row["status"]),
         stage=RunStageEnum(row["stage"]),
         progress=float(row["progress"]),
@@ -213,5 +453,91 @@ def _row_to_run_status(db: Database, run_id: str) -> RunStatus:
         updated_at=datetime.fromisoformat(row["updated_at"]),
         config_hash=row["config_hash"],
         error=row["error"],
-        logs=logs,
+        logs=[_to_stage_log(log) for log in logs],
+    )
+
+
+def _to_stage_log(row: sqlite3.Row) -> RunStageLog:
+    return RunStageLog(
+        timestamp=datetime.fromisoformat(row["timestamp"]),
+        stage=RunStageEnum(row["stage"]),
+        message=row["message"],
     )
+
+
+def _row_to_run_summary(row: sqlite3.Row, logs: list[sqlite3.Row]) -> RunSummary:
+    last_log = None
+    if row["log_timestamp"] is not None:
+        last_log = RunStageLog(
+            timestamp=datetime.fromisoformat(row["log_timestamp"]),
+            stage=RunStageEnum(row["log_stage"]),
+            message=row["log_message"],
+        )
+    return RunSummary(**dict(_to_run_status(row, logs)), last_log=last_log)
+
+
+def _encode_cursor(created_at: str, run_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([created_at, run_id]).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        created_at, run_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    return str(created_at), str(run_id)
+
+
+def _read_telemetry(run_id: str, path: Path, offset: int | None, limit: int) -> tuple[list[dict], int] | None:
+    # Active runs are served from the in-memory ring; older offsets and finished runs fall back to the file.
+    live = get_live_telemetry(run_id)
+    if live is not None:
+        feed = live.recent(limit) if offset is None else live.since(offset, limit)
+        if feed is not None:
+            return feed
+    if not path.exists():
+        return None
+    if offset is None:
+        return read_jsonl_tail(path, limit)
+    return read_jsonl_since(path, offset, max_lines=limit)
+
+
+_TERMINAL_STATUSES = {RunStatusEnum.completed.value, RunStatusEnum.failed.value, RunStatusEnum.canceled.value}
+
+
+async def _telemetry_events(
+    request: Request,
+    db: Database,
+    run_id: str,
+    path: Path,
+    offset: int,
+    poll_seconds: float,
+) -> AsyncIterator[str]:
+    keepalive_at = time.monotonic() + 15.0
+    drained_after_finish = False
+    while not await request.is_disconnected():
+        feed = await run_in_threadpool(_read_telemetry, run_id, path, offset, 500)
+        rows = []
+        if feed is not None:
+            rows, offset = feed
+        for i, row in enumerate(rows):
+            # Only the last event of a batch carries the resume offset; a reconnect replays at most one batch.
+            event_id = f"id: {offset}\n" if i == len(rows) - 1 else ""
+            yield f"{event_id}event: snapshot\ndata: {json.dumps(row)}\n\n"
+        if rows:
+            keepalive_at = time.monotonic() + 15.0
+            drained_after_finish = False
+            continue
+
+        run = await run_in_threadpool(db.get_run, run_id)
+        if run is None or run["status"] in _TERMINAL_STATUSES:
+            # One more empty poll after the run finishes picks up the final snapshot.
+            if drained_after_finish:
+                yield f"id: {offset}\nevent: end\ndata: {json.dumps({'run_id': run_id, 'offset': offset})}\n\n"
+                return
+            drained_after_finish = True
+        if time.monotonic() >= keepalive_at:
+            keepalive_at = time.monotonic() + 15.0
+            yield ": keepalive\n\n"
+        await asyncio.sleep(poll_seconds)
+
@@ -1,6 +1,7 @@
 ﻿from __future__ import annotations
 
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -20,7 +21,23 @@ class Settings(BaseSettings):
 
     random_seed: int = 42
     max_workers: int = 6
+    max_active_runs: int = Field(default=16, ge=1)
+    run_cpu_quota: float | None = Field(default=None, gt=0.0, le=1.0)
     request_timeout_seconds: int = 30
+    bar_format: Literal["parquet", "npy"] = "parquet"
+    telemetry_console: bool = True
+    telemetry_min_update_seconds: float = 0.25
+    report_workers: int = 1
+    compression_min_bytes: int = 1024
+    gzip_level: int = 6
+    zstd_level: int = 3
+    payload_cache_entries: int = 64
+    payload_format: Literal["json", "packed"] = "json"
+    search_backend: Literal["local", "queue"] = "local"
+    search_job_max_attempts: int = Field(default=3, ge=1)
+    search_poll_seconds: float = 1.0
+    search_stall_seconds: float = 900.0
+    worker_lease_seconds: float = 60.0
 
     binance_base_url: str = "https://api.binance.com"
 
@@ -1,38 +1,106 @@
 ﻿from __future__ import annotations
 
 from functools import lru_cache
+from typing import TYPE_CHECKING
 
+from app.api.responses import PayloadCache
 from app.core.config import ensure_paths, settings
-from app.data.binance import BinanceClient
-from app.data.storage import ArtifactStore
-from app.db.sqlite import Database
-from app.research.manager import RunManager
-from app.research.runner import ExperimentRunner, RunnerDeps
+
+# Each provider imports its service on first call; importing the container (and so the API) must not pull
+# in polars, duckdb, requests or the PDF toolchain.
+if TYPE_CHECKING:
+    from app.data.binance import BinanceClient
+    from app.data.storage import ArtifactStore
+    from app.db.cube_query import CubeQueryService
+    from app.db.sqlite import Database
+    from app.reporting.report_service import ReportService
+    from app.research.live import LiveScoringService
+    from app.research.manager import RunManager
+    from app.research.runner import ExperimentRunner
 
 
 @lru_cache(maxsize=1)
 def get_db() -> Database:
+    from app.db.sqlite import Database
+
     ensure_paths()
-    return Database(settings.db_path)
+    return Database(settings.db_path, payload_format=settings.payload_format)
 
 
 @lru_cache(maxsize=1)
 def get_store() -> ArtifactStore:
+    from app.data.storage import ArtifactStore
+
     ensure_paths()
     return ArtifactStore(settings.runs_dir)
 
 
 @lru_cache(maxsize=1)
 def get_binance_client() -> BinanceClient:
+    from app.data.binance import BinanceClient
+
     return BinanceClient(base_url=settings.binance_base_url, timeout_seconds=settings.request_timeout_seconds)
 
 
 @lru_cache(maxsize=1)
 def get_runner() -> ExperimentRunner:
-    deps = RunnerDeps(db=get_db(), store=get_store(), binance=get_binance_client())
+    from app.research.runner import ExperimentRunner, RunnerDeps
+    from app.research.search.warm_start import ARCHIVE_FILE, EliteArchive
+
+    deps = RunnerDeps(
+        db=get_db(),
+        store=get_store(),
+        binance=get_binance_client(),
+        bar_format=settings.bar_format,
+        telemetry_console=settings.telemetry_console,
+        telemetry_min_update_seconds=settings.telemetry_min_update_seconds,
+        search_backend=settings.search_backend,
+        search_job_max_attempts=settings.search_job_max_attempts,
+        search_poll_seconds=settings.search_poll_seconds,
+        search_stall_seconds=settings.search_stall_seconds,
+        archive=EliteArchive(settings.artifacts_dir / ARCHIVE_FILE),
+    )
     return ExperimentRunner(deps)
 
 
 @lru_cache(maxsize=1)
 def get_run_manager() -> RunManager:
-    return RunManager(get_runner(), max_workers=min(settings.max_workers, 3))
+    from app.research.manager import RunManager
+
+    return RunManager(
+        get_runner(),
+        max_workers=min(settings.max_workers, 3),
+        default_cpu_quota=settings.run_cpu_quota,
+        max_active_runs=settings.max_active_runs,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_live_service() -> LiveScoringService:
+    from app.research.live import LiveScoringService
+
+    return LiveScoringService(get_store())
+
+
+@lru_cache(maxsize=1)
+def get_report_service() -> ReportService:
+    from app.reporting.report_service import ReportService
+
+    return ReportService(get_store(), max_workers=settings.report_workers)
+
+
+@lru_cache(maxsize=1)
+def get_cube_query_service() -> CubeQueryService:
+    from app.db.cube_query import CubeQueryService
+
+    return CubeQueryService(get_db(), get_store())
+
+
+@lru_cache(maxsize=1)
+def get_payload_cache() -> PayloadCache:
+    return PayloadCache(
+        max_entries=settings.payload_cache_entries,
+        min_compress_bytes=settings.compression_min_bytes,
+        gzip_level=settings.gzip_level,
+        zstd_level=settings.zstd_level,
+    )
@@ -38,11 +38,25 @@ class PerformanceProfileEnum(str, Enum):
     deep = "deep"
 
 
+class HorizonSearchModeEnum(str, Enum):
+    grid = "grid"
+    adaptive = "adaptive"
+
+
+class WarmStartModeEnum(str, Enum):
+    off = "off"
+    run = "run"
+    archive = "archive"
+
+
 class HorizonConfig(BaseModel):
     min_bar: int = 3
     max_bar: int = 200
     coarse_step: int = 12
     refine_radius: int = 8
+    # "grid" scores every coarse_step and refines densely around the best seeds; "adaptive" (opt-in)
+    # narrows each coarse minimum by golden-section search and needs about a third of the fits.
+    search_mode: HorizonSearchModeEnum = HorizonSearchModeEnum.grid
 
     @model_validator(mode="after")
     def validate_range(self) -> "HorizonConfig":
@@ -76,6 +90,11 @@ class SearchConfig(BaseModel):
     novelty_similarity_threshold: float = 0.82
     collinearity_threshold: float = 0.94
     min_novelty_score: float = 0.2
+    cross_asset_top_k: int = Field(default=6, ge=0, le=32)
+    # "run" seeds Stage A with the best expressions already found in this run (sibling timeframes of the
+    # symbol first); "archive" adds elites persisted by earlier runs. Seeds replace random pool members.
+    warm_start: WarmStartModeEnum = WarmStartModeEnum.off
+    warm_start_seeds: int = Field(default=24, ge=0, le=256)
 
 
 class ValidationConfig(BaseModel):
@@ -160,6 +179,56 @@ class RunStatus(BaseModel):
     logs: list[RunStageLog] = Field(default_factory=list)
 
 
+class RunSummary(RunStatus):
+    last_log: RunStageLog | None = None
+
+
+class RunSummaryPage(BaseModel):
+    runs: list[RunSummary] = Field(default_factory=list)
+    next_cursor: str | None = None
+
+
+class RunPriorityEnum(str, Enum):
+    urgent = "urgent"
+    normal = "normal"
+    batch = "batch"
+
+
+class QueueStateEnum(str, Enum):
+    starting = "starting"
+    waiting = "waiting"
+    running = "running"
+    throttled = "throttled"
+
+
+class SearchJobStatusEnum(str, Enum):
+    queued = "queued"
+    leased = "leased"
+    done = "done"
+    failed = "failed"
+    canceled = "canceled"
+
+
+class RunQueueEntry(BaseModel):
+    run_id: str
+    priority: RunPriorityEnum
+    state: QueueStateEnum
+    position: int | None = None
+    cpu_quota: float | None = None
+    jobs_completed: int = 0
+    cpu_seconds: float = 0.0
+    slot_seconds: float = 0.0
+    waited_seconds: float = 0.0
+    throttled_seconds: float = 0.0
+    submitted_at: datetime
+
+
+class RunQueue(BaseModel):
+    slots: int
+    slots_in_use: int
+    entries: list[RunQueueEntry] = Field(default_factory=list)
+
+
 class IndicatorSpec(BaseModel):
     indicator_id: str
     expression: str
@@ -177,6 +246,8 @@ class ScoreCard(BaseModel):
     max_drawdown: float
     turnover: float
     stability_score: float
+    best_threshold: float | None = None
+    best_threshold_pnl: float | None = None
 
 
 class AssetRecommendation(BaseModel):
@@ -238,6 +309,18 @@ class IndicatorCubeRow(BaseModel):
     selected_metric_rank: int | None = None
 
 
+class IndicatorCubeSummary(BaseModel):
+    path: str
+    frontier_path: str
+    rows: int
+    candidates: int = 0
+    horizons: int = 0
+    columns: list[str] = Field(default_factory=list)
+    best_composite_error: float | None = None
+    median_composite_error: float | None = None
+    family_counts: dict[str, int] = Field(default_factory=dict)
+
+
 class ResultSummary(BaseModel):
     schema_version: str | None = None
     run_id: str
@@ -247,6 +330,7 @@ class ResultSummary(BaseModel):
     horizon_metadata: HorizonMetadata | None = None
     per_indicator_frontier: list[FrontierEntry] | None = None
     indicator_cube: list[IndicatorCubeRow] | None = None
+    indicator_cube_summary: IndicatorCubeSummary | None = None
     generated_at: datetime
 
 
@@ -257,10 +341,20 @@ class PlotPayload(BaseModel):
     payload: dict[str, Any]
 
 
+class ReportStatusEnum(str, Enum):
+    pending = "pending"
+    ready = "ready"
+    failed = "failed"
+
+
 class ReportArtifact(BaseModel):
     run_id: str
     html_path: str
     pdf_path: str
+    digest: str | None = None
+    pdf_status: ReportStatusEnum = ReportStatusEnum.ready
+    cached: bool = False
+    error: str | None = None
 
 
 class ExportConfig(BaseModel):
@@ -308,3 +402,153 @@ class TelemetrySnapshot(BaseModel):
 class TelemetryFeed(BaseModel):
     run_id: str
     snapshots: list[TelemetrySnapshot]
+    next_offset: int = 0
+
+
+class ProfileSpan(BaseModel):
+    count: int
+    total_ms: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class ProfileCache(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class RunProfile(BaseModel):
+    run_id: str
+    in_progress: bool = False
+    wall_ms: float
+    spans: dict[str, ProfileSpan] = Field(default_factory=dict)
+    caches: dict[str, ProfileCache] = Field(default_factory=dict)
+
+
+class LiveBar(BaseModel):
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class LiveBarBatch(BaseModel):
+    symbol: str
+    timeframe: str
+    bars: list[LiveBar] = Field(min_length=1, max_length=5000)
+
+
+class LiveForecast(BaseModel):
+    symbol: str
+    timeframe: str
+    horizon: int
+    timestamp: int | None = None
+    close: float
+    forecast: float
+    forecast_return: float
+
+
+class LiveRealizedError(BaseModel):
+    count: int
+    normalized_rmse: float | None = None
+    normalized_mae: float | None = None
+    composite_error: float | None = None
+    directional_hit_rate: float | None = None
+
+
+class LiveModelStatus(BaseModel):
+    symbol: str
+    timeframe: str
+    horizon: int
+    expressions: list[str]
+    bars_seen: int
+    last_timestamp: int | None = None
+    last_forecast: LiveForecast | None = None
+    pending_forecasts: int
+    realized: LiveRealizedError
+    mean_latency_us: float | None = None
+
+
+class LiveSessionStatus(BaseModel):
+    run_id: str
+    models: list[LiveModelStatus]
+
+
+class LiveForecastBatch(BaseModel):
+    run_id: str
+    forecasts: list[LiveForecast]
+
+
+class CubeFilterOpEnum(str, Enum):
+    eq = "eq"
+    ne = "ne"
+    lt = "lt"
+    le = "le"
+    gt = "gt"
+    ge = "ge"
+    in_ = "in"
+
+
+class CubeAggregateEnum(str, Enum):
+    count = "count"
+    min = "min"
+    max = "max"
+    mean = "mean"
+    median = "median"
+    sum = "sum"
+    arg_min = "arg_min"
+    arg_max = "arg_max"
+
+
+class CubeFilter(BaseModel):
+    column: str
+    op: CubeFilterOpEnum = CubeFilterOpEnum.eq
+    value: Any
+
+
+class CubeAggregate(BaseModel):
+    column: str
+    agg: CubeAggregateEnum
+    # arg_min/arg_max return `column` from the row with the smallest/largest `by`.
+    by: str | None = None
+
+    @model_validator(mode="after")
+    def validate_by(self) -> "CubeAggregate":
+        if self.agg in (CubeAggregateEnum.arg_min, CubeAggregateEnum.arg_max) and self.by is None:
+            raise ValueError(f"{self.agg.value} requires 'by'")
+        return self
+
+    @property
+    def alias(self) -> str:
+        if self.by is not None:
+            return f"{self.agg.value}_{self.column}_by_{self.by}"
+        return f"{self.agg.value}_{self.column}"
+
+
+class CubeOrder(BaseModel):
+    column: str
+    descending: bool = False
+
+
+class CubeQuery(BaseModel):
+    run_ids: list[str] | None = None
+    last_runs: int = Field(default=50, ge=1, le=1000)
+    columns: list[str] | None = None
+    filters: list[CubeFilter] = Field(default_factory=list)
+    group_by: list[str] = Field(default_factory=list)
+    aggregates: list[CubeAggregate] = Field(default_factory=list)
+    # Without aggregates, keeps the first `per_group` rows of each group_by partition under order_by.
+    per_group: int | None = Field(default=None, ge=1)
+    order_by: list[CubeOrder] = Field(default_factory=list)
+    limit: int = Field(default=1000, ge=1, le=100_000)
+
+
+class CubeQueryResult(BaseModel):
+    runs: list[str]
+    columns: list[str]
+    rows: list[list[Any]]
@@ -3,6 +3,7 @@
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import polars as pl
 
 
@@ -36,6 +37,11 @@ class ArtifactStore:
         path.mkdir(parents=True, exist_ok=True)
         return path
 
+    def jobs_dir(self, run_id: str) -> Path:
+        path = self.run_dir(run_id) / "jobs"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
     def save_bars(self, run_id: str, symbol: str, timeframe: str, frame: pl.DataFrame) -> Path:
         path = self.data_dir(run_id) / f"bars_{symbol}_{timeframe}.parquet"
         frame.write_parquet(path)
@@ -45,6 +51,25 @@ class ArtifactStore:
         path = self.data_dir(run_id) / f"bars_{symbol}_{timeframe}.parquet"
         return pl.read_parquet(path)
 
+    def bar_columns_dir(self, run_id: str, symbol: str, timeframe: str) -> Path:
+        return self.data_dir(run_id) / f"bars_{symbol}_{timeframe}"
+
+    def save_bar_columns(self, run_id: str, symbol: str, timeframe: str, columns: dict[str, np.ndarray]) -> Path:
+        path = self.bar_columns_dir(run_id, symbol, timeframe)
+        path.mkdir(parents=True, exist_ok=True)
+        for name, values in columns.items():
+            dtype = np.int64 if name == "timestamp" else np.float64
+            np.save(path / f"{name}.npy", np.ascontiguousarray(values, dtype=dtype))
+        return path
+
+    def has_bar_columns(self, run_id: str, symbol: str, timeframe: str) -> bool:
+        return (self.bar_columns_dir(run_id, symbol, timeframe) / "close.npy").exists()
+
+    def load_bar_columns(self, run_id: str, symbol: str, timeframe: str) -> dict[str, np.ndarray]:
+        # Read-only memory maps: workers share the OS page cache instead of holding private copies.
+        path = self.bar_columns_dir(run_id, symbol, timeframe)
+        return {file.stem: np.load(file, mmap_mode="r") for file in sorted(path.glob("*.npy"))}
+
     def save_json(self, path: Path, data: dict[str, Any]) -> None:
         import json
 
@@ -57,3 +82,28 @@ class ArtifactStore:
 
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
+
+    def save_job_result(self, run_id: str, symbol: str, timeframe: str, result: Any) -> Path:
+        import pickle
+        import tempfile
+
+        # Written beside the final name and renamed, so a reader never sees a half-written file even when
+        # a re-leased job is finished by two workers. The temp name is unique per writer, not per PID,
+        # because workers on different hosts may share the artifact directory.
+        path = self.jobs_dir(run_id) / f"search_{symbol}_{timeframe}.pkl"
+        with tempfile.NamedTemporaryFile("wb", dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False) as f:
+            tmp = Path(f.name)
+            try:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            except BaseException:
+                f.close()
+                tmp.unlink(missing_ok=True)
+                raise
+        tmp.replace(path)
+        return path
+
+    def load_job_result(self, path: Path) -> Any:
+        import pickle
+
+        with path.open("rb") as f:
+            return pickle.load(f)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import math
+import struct
+import zlib
+from typing import Any, Literal
+
+import numpy as np
+import orjson
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install "novel-indicator-backend[compression]"
+    zstandard = None
+
+PayloadFormat = Literal["json", "packed"]
+
+MAGIC = b"NIP1"
+MIN_ARRAY_LEN = 8
+_RAW, _ZLIB, _ZSTD = 0, 1, 2
+_HEADER = struct.Struct("<4sBI")
+
+
+def default_compression() -> int:
+    return _ZSTD if zstandard is not None else _ZLIB
+
+
+def _array_kind(values: list[Any]) -> str | None:
+    # Only homogeneous lists are packed so that decoding gives back exactly what was stored: all ints
+    # (bools excluded) become int64, floats with optional None become float64 with None kept as NaN.
+    if len(values) < MIN_ARRAY_LEN:
+        return None
+    if type(values[0]) is int and all(type(v) is int for v in values):
+        return "i8" if all(-(2**63) <= v < 2**63 for v in values) else None
+    has_none = has_nan = False
+    for v in values:
+        if v is None:
+            has_none = True
+        elif type(v) is not float:
+            return None
+        elif v != v:
+            has_nan = True
+    if has_none and has_nan:
+        return None
+    return "f8n" if has_none else "f8"
+
+
+def _split(node: Any, path: list[Any], arrays: list[tuple[str, np.ndarray, list[Any]]]) -> Any:
+    if isinstance(node, dict):
+        # Non-string keys are addressed the way json.dumps will write them ("1", "true", ...).
+        return {
+            key: _split(value, path + [key if isinstance(key, str) else json.dumps(key)], arrays)
+            for key, value in node.items()
+        }
+    if isinstance(node, (list, tuple)):
+        values = list(node)
+        kind = _array_kind(values)
+        if kind is None:
+            return [_split(value, path + [i], arrays) for i, value in enumerate(values)]
+        if kind == "f8n":
+            block = np.array([math.nan if v is None else v for v in values], dtype="<f8")
+        else:
+            block = np.asarray(values, dtype="<i8" if kind == "i8" else "<f8")
+        arrays.append((kind, block, path))
+        return None
+    return node
+
+
+def _place(tree: Any, path: list[Any], values: list[Any]) -> Any:
+    if not path:
+        return values
+    parent = tree
+    for step in path[:-1]:
+        parent = parent[step]
+    parent[path[-1]] = values
+    return tree
+
+
+def pack_payload(payload: Any, compression: int | None = None) -> bytes:
+    # Layout: header (magic, compression, meta length) + compressed(meta JSON + concatenated array bytes).
+    # Numeric lists are lifted out of the JSON tree into little-endian binary blocks and addressed by their
+    # key path, so decoding touches only the array slots rather than walking every node.
+    arrays: list[tuple[str, np.ndarray, list[Any]]] = []
+    tree = _split(payload, [], arrays)
+    table = [[kind, len(block), path] for kind, block, path in arrays]
+    meta = json.dumps({"tree": tree, "arrays": table}).encode("utf-8")
+    body = meta + b"".join(block.tobytes() for _, block, _ in arrays)
+    compression = default_compression() if compression is None else compression
+    if compression == _ZSTD:
+        body = zstandard.ZstdCompressor(level=3).compress(body)
+    elif compression == _ZLIB:
+        body = zlib.compress(body, 6)
+    return _HEADER.pack(MAGIC, compression, len(meta)) + body
+
+
+def unpack_payload(blob: bytes) -> Any:
+    magic, compression, meta_len = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("Not a packed payload")
+    body = memoryview(blob)[_HEADER.size :]
+    if compression == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Payload is zstd-compressed but the zstandard package is not installed")
+        body = memoryview(zstandard.ZstdDecompressor().decompress(body))
+    elif compression == _ZLIB:
+        body = memoryview(zlib.decompress(body))
+    try:
+        meta = orjson.loads(body[:meta_len])
+    except orjson.JSONDecodeError:
+        # json.dumps writes non-finite scalars as NaN/Infinity, which only the stdlib parser accepts.
+        meta = json.loads(bytes(body[:meta_len]))
+    tree = meta["tree"]
+    offset = meta_len
+    for kind, count, path in meta["arrays"]:
+        block = np.frombuffer(body, dtype="<i8" if kind == "i8" else "<f8", count=count, offset=offset)
+        offset += block.nbytes
+        values = block.tolist()
+        if kind == "f8n":
+            values = [None if v != v else v for v in values]
+        tree = _place(tree, path, values)
+    return tree
+
+
+def encode_payload(payload: Any, fmt: PayloadFormat) -> str | bytes:
+    if fmt == "packed":
+        return pack_payload(payload)
+    return json.dumps(payload)
+
+
+def decode_payload(stored: str | bytes) -> Any:
+    # Rows written before packed storage was enabled (or with it disabled) are plain JSON text.
+    if isinstance(stored, (bytes, memoryview)):
+        return unpack_payload(bytes(stored))
+    return json.loads(stored)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+from app.core.schemas import (
+    CubeAggregateEnum,
+    CubeFilterOpEnum,
+    CubeQuery,
+    CubeQueryResult,
+)
+from app.data.storage import ArtifactStore
+from app.db.sqlite import Database
+from app.research.cube import CUBE_FILE, CUBE_SCHEMA
+
+CUBE_VIEW = "indicator_cube"
+# The JSON path materialises the whole result; anything larger has to use the Arrow stream.
+JSON_MAX_ROWS = 10_000
+
+_OPS = {
+    CubeFilterOpEnum.eq: "=",
+    CubeFilterOpEnum.ne: "<>",
+    CubeFilterOpEnum.lt: "<",
+    CubeFilterOpEnum.le: "<=",
+    CubeFilterOpEnum.gt: ">",
+    CubeFilterOpEnum.ge: ">=",
+}
+
+_AGGS = {
+    CubeAggregateEnum.count: "count",
+    CubeAggregateEnum.min: "min",
+    CubeAggregateEnum.max: "max",
+    CubeAggregateEnum.mean: "avg",
+    CubeAggregateEnum.median: "median",
+    CubeAggregateEnum.sum: "sum",
+    CubeAggregateEnum.arg_min: "arg_min",
+    CubeAggregateEnum.arg_max: "arg_max",
+}
+
+
+def _column(name: str) -> str:
+    if name not in CUBE_SCHEMA:
+        raise ValueError(f"Unknown cube column: {name}")
+    return f'"{name}"'
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def build_cube_sql(query: CubeQuery) -> tuple[str, list[Any], list[str]]:
+    # Every identifier comes from the cube schema or a generated alias; values are always bound parameters.
+    params: list[Any] = []
+    clauses: list[str] = []
+    for flt in query.filters:
+        if flt.op == CubeFilterOpEnum.in_:
+            values = list(flt.value) if isinstance(flt.value, (list, tuple)) else [flt.value]
+            if not values:
+                raise ValueError(f"Filter on {flt.column} needs at least one value")
+            clauses.append(f"{_column(flt.column)} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        else:
+            clauses.append(f"{_column(flt.column)} {_OPS[flt.op]} ?")
+            params.append(flt.value)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    groups = [_column(name) for name in query.group_by]
+
+    if query.aggregates:
+        select = list(groups)
+        outputs = list(query.group_by)
+        for agg in query.aggregates:
+            args = _column(agg.column) if agg.by is None else f"{_column(agg.column)}, {_column(agg.by)}"
+            select.append(f'{_AGGS[agg.agg]}({args}) AS "{agg.alias}"')
+            outputs.append(agg.alias)
+        sql = f"SELECT {', '.join(select)} FROM {CUBE_VIEW}{where}"
+        if groups:
+            sql += f" GROUP BY {', '.join(groups)}"
+    else:
+        outputs = list(query.columns or CUBE_SCHEMA)
+        sql = f"SELECT {', '.join(_column(name) for name in outputs)} FROM {CUBE_VIEW}{where}"
+        if query.per_group is not None:
+            if not groups:
+                raise ValueError("per_group requires group_by")
+            ranking = ", ".join(
+                f"{_column(o.column)} {'DESC' if o.descending else 'ASC'}" for o in query.order_by
+            ) or '"composite_error" ASC'
+            sql += f" QUALIFY row_number() OVER (PARTITION BY {', '.join(groups)} ORDER BY {ranking}) <= ?"
+            params.append(query.per_group)
+
+    if query.order_by:
+        order = []
+        for o in query.order_by:
+            if o.column not in outputs:
+                raise ValueError(f"Cannot order by {o.column}; it is not in the result columns")
+            order.append(f'"{o.column}" {"DESC" if o.descending else "ASC"}')
+        sql += f" ORDER BY {', '.join(order)}"
+    sql += " LIMIT ?"
+    params.append(query.limit)
+    return sql, params, outputs
+
+
+class _ChunkSink:
+    # Minimal writable file object so the Arrow IPC writer can hand over bytes batch by batch.
+    closed = False
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        return len(chunk)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._chunks)
+        self._chunks.clear()
+        return out
+
+
+class CubeQueryService:
+    # Each query gets its own DuckDB cursor with a temp view over the selected runs' cube parquet files,
+    # so projections and filters are pushed down into the files instead of loading them whole.
+    def __init__(self, db: Database, store: ArtifactStore, batch_rows: int = 8192) -> None:
+        self.db = db
+        self.store = store
+        self.batch_rows = batch_rows
+        self._conn = duckdb.connect(":memory:")
+        self._lock = threading.Lock()
+
+    def resolve_runs(self, query: CubeQuery) -> list[tuple[str, Path]]:
+        if query.run_ids is not None:
+            unknown = [run_id for run_id in query.run_ids if self.db.get_run(run_id) is None]
+            if unknown:
+                raise ValueError(f"Unknown run ids: {', '.join(unknown)}")
+            run_ids = query.run_ids
+        else:
+            run_ids = [row["run_id"] for row in self.db.list_run_summaries(limit=query.last_runs)]
+        root = self.store.runs_dir.resolve()
+        runs = []
+        for run_id in run_ids:
+            path = (self.store.runs_dir / run_id / CUBE_FILE).resolve()
+            if not path.is_relative_to(root):
+                raise ValueError(f"Run id {run_id!r} resolves outside the runs directory")
+            if path.exists():
+                runs.append((run_id, path))
+        return runs
+
+    def _cursor(self, paths: list[Path]) -> duckdb.DuckDBPyConnection:
+        with self._lock:
+            cursor = self._conn.cursor()
+        files = ", ".join(_literal(str(path)) for path in paths)
+        cursor.execute(f"CREATE TEMP VIEW {CUBE_VIEW} AS SELECT * FROM read_parquet([{files}], union_by_name = true)")
+        return cursor
+
+    def execute(self, query: CubeQuery) -> CubeQueryResult:
+        if query.limit > JSON_MAX_ROWS:
+            raise ValueError(f"JSON results are capped at {JSON_MAX_ROWS} rows; use format=arrow for larger queries")
+        sql, params, outputs = build_cube_sql(query)
+        runs = self.resolve_runs(query)
+        if not runs:
+            raise FileNotFoundError("No indicator cubes found for the selected runs")
+        cursor = self._cursor([path for _, path in runs])
+        try:
+            cursor.execute(sql, params)
+            rows: list[list[Any]] = []
+            while batch := cursor.fetchmany(self.batch_rows):
+                rows.extend(list(row) for row in batch)
+        except duckdb.Error as exc:
+            raise ValueError(str(exc)) from exc
+        finally:
+            cursor.close()
+        return CubeQueryResult(runs=[run_id for run_id, _ in runs], columns=outputs, rows=rows)
+
+    def stream_arrow(self, query: CubeQuery) -> Iterator[bytes]:
+        import pyarrow as pa
+
+        sql, params, _ = build_cube_sql(query)
+        runs = self.resolve_runs(query)
+        if not runs:
+            raise FileNotFoundError("No indicator cubes found for the selected runs")
+        cursor = self._cursor([path for _, path in runs])
+        try:
+            reader = cursor.execute(sql, params).to_arrow_reader(self.batch_rows)
+        except duckdb.Error as exc:
+            cursor.close()
+            raise ValueError(str(exc)) from exc
+
+        def chunks() -> Iterator[bytes]:
+            sink = _ChunkSink()
+            try:
+                with pa.ipc.new_stream(sink, reader.schema) as writer:
+                    for batch in reader:
+                        writer.write_batch(batch)
+                        yield sink.drain()
+                yield sink.drain()
+            finally:
+                cursor.close()
+
+        return chunks()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from app.core.config import settings
+from app.db.sqlite import Database
+
+
+def _size(path: Path) -> int:
+    return sum(p.stat().st_size for p in (path, Path(f"{path}-wal")) if p.exists())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.db.migrate",
+        description="Rewrite stored result and plot payloads as JSON text or packed binary blobs",
+    )
+    parser.add_argument("--to", choices=["json", "packed"], default="packed")
+    parser.add_argument("--db", type=Path, default=settings.db_path)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM, leaving freed pages in the file")
+    args = parser.parse_args(argv)
+
+    before = _size(args.db)
+    db = Database(args.db, payload_format=args.to)
+    try:
+        converted = db.migrate_payloads(batch_size=args.batch_size)
+        if not args.no_vacuum:
+            db.vacuum()
+    finally:
+        db.close()
+    print(json.dumps({"format": args.to, "converted": converted, "bytes_before": before, "bytes_after": _size(args.db)}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,21 +3,141 @@
 import json
 import sqlite3
 import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
-from app.core.schemas import RunStageEnum, RunStatusEnum
+from app.core.schemas import RunStageEnum, RunStatusEnum, SearchJobStatusEnum
+from app.db.codec import PayloadFormat, decode_payload, encode_payload
 
 
 class Database:
-    def __init__(self, path: Path) -> None:
+    # Writes go through one connection guarded by a lock; log and artifact inserts are buffered and
+    # committed in batches. Reads use pooled connections, which WAL lets run alongside the writer.
+    # Result and plot payloads are JSON text by default; "packed" stores them as compressed binary blobs
+    # (see app.db.codec) and both kinds of row are readable whichever format is configured.
+    def __init__(
+        self,
+        path: Path,
+        flush_interval_seconds: float = 0.5,
+        max_buffered_writes: int = 200,
+        payload_format: PayloadFormat = "json",
+        max_idle_readers: int = 4,
+    ) -> None:
         self._path = path
+        self.payload_format = payload_format
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(path), check_same_thread=False)
-        self._conn.row_factory = sqlite3.Row
+        self._conn = self._connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
         self._lock = threading.Lock()
+        self._idle_readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._max_idle_readers = max_idle_readers
+        self._open_readers = 0
+
+        self._buffer_lock = threading.Lock()
+        self._pending_logs: list[tuple[str, str, str, str]] = []
+        self._pending_artifacts: list[tuple[str, str, str, str]] = []
+        self._max_buffered_writes = max_buffered_writes
+        self._flush_interval_seconds = flush_interval_seconds
+        self._closed = threading.Event()
+
         self._init_schema()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="ni-db-flush")
+        self._flusher.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self._path), check_same_thread=False, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        # Checked out per read and handed back afterwards, so short-lived run threads do not each keep a
+        # connection; at most `max_idle_readers` stay open between reads.
+        with self._readers_lock:
+            conn = self._idle_readers.pop() if self._idle_readers else None
+        if conn is None:
+            conn = self._connect()
+            with self._readers_lock:
+                self._open_readers += 1
+        try:
+            yield conn
+        finally:
+            with self._readers_lock:
+                keep = not self._closed.is_set() and len(self._idle_readers) < self._max_idle_readers
+                if keep:
+                    self._idle_readers.append(conn)
+                else:
+                    self._open_readers -= 1
+            if not keep:
+                conn.close()
+
+    def _fetchone(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Row | None:
+        with self._reader() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    def _fetchall(self, sql: str, params: Sequence[Any] = ()) -> list[sqlite3.Row]:
+        with self._reader() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def open_readers(self) -> int:
+        with self._readers_lock:
+            return self._open_readers
+
+    def journal_mode(self) -> str:
+        return str(self._fetchone("PRAGMA journal_mode")[0])
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self._flush_interval_seconds):
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock, self._conn:
+            self._drain_pending()
+
+    def _drain_pending(self) -> None:
+        # Caller must hold self._lock inside an open transaction.
+        with self._buffer_lock:
+            logs, self._pending_logs = self._pending_logs, []
+            artifacts, self._pending_artifacts = self._pending_artifacts, []
+        if logs:
+            self._conn.executemany(
+                "INSERT INTO run_logs (run_id, timestamp, stage, message) VALUES (?, ?, ?, ?)",
+                logs,
+            )
+        if artifacts:
+            self._conn.executemany(
+                "INSERT INTO run_artifacts (run_id, artifact_type, path, created_at) VALUES (?, ?, ?, ?)",
+                artifacts,
+            )
+
+    def _has_pending(self) -> bool:
+        with self._buffer_lock:
+            return bool(self._pending_logs or self._pending_artifacts)
+
+    def _enqueue(self, queue: list[tuple[str, str, str, str]], row: tuple[str, str, str, str]) -> None:
+        with self._buffer_lock:
+            queue.append(row)
+            should_flush = len(self._pending_logs) + len(self._pending_artifacts) >= self._max_buffered_writes
+        if should_flush:
+            self.flush()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+        with self._readers_lock:
+            for conn in self._idle_readers:
+                conn.close()
+            self._open_readers -= len(self._idle_readers)
+            self._idle_readers.clear()
+        self._conn.close()
 
     def _init_schema(self) -> None:
         with self._conn:
@@ -67,6 +187,32 @@ class Database:
                     created_at TEXT NOT NULL,
                     FOREIGN KEY(run_id) REFERENCES runs(run_id)
                 );
+
+                CREATE TABLE IF NOT EXISTS search_jobs (
+                    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    worker_id TEXT,
+                    lease_expires_at REAL,
+                    heartbeat_at REAL,
+                    config_json TEXT NOT NULL,
+                    result_path TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    UNIQUE (run_id, symbol, timeframe),
+                    FOREIGN KEY(run_id) REFERENCES runs(run_id)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_run_logs_run_id ON run_logs(run_id, id);
+                CREATE INDEX IF NOT EXISTS idx_run_artifacts_run_id ON run_artifacts(run_id, id);
+                CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created_at DESC, run_id DESC);
+                CREATE INDEX IF NOT EXISTS idx_runs_status_created ON runs(status, created_at DESC, run_id DESC);
+                CREATE INDEX IF NOT EXISTS idx_search_jobs_claim ON search_jobs(status, job_id);
                 """
             )
 
@@ -95,16 +241,73 @@ class Database:
             )
 
     def get_run(self, run_id: str) -> sqlite3.Row | None:
-        with self._lock:
-            row = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
-            return row
+        return self._fetchone("SELECT * FROM runs WHERE run_id = ?", (run_id,))
 
     def list_runs(self, limit: int = 50) -> list[sqlite3.Row]:
-        with self._lock:
-            rows = self._conn.execute(
-                "SELECT * FROM runs ORDER BY created_at DESC LIMIT ?", (limit,)
-            ).fetchall()
-            return rows
+        return self._fetchall(
+            "SELECT * FROM runs ORDER BY created_at DESC LIMIT ?", (limit,)
+        )
+
+    def list_run_summaries(
+        self,
+        limit: int = 50,
+        cursor: tuple[str, str] | None = None,
+        status: RunStatusEnum | None = None,
+    ) -> list[sqlite3.Row]:
+        # One keyset-paginated query: each run row joined with its latest log line, ordered newest first.
+        if self._has_pending():
+            self.flush()
+        clauses: list[str] = []
+        params: list[Any] = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if cursor is not None:
+            clauses.append("(created_at, run_id) < (?, ?)")
+            params.extend(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        return self._fetchall(
+            f"""
+            SELECT
+                r.run_id, r.status, r.stage, r.progress, r.created_at, r.updated_at, r.config_hash, r.error,
+                l.timestamp AS log_timestamp, l.stage AS log_stage, l.message AS log_message
+            FROM (
+                SELECT run_id, status, stage, progress, created_at, updated_at, config_hash, error
+                FROM runs
+                {where}
+                ORDER BY created_at DESC, run_id DESC
+                LIMIT ?
+            ) AS r
+            LEFT JOIN run_logs AS l
+                ON l.id = (SELECT MAX(id) FROM run_logs WHERE run_id = r.run_id)
+            ORDER BY r.created_at DESC, r.run_id DESC
+            """,
+            params,
+        )
+
+    def get_logs_for_runs(self, run_ids: list[str], limit_per_run: int = 500) -> dict[str, list[sqlite3.Row]]:
+        out: dict[str, list[sqlite3.Row]] = {run_id: [] for run_id in run_ids}
+        if not run_ids:
+            return out
+        if self._has_pending():
+            self.flush()
+        placeholders = ",".join("?" for _ in run_ids)
+        rows = self._fetchall(
+            f"""
+            SELECT run_id, timestamp, stage, message
+            FROM run_logs
+            WHERE run_id IN ({placeholders})
+            ORDER BY run_id, id ASC
+            """,
+            run_ids,
+        )
+        # Capped here rather than with ROW_NUMBER(): the window sort costs more than the rows it drops.
+        for row in rows:
+            logs = out[row["run_id"]]
+            if len(logs) < limit_per_run:
+                logs.append(row)
+        return out
 
     def update_run_status(
         self,
@@ -124,29 +327,47 @@ class Database:
                 (status.value, stage.value, float(progress), self._now(), error, run_id),
             )
 
-    def add_log(self, run_id: str, stage: RunStageEnum, message: str) -> None:
+    def record_progress(
+        self,
+        run_id: str,
+        status: RunStatusEnum,
+        stage: RunStageEnum,
+        progress: float,
+        message: str,
+        error: str | None = None,
+    ) -> None:
+        now = self._now()
         with self._lock, self._conn:
+            self._drain_pending()
             self._conn.execute(
                 """
-                INSERT INTO run_logs (run_id, timestamp, stage, message)
-                VALUES (?, ?, ?, ?)
+                UPDATE runs
+                SET status = ?, stage = ?, progress = ?, updated_at = ?, error = ?
+                WHERE run_id = ?
                 """,
-                (run_id, self._now(), stage.value, message),
+                (status.value, stage.value, float(progress), now, error, run_id),
             )
+            self._conn.execute(
+                "INSERT INTO run_logs (run_id, timestamp, stage, message) VALUES (?, ?, ?, ?)",
+                (run_id, now, stage.value, message),
+            )
+
+    def add_log(self, run_id: str, stage: RunStageEnum, message: str) -> None:
+        self._enqueue(self._pending_logs, (run_id, self._now(), stage.value, message))
 
     def get_logs(self, run_id: str, limit: int = 500) -> list[sqlite3.Row]:
-        with self._lock:
-            rows = self._conn.execute(
-                """
-                SELECT timestamp, stage, message
-                FROM run_logs
-                WHERE run_id = ?
-                ORDER BY id ASC
-                LIMIT ?
-                """,
-                (run_id, limit),
-            ).fetchall()
-            return rows
+        if self._has_pending():
+            self.flush()
+        return self._fetchall(
+            """
+            SELECT timestamp, stage, message
+            FROM run_logs
+            WHERE run_id = ?
+            ORDER BY id ASC
+            LIMIT ?
+            """,
+            (run_id, limit),
+        )
 
     def save_result(self, run_id: str, result_json: dict[str, Any]) -> None:
         with self._lock, self._conn:
@@ -158,17 +379,26 @@ class Database:
                     result_json = excluded.result_json,
                     updated_at = excluded.updated_at
                 """,
-                (run_id, json.dumps(result_json), self._now()),
+                (run_id, encode_payload(result_json, self.payload_format), self._now()),
             )
 
     def get_result(self, run_id: str) -> dict[str, Any] | None:
-        with self._lock:
-            row = self._conn.execute(
-                "SELECT result_json FROM run_results WHERE run_id = ?", (run_id,)
-            ).fetchone()
-            if row is None:
-                return None
-            return json.loads(row["result_json"])
+        row = self._fetchone(
+            "SELECT result_json FROM run_results WHERE run_id = ?", (run_id,)
+        )
+        if row is None:
+            return None
+        return decode_payload(row["result_json"])
+
+    def get_result_version(self, run_id: str) -> str | None:
+        row = self._fetchone("SELECT updated_at FROM run_results WHERE run_id = ?", (run_id,))
+        return None if row is None else row["updated_at"]
+
+    def get_result_raw(self, run_id: str) -> str | bytes | None:
+        row = self._fetchone(
+            "SELECT result_json FROM run_results WHERE run_id = ?", (run_id,)
+        )
+        return None if row is None else row["result_json"]
 
     def save_plot(self, run_id: str, plot_id: str, payload_json: dict[str, Any]) -> None:
         with self._lock, self._conn:
@@ -179,33 +409,214 @@ class Database:
                 ON CONFLICT(run_id, plot_id) DO UPDATE SET
                     payload_json = excluded.payload_json
                 """,
-                (run_id, plot_id, json.dumps(payload_json)),
+                (run_id, plot_id, encode_payload(payload_json, self.payload_format)),
             )
 
     def get_plot(self, run_id: str, plot_id: str) -> dict[str, Any] | None:
+        row = self._fetchone(
+            "SELECT payload_json FROM run_plots WHERE run_id = ? AND plot_id = ?",
+            (run_id, plot_id),
+        )
+        if row is None:
+            return None
+        return decode_payload(row["payload_json"])
+
+    def get_plot_raw(self, run_id: str, plot_id: str) -> str | bytes | None:
+        row = self._fetchone(
+            "SELECT payload_json FROM run_plots WHERE run_id = ? AND plot_id = ?",
+            (run_id, plot_id),
+        )
+        return None if row is None else row["payload_json"]
+
+    def migrate_payloads(self, payload_format: PayloadFormat | None = None, batch_size: int = 50) -> dict[str, int]:
+        # Rewrites stored result and plot payloads into the target format (the configured one by default).
+        # Each batch is its own transaction so readers and the run writer are never held up for long;
+        # run_results.updated_at is left alone because the decoded content does not change.
+        target = payload_format or self.payload_format
+        source_type = "text" if target == "packed" else "blob"
+        tables = (
+            ("results", "run_results", "result_json", ("run_id",)),
+            ("plots", "run_plots", "payload_json", ("run_id", "plot_id")),
+        )
+        converted: dict[str, int] = {}
+        for label, table, column, key_columns in tables:
+            where = " AND ".join(f"{name} = ?" for name in key_columns)
+            keys = self._fetchall(
+                f"SELECT {', '.join(key_columns)} FROM {table} WHERE typeof({column}) = ?", (source_type,)
+            )
+            for start in range(0, len(keys), batch_size):
+                with self._lock, self._conn:
+                    for key in keys[start : start + batch_size]:
+                        row = self._conn.execute(f"SELECT {column} FROM {table} WHERE {where}", tuple(key)).fetchone()
+                        if row is not None:
+                            stored = encode_payload(decode_payload(row[0]), target)
+                            self._conn.execute(f"UPDATE {table} SET {column} = ? WHERE {where}", (stored, *key))
+            converted[label] = len(keys)
+        return converted
+
+    def vacuum(self) -> None:
+        self.flush()
         with self._lock:
-            row = self._conn.execute(
-                "SELECT payload_json FROM run_plots WHERE run_id = ? AND plot_id = ?",
-                (run_id, plot_id),
-            ).fetchone()
-            if row is None:
-                return None
-            return json.loads(row["payload_json"])
+            self._conn.execute("VACUUM")
 
     def add_artifact(self, run_id: str, artifact_type: str, path: str) -> None:
+        self._enqueue(self._pending_artifacts, (run_id, artifact_type, path, self._now()))
+
+    def upsert_artifact(self, run_id: str, artifact_type: str, path: str) -> None:
+        # For artifacts a run has at most one of (e.g. its report): replaces any earlier row of the type.
         with self._lock, self._conn:
+            self._drain_pending()
+            self._conn.execute("DELETE FROM run_artifacts WHERE run_id = ? AND artifact_type = ?", (run_id, artifact_type))
             self._conn.execute(
-                """
-                INSERT INTO run_artifacts (run_id, artifact_type, path, created_at)
-                VALUES (?, ?, ?, ?)
-                """,
+                "INSERT INTO run_artifacts (run_id, artifact_type, path, created_at) VALUES (?, ?, ?, ?)",
                 (run_id, artifact_type, path, self._now()),
             )
 
+    def delete_artifacts(self, run_id: str, artifact_type: str) -> None:
+        with self._lock, self._conn:
+            self._drain_pending()
+            self._conn.execute("DELETE FROM run_artifacts WHERE run_id = ? AND artifact_type = ?", (run_id, artifact_type))
+
     def get_artifacts(self, run_id: str) -> list[sqlite3.Row]:
-        with self._lock:
-            rows = self._conn.execute(
-                "SELECT artifact_type, path, created_at FROM run_artifacts WHERE run_id = ? ORDER BY id ASC",
-                (run_id,),
-            ).fetchall()
-            return rows
+        if self._has_pending():
+            self.flush()
+        return self._fetchall(
+            "SELECT artifact_type, path, created_at FROM run_artifacts WHERE run_id = ? ORDER BY id ASC",
+            (run_id,),
+        )
+
+    # Search work queue: the run thread publishes one job per (symbol, timeframe) and worker processes,
+    # each with its own Database on the same file, lease jobs from it. A lease is a deadline on the wall
+    # clock (epoch seconds, shared by every process on the host) that the holder pushes forward with
+    # heartbeats; a job whose lease lapses is handed to the next worker that asks, until max_attempts.
+    def publish_search_jobs(self, run_id: str, jobs: list[tuple[str, str]], config_json: str, max_attempts: int = 3) -> None:
+        now = self._now()
+        with self._lock, self._conn:
+            # Resumed runs republish: earlier rows for the same run are reset rather than duplicated.
+            self._conn.executemany(
+                """
+                INSERT INTO search_jobs (run_id, symbol, timeframe, status, max_attempts, config_json, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(run_id, symbol, timeframe) DO UPDATE SET
+                    status = excluded.status,
+                    attempts = 0,
+                    max_attempts = excluded.max_attempts,
+                    worker_id = NULL,
+                    lease_expires_at = NULL,
+                    heartbeat_at = NULL,
+                    config_json = excluded.config_json,
+                    result_path = NULL,
+                    error = NULL,
+                    updated_at = excluded.updated_at
+                """,
+                [
+                    (run_id, symbol, timeframe, SearchJobStatusEnum.queued.value, max_attempts, config_json, now, now)
+                    for symbol, timeframe in jobs
+                ],
+            )
+
+    def claim_search_job(self, worker_id: str, lease_seconds: float) -> sqlite3.Row | None:
+        clock = time.time()
+        now = self._now()
+        leased = SearchJobStatusEnum.leased.value
+        with self._lock, self._conn:
+            # Lapsed leases that have used up their attempts are retired first so they are not claimed again.
+            self._conn.execute(
+                """
+                UPDATE search_jobs
+                SET status = ?, error = 'Lease expired on attempt ' || attempts || ' (worker ' || coalesce(worker_id, '') || ')',
+                    worker_id = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts
+                """,
+                (SearchJobStatusEnum.failed.value, now, leased, clock),
+            )
+            # Selecting and leasing in one statement keeps two workers from taking the same job.
+            return self._conn.execute(
+                """
+                UPDATE search_jobs
+                SET status = ?, worker_id = ?, attempts = attempts + 1, lease_expires_at = ?, heartbeat_at = ?, updated_at = ?
+                WHERE job_id = (
+                    SELECT job_id FROM search_jobs
+                    WHERE status = ? OR (status = ? AND lease_expires_at < ?)
+                    ORDER BY job_id
+                    LIMIT 1
+                )
+                RETURNING job_id, run_id, symbol, timeframe, attempts, config_json
+                """,
+                (leased, worker_id, clock + lease_seconds, clock, now, SearchJobStatusEnum.queued.value, leased, clock),
+            ).fetchone()
+
+    def heartbeat_search_job(self, job_id: int, worker_id: str, lease_seconds: float) -> bool:
+        clock = time.time()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                """
+                UPDATE search_jobs SET lease_expires_at = ?, heartbeat_at = ?
+                WHERE job_id = ? AND worker_id = ? AND status = ?
+                """,
+                (clock + lease_seconds, clock, job_id, worker_id, SearchJobStatusEnum.leased.value),
+            )
+            return cur.rowcount == 1
+
+    def complete_search_job(self, job_id: int, worker_id: str, result_path: str) -> bool:
+        # False when the lease was lost (expired and re-claimed, or the run canceled its jobs).
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                """
+                UPDATE search_jobs SET status = ?, result_path = ?, lease_expires_at = NULL, error = NULL, updated_at = ?
+                WHERE job_id = ? AND worker_id = ? AND status = ?
+                """,
+                (SearchJobStatusEnum.done.value, result_path, self._now(), job_id, worker_id, SearchJobStatusEnum.leased.value),
+            )
+            return cur.rowcount == 1
+
+    def fail_search_job(self, job_id: int, worker_id: str, error: str) -> bool:
+        # Requeues the job while it has attempts left; returns False when the lease was already lost.
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                """
+                UPDATE search_jobs
+                SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END,
+                    worker_id = NULL, lease_expires_at = NULL, error = ?, updated_at = ?
+                WHERE job_id = ? AND worker_id = ? AND status = ?
+                """,
+                (
+                    SearchJobStatusEnum.failed.value,
+                    SearchJobStatusEnum.queued.value,
+                    error,
+                    self._now(),
+                    job_id,
+                    worker_id,
+                    SearchJobStatusEnum.leased.value,
+                ),
+            )
+            return cur.rowcount == 1
+
+    def cancel_search_jobs(self, run_id: str) -> int:
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                """
+                UPDATE search_jobs SET status = ?, lease_expires_at = NULL, updated_at = ?
+                WHERE run_id = ? AND status IN (?, ?)
+                """,
+                (
+                    SearchJobStatusEnum.canceled.value,
+                    self._now(),
+                    run_id,
+                    SearchJobStatusEnum.queued.value,
+                    SearchJobStatusEnum.leased.value,
+                ),
+            )
+            return cur.rowcount
+
+    def get_search_jobs(self, run_id: str) -> list[sqlite3.Row]:
+        return self._fetchall(
+            """
+            SELECT job_id, symbol, timeframe, status, attempts, max_attempts, worker_id, lease_expires_at,
+                   heartbeat_at, result_path, error
+            FROM search_jobs
+            WHERE run_id = ?
+            ORDER BY job_id
+            """,
+            (run_id,),
+        )
@@ -3,6 +3,8 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.compression import CompressionMiddleware
+from app.api.responses import OrjsonResponse
 from app.api.routes_health import router as health_router
 from app.api.routes_runs import router as runs_router
 from app.core.config import ensure_paths, settings
@@ -12,7 +14,13 @@ from app.core.logging import configure_logging
 configure_logging()
 ensure_paths()
 
-app = FastAPI(title=settings.app_name, version="0.1.0")
+app = FastAPI(title=settings.app_name, version="0.1.0", default_response_class=OrjsonResponse)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_bytes,
+    gzip_level=settings.gzip_level,
+    zstd_level=settings.zstd_level,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
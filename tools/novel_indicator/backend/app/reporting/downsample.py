@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Any, Literal
+
+import numpy as np
+
+DownsampleMode = Literal["lttb", "envelope"]
+
+# Line plots are stored at full resolution; a plot request without max_points gets this many LTTB points.
+DEFAULT_MAX_POINTS = 4000
+
+
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    # Largest-Triangle-Three-Buckets over one or more series sharing an x axis: y is (n,) or (k, n) and the
+    # picked point in each bucket maximises the summed triangle area of the range-normalised series.
+    ys = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    n = ys.shape[1]
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][: max(n_out, 0)], dtype=np.int64)
+
+    span = np.nanmax(ys, axis=1, keepdims=True) - np.nanmin(ys, axis=1, keepdims=True)
+    ys = (ys - np.nanmin(ys, axis=1, keepdims=True)) / np.where(span > 0.0, span, 1.0)
+    ys = np.nan_to_num(ys, nan=0.0)
+    x = np.arange(n, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges).astype(np.float64)
+    bucket_x = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    bucket_y = np.add.reduceat(ys[:, :-1], edges[:-1], axis=1) / counts
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 1 < n_out - 2:
+            next_x, next_y = bucket_x[i + 1], bucket_y[:, i + 1]
+        else:
+            next_x, next_y = x[-1], ys[:, -1]
+        area = np.abs(
+            (x[a] - next_x) * (ys[:, lo:hi] - ys[:, a, None]) - (x[a] - x[lo:hi]) * (next_y[:, None] - ys[:, a, None])
+        ).sum(axis=0)
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def minmax_envelope(y: np.ndarray, n_buckets: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Per-bucket (start index, mean, min, max) for each series; NaNs are ignored within a bucket.
+    ys = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    n = ys.shape[1]
+    n_buckets = max(1, min(n_buckets, n))
+    starts = np.linspace(0, n, n_buckets + 1).astype(np.int64)[:-1]
+    finite = np.isfinite(ys)
+    counts = np.add.reduceat(finite, starts, axis=1)
+    sums = np.add.reduceat(np.where(finite, ys, 0.0), starts, axis=1)
+    lows = np.minimum.reduceat(np.where(finite, ys, np.inf), starts, axis=1)
+    highs = np.maximum.reduceat(np.where(finite, ys, -np.inf), starts, axis=1)
+    empty = counts == 0
+    means = np.where(empty, np.nan, sums / np.maximum(counts, 1))
+    return starts, means, np.where(empty, np.nan, lows), np.where(empty, np.nan, highs)
+
+
+def _stack(series: list[dict[str, Any]], n: int) -> np.ndarray:
+    # Shorter series (e.g. equity curves of different lengths) are NaN-padded to the shared x axis.
+    block = np.full((len(series), n), np.nan)
+    for row, item in enumerate(series):
+        values = np.asarray(item["values"], dtype=np.float64)
+        block[row, : len(values)] = values
+    return block
+
+
+def _values(row: np.ndarray, length: int, picks: np.ndarray) -> list[float | None]:
+    kept = row[picks[picks < length]]
+    return [float(v) if np.isfinite(v) else None for v in kept]
+
+
+def as_float_list(values: Any) -> list[Any]:
+    if isinstance(values, list):
+        return values
+    return _values(np.asarray(values, dtype=np.float64), len(values), np.arange(len(values)))
+
+
+def downsample_line(payload: dict[str, Any], max_points: int, mode: DownsampleMode = "lttb") -> dict[str, Any]:
+    x = list(payload.get("x", []))
+    series = payload.get("series", [])
+    if len(x) <= max_points or not series:
+        return {**payload, "series": [{**item, "values": as_float_list(item["values"])} for item in series]}
+    block = _stack(series, len(x))
+    lengths = [len(item["values"]) for item in series]
+    meta = {"mode": mode, "source_points": payload.get("downsample", {}).get("source_points", len(x))}
+
+    if mode == "envelope":
+        starts, means, lows, highs = minmax_envelope(block, max_points)
+        out_series = []
+        for row, item in enumerate(series):
+            picks = np.arange(len(starts))[starts < lengths[row]]
+            out_series.append(
+                {
+                    **item,
+                    "values": _values(means[row], len(starts), picks),
+                    "min": _values(lows[row], len(starts), picks),
+                    "max": _values(highs[row], len(starts), picks),
+                }
+            )
+        return {**payload, "x": [x[i] for i in starts], "series": out_series, "downsample": meta}
+
+    picks = lttb_indices(block, max_points)
+    return {
+        **payload,
+        "x": [x[i] for i in picks],
+        "series": [{**item, "values": _values(block[row], lengths[row], picks)} for row, item in enumerate(series)],
+        "downsample": meta,
+    }
+
+
+def downsample_payload(payload: dict[str, Any], max_points: int, mode: DownsampleMode = "lttb") -> dict[str, Any]:
+    if payload.get("type") != "line":
+        return payload
+    return downsample_line(payload, max_points, mode)
@@ -4,15 +4,21 @@ from collections import defaultdict
 
 import numpy as np
 
+from app.reporting.downsample import as_float_list
+from app.research.backtest.engine import BacktestSweep
 from app.research.search.optimizer import SearchOutcome
 
 
 def build_plot_payloads(
     outcomes: list[SearchOutcome],
     backtests: dict[tuple[str, str], dict[str, float | list[float]]] | None = None,
+    sweeps: dict[tuple[str, str], BacktestSweep] | None = None,
+    candidate_backtests: dict[tuple[str, str], dict[str, dict[str, float]]] | None = None,
 ) -> dict[str, dict]:
     payloads: dict[str, dict] = {}
     backtests = backtests or {}
+    sweeps = sweeps or {}
+    candidate_backtests = candidate_backtests or {}
 
     labels: list[str] = []
     horizons: list[int] = []
@@ -45,6 +51,8 @@ def build_plot_payloads(
                 "pnl": float(backtests.get((o.symbol, o.timeframe), {}).get("pnl_total", 0.0)),
                 "max_drawdown": float(backtests.get((o.symbol, o.timeframe), {}).get("max_drawdown", 0.0)),
                 "turnover": float(backtests.get((o.symbol, o.timeframe), {}).get("turnover", 0.0)),
+                "best_threshold": backtests.get((o.symbol, o.timeframe), {}).get("best_threshold"),
+                "best_threshold_pnl": backtests.get((o.symbol, o.timeframe), {}).get("best_threshold_pnl"),
             }
             for o in outcomes
         ],
@@ -59,29 +67,45 @@ def build_plot_payloads(
 
     if outcomes:
         best = sorted(outcomes, key=lambda o: o.combo_score.composite_error)[0]
-        n = min(len(best.combo_score.y_true), len(best.combo_score.y_pred), 500)
+        n = min(len(best.combo_score.y_true), len(best.combo_score.y_pred))
+        # Line plots keep every point; the plot endpoint downsamples them per request.
         payloads["forecast_overlay"] = {
             "title": f"Forecast vs Realized ({best.symbol}:{best.timeframe})",
             "type": "line",
             "x": list(range(n)),
             "series": [
-                {"name": "y_true", "values": best.combo_score.y_true[:n].tolist()},
-                {"name": "y_pred", "values": best.combo_score.y_pred[:n].tolist()},
-                {"name": "close_ref", "values": best.combo_score.close_ref[:n].tolist()},
+                {"name": "y_true", "values": as_float_list(best.combo_score.y_true[:n])},
+                {"name": "y_pred", "values": as_float_list(best.combo_score.y_pred[:n])},
+                {"name": "close_ref", "values": as_float_list(best.combo_score.close_ref[:n])},
             ],
         }
 
+        sweep = sweeps.get((best.symbol, best.timeframe))
+        if sweep is not None:
+            payloads["threshold_sensitivity"] = {
+                "title": f"PnL by Signal Threshold and Cost ({best.symbol}:{best.timeframe})",
+                "type": "heatmap",
+                "x": sweep.thresholds.tolist(),
+                "y": [f"{c:g} bps" for c in sweep.cost_bps],
+                "z": sweep.pnl_total.T.tolist(),
+            }
+
     # Novelty vs accuracy uses candidate complexity from top candidate per outcome.
     novelty_points: list[dict] = []
     for outcome in outcomes:
+        combo_pnl = float(backtests.get((outcome.symbol, outcome.timeframe), {}).get("pnl_total", 0.0))
+        per_candidate = candidate_backtests.get((outcome.symbol, outcome.timeframe), {})
         for cand, ev in outcome.best_candidates[:15]:
+            cand_bt = per_candidate.get(cand.indicator_id)
             novelty_points.append(
                 {
                     "label": f"{outcome.symbol}:{outcome.timeframe}:{cand.indicator_id}",
                     "complexity": cand.complexity,
                     "error": float(ev.best_score.composite_error),
                     "hit_rate": float(ev.best_score.directional_hit_rate),
-                    "pnl": float(backtests.get((outcome.symbol, outcome.timeframe), {}).get("pnl_total", 0.0)),
+                    "pnl": cand_bt["pnl_total"] if cand_bt is not None else combo_pnl,
+                    "max_drawdown": cand_bt["max_drawdown"] if cand_bt is not None else None,
+                    "turnover": cand_bt["turnover"] if cand_bt is not None else None,
                 }
             )
 
@@ -110,8 +134,8 @@ def build_plot_payloads(
         for outcome in top:
             equity = backtests.get((outcome.symbol, outcome.timeframe), {}).get("equity_curve", [])
             if isinstance(equity, list):
-                max_len = max(max_len, min(len(equity), 800))
-                series.append({"name": f"{outcome.symbol}:{outcome.timeframe}", "values": equity[:800]})
+                max_len = max(max_len, len(equity))
+                series.append({"name": f"{outcome.symbol}:{outcome.timeframe}", "values": as_float_list(equity)})
         payloads["equity_curve"] = {
             "title": "Equity Curves (Top 3)",
             "type": "line",
@@ -5,7 +5,6 @@ from pathlib import Path
 from statistics import mean
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
-from xhtml2pdf import pisa
 
 from app.core.schemas import ReportArtifact, ResultSummary
 from app.data.storage import ArtifactStore
@@ -20,7 +19,7 @@ class ReportBuilder:
             autoescape=select_autoescape(["html", "xml"]),
         )
 
-    def build(self, run_id: str, summary: ResultSummary) -> ReportArtifact:
+    def render_html(self, run_id: str, summary: ResultSummary) -> str:
         template = self.env.get_template("report.html.j2")
         per_asset = [r.model_dump() for r in summary.per_asset_recommendations]
         avg_error = mean([row["score"]["composite_error"] for row in per_asset]) if per_asset else 0.0
@@ -37,7 +36,7 @@ class ReportBuilder:
             warnings.append("Average post-cost PnL is non-positive.")
         if avg_error > 1.2:
             warnings.append("Composite error remains elevated.")
-        html = template.render(
+        return template.render(
             run_id=run_id,
             generated_at=datetime.now(timezone.utc).isoformat(),
             universal=summary.universal_recommendation.model_dump(),
@@ -53,13 +52,27 @@ class ReportBuilder:
             validation=summary.validation_report.model_dump() if summary.validation_report else None,
         )
 
+    @staticmethod
+    def write_pdf(html: str, pdf_path: Path) -> None:
+        # xhtml2pdf (reportlab, pyhanko, ...) takes about a second to import, so it is only loaded here.
+        from xhtml2pdf import pisa
+
+        # Rendered to a temp file first so a half-written PDF is never served as the cached copy.
+        tmp_path = pdf_path.with_suffix(".pdf.tmp")
+        with tmp_path.open("wb") as f:
+            result = pisa.CreatePDF(src=html, dest=f)
+        if result.err:
+            tmp_path.unlink(missing_ok=True)
+            raise RuntimeError(f"PDF rendering failed with {result.err} error(s)")
+        tmp_path.replace(pdf_path)
+
+    def build(self, run_id: str, summary: ResultSummary) -> ReportArtifact:
+        html = self.render_html(run_id, summary)
         report_dir = self.store.report_dir(run_id)
         html_path = report_dir / "report.html"
         pdf_path = report_dir / "report.pdf"
 
         html_path.write_text(html, encoding="utf-8")
-
-        with pdf_path.open("wb") as f:
-            pisa.CreatePDF(src=html, dest=f)
+        self.write_pdf(html, pdf_path)
 
         return ReportArtifact(run_id=run_id, html_path=str(html_path), pdf_path=str(pdf_path))
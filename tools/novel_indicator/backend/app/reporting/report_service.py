@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from app.core.schemas import ReportArtifact, ReportStatusEnum, ResultSummary
+from app.data.storage import ArtifactStore
+from app.reporting.report_builder import ReportBuilder
+
+REPORT_MANIFEST = "report.json"
+
+
+def summary_digest(summary: ResultSummary) -> str:
+    return hashlib.sha256(summary.model_dump_json().encode("utf-8")).hexdigest()
+
+
+class ReportService:
+    # Reports are rendered on first request and cached under the run's report dir, keyed by the digest of
+    # the ResultSummary they were built from. HTML is rendered inline; PDF conversion runs on a worker pool.
+    def __init__(self, store: ArtifactStore, builder: ReportBuilder | None = None, max_workers: int = 1) -> None:
+        self.store = store
+        self.builder = builder or ReportBuilder(store)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="report-pdf")
+        self._jobs: dict[str, tuple[str, Future[None]]] = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, run_id: str) -> tuple[Path, Path, Path]:
+        report_dir = self.store.report_dir(run_id)
+        return report_dir / "report.html", report_dir / "report.pdf", report_dir / REPORT_MANIFEST
+
+    def _load_manifest(self, path: Path) -> dict[str, Any] | None:
+        if not path.exists():
+            return None
+        return self.store.load_json(path)
+
+    def _artifact(self, run_id: str, manifest: dict[str, Any], cached: bool) -> ReportArtifact:
+        html_path, pdf_path, _ = self._paths(run_id)
+        return ReportArtifact(
+            run_id=run_id,
+            html_path=str(html_path),
+            pdf_path=str(pdf_path),
+            digest=manifest["digest"],
+            pdf_status=ReportStatusEnum(manifest["pdf_status"]),
+            cached=cached,
+            error=manifest.get("error"),
+        )
+
+    def _current(self, run_id: str, digest: str) -> tuple[ReportArtifact | None, bool]:
+        # Caller holds self._lock. Returns the artifact when nothing needs doing, and whether the HTML on
+        # disk already matches `digest`.
+        html_path, pdf_path, manifest_path = self._paths(run_id)
+        manifest = self._load_manifest(manifest_path)
+        fresh = manifest is not None and manifest.get("digest") == digest and html_path.exists()
+        if fresh and manifest["pdf_status"] == ReportStatusEnum.ready.value and pdf_path.exists():
+            return self._artifact(run_id, manifest, cached=True), fresh
+        job = self._jobs.get(run_id)
+        if fresh and job is not None and job[0] == digest and not job[1].done():
+            return self._artifact(run_id, manifest, cached=True), fresh
+        return None, fresh
+
+    def request(
+        self,
+        run_id: str,
+        summary: ResultSummary,
+        on_pdf: Callable[[Path | None], None] | None = None,
+    ) -> ReportArtifact:
+        # The lock only covers the manifest check and job bookkeeping; HTML renders outside it so requests
+        # for different runs do not queue behind each other. `on_pdf` is called with None when a stale PDF
+        # is deleted and, on the worker, with the path once the PDF for this digest has been written.
+        digest = summary_digest(summary)
+        html_path, pdf_path, manifest_path = self._paths(run_id)
+        with self._lock:
+            artifact, fresh = self._current(run_id, digest)
+        if artifact is not None:
+            return artifact
+
+        staged = None
+        if fresh:
+            html = html_path.read_text(encoding="utf-8")
+        else:
+            html = self.builder.render_html(run_id, summary)
+            staged = html_path.with_name(f"{html_path.name}.{threading.get_ident()}.tmp")
+            staged.write_text(html, encoding="utf-8")
+
+        with self._lock:
+            # Another request may have finished the same digest while this one rendered.
+            artifact, _ = self._current(run_id, digest)
+            if artifact is not None:
+                if staged is not None:
+                    staged.unlink(missing_ok=True)
+                return artifact
+            if staged is not None:
+                staged.replace(html_path)
+                pdf_path.unlink(missing_ok=True)
+                if on_pdf is not None:
+                    on_pdf(None)
+            manifest = {"digest": digest, "pdf_status": ReportStatusEnum.pending.value}
+            self.store.save_json(manifest_path, manifest)
+            future = self._executor.submit(self._render_pdf, run_id, digest, html, on_pdf)
+            self._jobs[run_id] = (digest, future)
+            return self._artifact(run_id, manifest, cached=fresh)
+
+    def _render_pdf(self, run_id: str, digest: str, html: str, on_pdf: Callable[[Path | None], None] | None) -> None:
+        _, pdf_path, manifest_path = self._paths(run_id)
+        try:
+            self.builder.write_pdf(html, pdf_path)
+            manifest = {"digest": digest, "pdf_status": ReportStatusEnum.ready.value}
+        except Exception as exc:
+            manifest = {"digest": digest, "pdf_status": ReportStatusEnum.failed.value, "error": str(exc)}
+        with self._lock:
+            current = self._load_manifest(manifest_path)
+            # A newer request may have re-rendered the HTML for a different summary in the meantime.
+            if current is None or current.get("digest") == digest:
+                self.store.save_json(manifest_path, manifest)
+                # Before the job is dropped, so wait() returns only once the PDF is registered.
+                if manifest["pdf_status"] == ReportStatusEnum.ready.value and on_pdf is not None:
+                    on_pdf(pdf_path)
+            job = self._jobs.get(run_id)
+            if job is not None and job[0] == digest:
+                self._jobs.pop(run_id, None)
+
+    def status(self, run_id: str) -> ReportArtifact | None:
+        _, _, manifest_path = self._paths(run_id)
+        with self._lock:
+            manifest = self._load_manifest(manifest_path)
+        if manifest is None:
+            return None
+        return self._artifact(run_id, manifest, cached=True)
+
+    def wait(self, run_id: str, timeout: float | None = None) -> ReportArtifact | None:
+        with self._lock:
+            job = self._jobs.get(run_id)
+        if job is not None:
+            job[1].result(timeout=timeout)
+        return self.status(run_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
@@ -1,7 +1,84 @@
 ﻿from __future__ import annotations
 
+from dataclasses import dataclass
+
 import numpy as np
 
+DEFAULT_SWEEP_THRESHOLDS = (0.0, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.004, 0.008)
+DEFAULT_COST_MULTIPLIERS = (0.0, 0.5, 1.0, 1.5, 2.0)
+# Rows are simulated in blocks of about this many points so the temporaries stay cache-resident.
+BATCH_BLOCK_ELEMENTS = 1 << 15
+
+
+@dataclass
+class BacktestSweep:
+    thresholds: np.ndarray
+    cost_bps: np.ndarray
+    pnl_total: np.ndarray
+    max_drawdown: np.ndarray
+    turnover: np.ndarray
+
+    def best_operating_point(self, cost_bps: float) -> dict[str, float]:
+        col = int(np.argmin(np.abs(self.cost_bps - cost_bps)))
+        row = int(np.argmax(self.pnl_total[:, col]))
+        return {
+            "threshold": float(self.thresholds[row]),
+            "cost_bps": float(self.cost_bps[col]),
+            "pnl_total": float(self.pnl_total[row, col]),
+            "max_drawdown": float(self.max_drawdown[row, col]),
+            "turnover": float(self.turnover[row, col]),
+        }
+
+    def to_dict(self) -> dict[str, list]:
+        return {
+            "thresholds": self.thresholds.tolist(),
+            "cost_bps": self.cost_bps.tolist(),
+            "pnl_total": self.pnl_total.tolist(),
+            "max_drawdown": self.max_drawdown.tolist(),
+            "turnover": self.turnover.tolist(),
+        }
+
+
+def _simulate(
+    realized_return: np.ndarray,
+    forecast_return: np.ndarray,
+    thresholds: np.ndarray,
+    cost: np.ndarray,
+    valid: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Broadcast core shared by the single-run, sweep and batch entry points. Equity is shaped
+    # broadcast(returns, thresholds, cost); pnl, drawdown and turnover drop the trailing time axis.
+    # `valid` marks real points in NaN-padded rows: padding never trades and is excluded from turnover.
+    thr = thresholds[..., None]
+    raw_signal = (forecast_return > thr).astype(np.float64) - (forecast_return < -thr)
+    if valid is not None:
+        raw_signal *= valid
+        realized_return = np.where(valid, realized_return, 0.0)
+
+    # Hold signal for each validation point and charge cost on position changes.
+    position_shifted = np.zeros_like(raw_signal)
+    position_shifted[..., 1:] = raw_signal[..., :-1]
+    turnover = np.abs(raw_signal - position_shifted)
+    if valid is not None:
+        turnover *= valid
+
+    strategy_return = position_shifted * realized_return - turnover * cost[..., None]
+
+    equity = np.cumprod(1.0 + strategy_return, axis=-1)
+    rolling_peak = np.maximum.accumulate(equity, axis=-1)
+    drawdown = (equity - rolling_peak) / (rolling_peak + 1e-12)
+    if valid is None:
+        mean_turnover = np.mean(turnover, axis=-1)
+    else:
+        mean_turnover = np.sum(turnover, axis=-1) / np.maximum(np.sum(valid, axis=-1), 1)
+    return equity, equity[..., -1] - 1.0, np.min(drawdown, axis=-1), np.broadcast_to(mean_turnover, equity.shape[:-1])
+
+
+def _returns(y_true: np.ndarray, y_pred: np.ndarray, close_ref: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    realized_return = (y_true - close_ref) / (close_ref + 1e-9)
+    forecast_return = (y_pred - close_ref) / (close_ref + 1e-9)
+    return realized_return, forecast_return
+
 
 def run_backtest_from_forecasts(
     y_true: np.ndarray,
@@ -19,27 +96,70 @@ def run_backtest_from_forecasts(
             "equity_curve": [],
         }
 
-    realized_return = (y_true - close_ref) / (close_ref + 1e-9)
-    forecast_return = (y_pred - close_ref) / (close_ref + 1e-9)
-
-    raw_signal = np.where(forecast_return > threshold, 1.0, np.where(forecast_return < -threshold, -1.0, 0.0))
-
-    # Hold signal for each validation point and charge cost on position changes.
-    position = np.copy(raw_signal)
-    position_shifted = np.roll(position, 1)
-    position_shifted[0] = 0.0
-    turnover = np.abs(position - position_shifted)
-
+    realized_return, forecast_return = _returns(y_true, y_pred, close_ref)
     total_cost = (fee_bps + slippage_bps) / 10_000.0
-    strategy_return = position_shifted * realized_return - turnover * total_cost
-
-    equity = np.cumprod(1.0 + strategy_return)
-    rolling_peak = np.maximum.accumulate(equity)
-    drawdown = (equity - rolling_peak) / (rolling_peak + 1e-12)
+    equity, pnl, drawdown, turnover = _simulate(realized_return, forecast_return, np.asarray(threshold), np.asarray(total_cost))
 
     return {
-        "pnl_total": float(equity[-1] - 1.0),
-        "max_drawdown": float(np.min(drawdown)),
-        "turnover": float(np.mean(turnover)),
+        "pnl_total": float(pnl),
+        "max_drawdown": float(drawdown),
+        "turnover": float(turnover),
         "equity_curve": equity.tolist(),
     }
+
+
+def run_backtest_batch(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    close_ref: np.ndarray,
+    fee_bps: float,
+    slippage_bps: float,
+    threshold: float,
+) -> dict[str, np.ndarray]:
+    # Backtests K candidates at once from (K, n) forecast rows; shorter rows are right-padded with NaN.
+    y_true = np.atleast_2d(np.asarray(y_true, dtype=np.float64))
+    y_pred = np.atleast_2d(np.asarray(y_pred, dtype=np.float64))
+    close_ref = np.atleast_2d(np.asarray(close_ref, dtype=np.float64))
+    k, n = y_true.shape
+    out = {"pnl_total": np.zeros(k), "max_drawdown": np.zeros(k), "turnover": np.zeros(k)}
+    if n == 0:
+        return out
+
+    thr = np.asarray(threshold)
+    total_cost = np.asarray((fee_bps + slippage_bps) / 10_000.0)
+    step = max(1, BATCH_BLOCK_ELEMENTS // n)
+    for start in range(0, k, step):
+        rows = slice(start, start + step)
+        valid = np.isfinite(y_true[rows]) & np.isfinite(y_pred[rows]) & np.isfinite(close_ref[rows])
+        realized_return, forecast_return = _returns(y_true[rows], y_pred[rows], close_ref[rows])
+        _, pnl, drawdown, turnover = _simulate(realized_return, forecast_return, thr, total_cost, valid=valid)
+        out["pnl_total"][rows] = pnl
+        out["max_drawdown"][rows] = drawdown
+        out["turnover"][rows] = turnover
+    return out
+
+
+def run_backtest_sweep(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    close_ref: np.ndarray,
+    thresholds: np.ndarray | list[float],
+    cost_bps: np.ndarray | list[float],
+) -> BacktestSweep:
+    # Evaluates every (threshold, total cost) pair in one broadcast pass; cost_bps is fee + slippage.
+    thr = np.asarray(thresholds, dtype=np.float64)
+    costs = np.asarray(cost_bps, dtype=np.float64)
+    shape = (len(thr), len(costs))
+    if len(y_true) == 0:
+        zeros = np.zeros(shape)
+        return BacktestSweep(thr, costs, zeros, zeros.copy(), zeros.copy())
+
+    realized_return, forecast_return = _returns(y_true, y_pred, close_ref)
+    _, pnl, drawdown, turnover = _simulate(realized_return, forecast_return, thr[:, None], costs[None, :] / 10_000.0)
+    return BacktestSweep(thr, costs, pnl, drawdown, np.array(turnover))
+
+
+def sweep_grid(threshold: float, fee_bps: float, slippage_bps: float) -> tuple[np.ndarray, np.ndarray]:
+    thresholds = np.unique(np.array([*DEFAULT_SWEEP_THRESHOLDS, threshold], dtype=np.float64))
+    cost_bps = (fee_bps + slippage_bps) * np.array(DEFAULT_COST_MULTIPLIERS, dtype=np.float64)
+    return thresholds, np.unique(cost_bps)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import reduce
+
+import numpy as np
+
+from app.core.schemas import RunConfig
+from app.data.binance import INTERVAL_MS
+from app.research.backtest.engine import run_backtest_from_forecasts
+from app.research.cv import build_purged_walk_forward_folds
+from app.research.indicators.dsl import sanitize_block
+from app.research.indicators.evaluator import CONTEXT_FIELDS, evaluate_feature_combo
+from app.research.search.candidate import CandidateIndicator
+from app.research.search.optimizer import SearchOutcome
+
+
+@dataclass
+class StackedContext:
+    timeframe: str
+    symbols: list[str]
+    timestamps: np.ndarray
+    ctx: dict[str, np.ndarray]
+
+
+@dataclass
+class CrossAssetScore:
+    # `horizon` is in bars of the timeframe the combo was found on; `horizons` holds the same lookahead
+    # converted to bars of each stacked timeframe it could be scored on.
+    combo: list[CandidateIndicator]
+    horizon: int
+    timeframe: str
+    horizons: dict[str, int] = field(default_factory=dict)
+    per_asset: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return combo_key(self.combo)
+
+    @property
+    def coverage(self) -> int:
+        return len(self.per_asset)
+
+    def mean(self, metric: str) -> float:
+        if not self.per_asset:
+            return 9_999.0
+        return float(np.mean([row[metric] for row in self.per_asset.values()]))
+
+    def std(self, metric: str) -> float:
+        if not self.per_asset:
+            return 0.0
+        return float(np.std([row[metric] for row in self.per_asset.values()]))
+
+
+def combo_key(combo: list[CandidateIndicator]) -> str:
+    return "|".join(cand.expression() for cand in combo)
+
+
+def convert_horizon(horizon: int, source: str, target: str) -> int:
+    # The same lookahead in wall-clock time, counted in bars of `target`.
+    if source == target or source not in INTERVAL_MS or target not in INTERVAL_MS:
+        return horizon
+    return round(horizon * INTERVAL_MS[source] / INTERVAL_MS[target])
+
+
+def stack_contexts(
+    timeframe: str,
+    contexts: dict[str, tuple[np.ndarray, dict[str, np.ndarray]]],
+) -> StackedContext:
+    if not contexts:
+        raise ValueError("No contexts to stack")
+    symbols = sorted(contexts.keys())
+    common = reduce(np.intersect1d, [np.asarray(contexts[s][0], dtype=np.int64) for s in symbols])
+    stacked: dict[str, np.ndarray] = {}
+    for name in CONTEXT_FIELDS:
+        rows = []
+        for symbol in symbols:
+            timestamps, ctx = contexts[symbol]
+            idx = np.searchsorted(timestamps, common)
+            rows.append(np.asarray(ctx[name], dtype=np.float64)[idx])
+        stacked[name] = np.vstack(rows)
+    return StackedContext(timeframe=timeframe, symbols=symbols, timestamps=common, ctx=stacked)
+
+
+def select_universal_combos(
+    outcomes: list[SearchOutcome], top_k: int
+) -> list[tuple[list[CandidateIndicator], int, str]]:
+    # (combo, horizon in bars, timeframe the horizon is counted on)
+    best: dict[str, tuple[float, list[CandidateIndicator], int, str]] = {}
+    for outcome in outcomes:
+        key = combo_key(outcome.best_combo)
+        err = outcome.combo_score.composite_error
+        if key not in best or err < best[key][0]:
+            best[key] = (err, outcome.best_combo, outcome.combo_score.horizon, outcome.timeframe)
+    ranked = sorted(best.values(), key=lambda item: item[0])[:top_k]
+    return [(combo, horizon, timeframe) for _, combo, horizon, timeframe in ranked]
+
+
+def evaluate_cross_asset(
+    stacks: list[StackedContext],
+    combos: list[tuple[list[CandidateIndicator], int, str]],
+    config: RunConfig,
+) -> list[CrossAssetScore]:
+    scores = {
+        combo_key(combo): CrossAssetScore(combo=combo, horizon=horizon, timeframe=timeframe)
+        for combo, horizon, timeframe in combos
+    }
+
+    for stack in stacks:
+        n_rows = len(stack.timestamps)
+        try:
+            folds = build_purged_walk_forward_folds(
+                n_rows=n_rows,
+                folds=config.cv.folds,
+                max_horizon=config.horizon.max_bar,
+                purge_bars=config.cv.purge_bars,
+                embargo_bars=config.cv.embargo_bars,
+            )
+        except ValueError:
+            continue
+
+        # Every distinct expression is evaluated once over the whole (symbols x time) block.
+        features: dict[str, np.ndarray] = {}
+        for combo, _, _ in combos:
+            for cand in combo:
+                expr = cand.expression()
+                if expr not in features:
+                    raw = np.broadcast_to(cand.root.eval(stack.ctx), (len(stack.symbols), n_rows))
+                    features[expr] = sanitize_block(raw)
+
+        close = stack.ctx["close"]
+        for combo, horizon, timeframe in combos:
+            score = scores[combo_key(combo)]
+            h = convert_horizon(horizon, timeframe, stack.timeframe)
+            if not config.horizon.min_bar <= h <= config.horizon.max_bar:
+                # A 1d lookahead is thousands of 1m bars; a few 1m bars round to nothing on 1d.
+                continue
+            score.horizons[stack.timeframe] = h
+            for row, symbol in enumerate(stack.symbols):
+                matrix = np.column_stack([features[cand.expression()][row] for cand in combo])
+                hs = evaluate_feature_combo(
+                    combo_id=f"xa:{symbol}:{stack.timeframe}",
+                    features=matrix,
+                    close=close[row],
+                    folds=folds,
+                    horizon=h,
+                    keep_predictions=True,
+                )
+                if hs.composite_error >= 9_999.0:
+                    continue
+                bt = run_backtest_from_forecasts(
+                    y_true=hs.y_true,
+                    y_pred=hs.y_pred,
+                    close_ref=hs.close_ref,
+                    fee_bps=config.backtest.fee_bps,
+                    slippage_bps=config.backtest.slippage_bps,
+                    threshold=config.backtest.signal_threshold,
+                )
+                score.per_asset[f"{symbol}:{stack.timeframe}"] = {
+                    "composite_error": hs.composite_error,
+                    "normalized_rmse": hs.normalized_rmse,
+                    "normalized_mae": hs.normalized_mae,
+                    "directional_hit_rate": hs.directional_hit_rate,
+                    "pnl_total": float(bt["pnl_total"]),
+                    "max_drawdown": float(bt["max_drawdown"]),
+                    "turnover": float(bt["turnover"]),
+                }
+
+    return [score for score in scores.values() if score.per_asset]
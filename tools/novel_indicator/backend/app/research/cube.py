@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import polars as pl
+
+from app.core.schemas import FrontierEntry, IndicatorCubeSummary, ScoreCard
+from app.data.binance import INTERVAL_MS
+from app.research.indicators.novelty import novelty_score
+from app.research.search.candidate import CandidateIndicator
+from app.research.search.optimizer import SearchOutcome
+
+CUBE_FILE = "indicator_cube.parquet"
+FRONTIER_FILE = "indicator_frontier.parquet"
+
+CUBE_SCHEMA: dict[str, pl.DataType] = {
+    "run_id": pl.Utf8,
+    "symbol": pl.Utf8,
+    "timeframe": pl.Utf8,
+    "indicator_id": pl.Utf8,
+    "expression": pl.Utf8,
+    "family": pl.Utf8,
+    "complexity": pl.Int32,
+    "novelty_score": pl.Float64,
+    "horizon_bar": pl.Int32,
+    "horizon_time_ms": pl.Int64,
+    "normalized_rmse": pl.Float64,
+    "normalized_mae": pl.Float64,
+    "calibration_error": pl.Float64,
+    "composite_error": pl.Float64,
+    "directional_hit_rate": pl.Float64,
+    # Backtest metrics exist only for each candidate's best horizon; other rows are null.
+    "pnl_total": pl.Float64,
+    "max_drawdown": pl.Float64,
+    "turnover": pl.Float64,
+    "stability_score": pl.Float64,
+    "is_best_horizon": pl.Boolean,
+}
+
+_BACKTEST_METRICS = ("pnl_total", "max_drawdown", "turnover")
+_SCORE_METRICS = ("normalized_rmse", "normalized_mae", "calibration_error", "composite_error", "directional_hit_rate")
+
+
+def candidate_family(cand: CandidateIndicator) -> str:
+    op = getattr(cand.root, "op", None)
+    if op is not None:
+        return str(op)
+    return type(cand.root).__name__.removesuffix("Node").lower()
+
+
+def build_indicator_cube(
+    run_id: str,
+    outcomes: list[SearchOutcome],
+    candidate_backtests: dict[tuple[str, str], dict[str, dict[str, float]]] | None = None,
+) -> pl.DataFrame:
+    # One row per (symbol, timeframe, candidate, evaluated horizon), accumulated column-wise.
+    candidate_backtests = candidate_backtests or {}
+    cols: dict[str, list[Any]] = {name: [] for name in CUBE_SCHEMA}
+    for outcome in outcomes:
+        step_ms = INTERVAL_MS.get(outcome.timeframe, 0)
+        per_candidate = candidate_backtests.get((outcome.symbol, outcome.timeframe), {})
+        signatures = [cand.signature() for cand, _ in outcome.best_candidates]
+        for idx, (cand, ev) in enumerate(outcome.best_candidates):
+            horizons = sorted(ev.all_scores)
+            if not horizons:
+                continue
+            n = len(horizons)
+            scores = [ev.all_scores[h] for h in horizons]
+            errors = np.array([s.composite_error for s in scores])
+            stability = float(1.0 / (np.std(errors) + 1e-6)) if n > 1 else 0.0
+            novelty = novelty_score(signatures[idx], signatures[:idx] + signatures[idx + 1 :])
+            bt = per_candidate.get(cand.indicator_id)
+
+            cols["run_id"].extend([run_id] * n)
+            cols["symbol"].extend([outcome.symbol] * n)
+            cols["timeframe"].extend([outcome.timeframe] * n)
+            cols["indicator_id"].extend([cand.indicator_id] * n)
+            cols["expression"].extend([cand.expression()] * n)
+            cols["family"].extend([candidate_family(cand)] * n)
+            cols["complexity"].extend([cand.complexity] * n)
+            cols["novelty_score"].extend([novelty] * n)
+            cols["horizon_bar"].extend(horizons)
+            cols["horizon_time_ms"].extend([h * step_ms for h in horizons])
+            for metric in _SCORE_METRICS:
+                cols[metric].extend([getattr(s, metric) for s in scores])
+            best = [h == ev.best_horizon for h in horizons]
+            for metric in _BACKTEST_METRICS:
+                cols[metric].extend([bt[metric] if bt is not None and flag else None for flag in best])
+            cols["stability_score"].extend([stability] * n)
+            cols["is_best_horizon"].extend(best)
+    return pl.DataFrame(cols, schema=CUBE_SCHEMA)
+
+
+def build_frontier(cube: pl.DataFrame) -> pl.DataFrame:
+    return cube.filter(pl.col("is_best_horizon")).sort(["symbol", "timeframe", "composite_error"])
+
+
+def frontier_entries(frontier: pl.DataFrame) -> list[FrontierEntry]:
+    entries: list[FrontierEntry] = []
+    for row in frontier.iter_rows(named=True):
+        score = ScoreCard(
+            normalized_rmse=row["normalized_rmse"],
+            normalized_mae=row["normalized_mae"],
+            calibration_error=row["calibration_error"],
+            composite_error=row["composite_error"],
+            directional_hit_rate=row["directional_hit_rate"],
+            pnl_total=row["pnl_total"] or 0.0,
+            max_drawdown=row["max_drawdown"] or 0.0,
+            turnover=row["turnover"] or 0.0,
+            stability_score=row["stability_score"],
+        )
+        entries.append(
+            FrontierEntry(
+                symbol=row["symbol"],
+                timeframe=row["timeframe"],
+                indicator_id=row["indicator_id"],
+                expression=row["expression"],
+                family=row["family"],
+                complexity=row["complexity"],
+                novelty_score=row["novelty_score"],
+                best_horizon=row["horizon_bar"],
+                best_horizon_ms=row["horizon_time_ms"],
+                score=score,
+            )
+        )
+    return entries
+
+
+def summarize_cube(cube: pl.DataFrame, cube_path: Path, frontier_path: Path) -> IndicatorCubeSummary:
+    summary = IndicatorCubeSummary(
+        path=str(cube_path),
+        frontier_path=str(frontier_path),
+        rows=cube.height,
+        columns=list(cube.columns),
+    )
+    if cube.height == 0:
+        return summary
+    stats = cube.select(
+        pl.struct(["symbol", "timeframe", "indicator_id"]).n_unique().alias("candidates"),
+        pl.col("horizon_bar").n_unique().alias("horizons"),
+        pl.col("composite_error").min().alias("best"),
+        pl.col("composite_error").median().alias("median"),
+    ).row(0, named=True)
+    families = cube.filter(pl.col("is_best_horizon")).group_by("family").len()
+    summary.candidates = int(stats["candidates"])
+    summary.horizons = int(stats["horizons"])
+    summary.best_composite_error = float(stats["best"])
+    summary.median_composite_error = float(stats["median"])
+    summary.family_counts = {str(family): int(count) for family, count in families.iter_rows()}
+    return summary
+
+
+def write_cube(run_dir: Path, cube: pl.DataFrame, frontier: pl.DataFrame) -> IndicatorCubeSummary:
+    cube_path = run_dir / CUBE_FILE
+    frontier_path = run_dir / FRONTIER_FILE
+    cube.write_parquet(cube_path)
+    frontier.write_parquet(frontier_path)
+    return summarize_cube(cube, cube_path, frontier_path)
@@ -1,7 +1,7 @@
 ﻿from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Any, Protocol
 
 import numpy as np
 
@@ -233,12 +233,50 @@ class AdaptiveSmoothNode:
         return 1 + self.child.complexity()
 
 
+def node_to_dict(node: Node) -> dict[str, Any]:
+    if isinstance(node, FieldNode):
+        return {"type": "field", "name": node.name}
+    if isinstance(node, ConstNode):
+        return {"type": "const", "value": float(node.value)}
+    if isinstance(node, UnaryNode):
+        return {"type": "unary", "op": node.op, "child": node_to_dict(node.child)}
+    if isinstance(node, BinaryNode):
+        return {"type": "binary", "op": node.op, "left": node_to_dict(node.left), "right": node_to_dict(node.right)}
+    if isinstance(node, RollingNode):
+        return {"type": "rolling", "op": node.op, "window": node.window, "child": node_to_dict(node.child)}
+    if isinstance(node, AdaptiveSmoothNode):
+        return {"type": "adaptive", "fast": node.fast, "slow": node.slow, "child": node_to_dict(node.child)}
+    raise ValueError(f"unsupported node type: {type(node).__name__}")
+
+
+def node_from_dict(data: dict[str, Any]) -> Node:
+    kind = data.get("type")
+    if kind == "field":
+        return FieldNode(name=str(data["name"]))
+    if kind == "const":
+        return ConstNode(value=float(data["value"]))
+    if kind == "unary":
+        return UnaryNode(op=str(data["op"]), child=node_from_dict(data["child"]))
+    if kind == "binary":
+        return BinaryNode(op=str(data["op"]), left=node_from_dict(data["left"]), right=node_from_dict(data["right"]))
+    if kind == "rolling":
+        return RollingNode(op=str(data["op"]), child=node_from_dict(data["child"]), window=int(data["window"]))
+    if kind == "adaptive":
+        return AdaptiveSmoothNode(child=node_from_dict(data["child"]), fast=int(data["fast"]), slow=int(data["slow"]))
+    raise ValueError(f"unknown node type: {kind}")
+
+
+# Rolling operators work along the last axis so the same tree evaluates a single series of shape (n,)
+# or a stacked (symbols, n) block in one pass.
+
+
 def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
     out = np.full_like(x, np.nan, dtype=np.float64)
     if window <= 1:
         return x.astype(np.float64)
-    csum = np.cumsum(np.insert(x.astype(np.float64), 0, 0.0))
-    out[window - 1 :] = (csum[window:] - csum[:-window]) / float(window)
+    padded = np.concatenate([np.zeros(x.shape[:-1] + (1,)), x.astype(np.float64)], axis=-1)
+    csum = np.cumsum(padded, axis=-1)
+    out[..., window - 1 :] = (csum[..., window:] - csum[..., :-window]) / float(window)
     return out
 
 
@@ -246,30 +284,34 @@ def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
     out = np.full_like(x, np.nan, dtype=np.float64)
     if window <= 1:
         return np.zeros_like(x, dtype=np.float64)
-    for i in range(window - 1, len(x)):
-        segment = x[i - window + 1 : i + 1]
-        out[i] = float(np.std(segment))
+    for i in range(window - 1, x.shape[-1]):
+        out[..., i] = np.std(x[..., i - window + 1 : i + 1], axis=-1)
     return out
 
 
 def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
     out = np.full_like(x, np.nan, dtype=np.float64)
-    for i in range(window - 1, len(x)):
-        out[i] = float(np.min(x[i - window + 1 : i + 1]))
+    for i in range(window - 1, x.shape[-1]):
+        out[..., i] = np.min(x[..., i - window + 1 : i + 1], axis=-1)
     return out
 
 
 def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
     out = np.full_like(x, np.nan, dtype=np.float64)
-    for i in range(window - 1, len(x)):
-        out[i] = float(np.max(x[i - window + 1 : i + 1]))
+    for i in range(window - 1, x.shape[-1]):
+        out[..., i] = np.max(x[..., i - window + 1 : i + 1], axis=-1)
     return out
 
 
 def ema(x: np.ndarray, window: int) -> np.ndarray:
     alpha = 2.0 / (window + 1.0)
     out = np.full_like(x, np.nan, dtype=np.float64)
-    if len(x) == 0:
+    if x.shape[-1] == 0:
+        return out
+    if x.ndim > 1:
+        out[..., 0] = x[..., 0]
+        for i in range(1, x.shape[-1]):
+            out[..., i] = alpha * x[..., i] + (1.0 - alpha) * out[..., i - 1]
         return out
     out[0] = float(x[0])
     for i in range(1, len(x)):
@@ -279,11 +321,20 @@ def ema(x: np.ndarray, window: int) -> np.ndarray:
 
 def adaptive_smooth(x: np.ndarray, fast: int, slow: int) -> np.ndarray:
     out = np.full_like(x, np.nan, dtype=np.float64)
-    if len(x) == 0:
+    if x.shape[-1] == 0:
         return out
-    out[0] = float(x[0])
     fast_alpha = 2.0 / (fast + 1.0)
     slow_alpha = 2.0 / (slow + 1.0)
+    if x.ndim > 1:
+        out[..., 0] = x[..., 0]
+        for i in range(1, x.shape[-1]):
+            delta = np.abs(x[..., i] - x[..., i - 1])
+            norm = delta / (np.abs(x[..., i - 1]) + EPS)
+            # fmin mirrors the builtin min(1.0, nan) == 1.0 used by the scalar path.
+            alpha = slow_alpha + np.fmin(1.0, norm) * (fast_alpha - slow_alpha)
+            out[..., i] = out[..., i - 1] + alpha * (x[..., i] - out[..., i - 1])
+        return out
+    out[0] = float(x[0])
     for i in range(1, len(x)):
         delta = abs(float(x[i]) - float(x[i - 1]))
         norm = delta / (abs(float(x[i - 1])) + EPS)
@@ -293,17 +344,25 @@ def adaptive_smooth(x: np.ndarray, fast: int, slow: int) -> np.ndarray:
 
 
 def sanitize_series(x: np.ndarray) -> np.ndarray:
-    y = np.asarray(x, dtype=np.float64)
-    if np.isnan(y).all():
-        return np.zeros_like(y)
+    # Always copy: field nodes return context arrays, which may be read-only memory maps.
+    return sanitize_block(x)
+
+
+def sanitize_block(x: np.ndarray) -> np.ndarray:
+    # Forward-fills NaN along the last axis, back-fills the leading run from the first valid value and
+    # maps inf to 0; rows that are entirely NaN become zeros. Works on one series or a (k, n) block.
+    y = np.array(x, dtype=np.float64)
+    if y.size == 0:
+        return y
     nan_mask = np.isnan(y)
     if nan_mask.any():
-        valid_idx = np.where(~nan_mask)[0]
-        if len(valid_idx) == 0:
-            return np.zeros_like(y)
-        y[: valid_idx[0]] = y[valid_idx[0]]
-        for i in range(valid_idx[0] + 1, len(y)):
-            if np.isnan(y[i]):
-                y[i] = y[i - 1]
+        n = y.shape[-1]
+        idx = np.where(nan_mask, 0, np.arange(n))
+        np.maximum.accumulate(idx, axis=-1, out=idx)
+        valid = ~nan_mask
+        first_valid = np.argmax(valid, axis=-1)
+        np.maximum(idx, first_valid[..., None], out=idx)
+        y = np.take_along_axis(y, idx, axis=-1)
+        y[~valid.any(axis=-1)] = 0.0
     y[np.isinf(y)] = 0.0
     return y
@@ -1,24 +1,57 @@
 ﻿from __future__ import annotations
 
-from dataclasses import dataclass
+import math
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Literal
 
 import numpy as np
 import polars as pl
 
 from app.research.cv import Fold
 from app.research.models.forecaster import RidgeForecaster, mae, rmse
+from app.research.profiling import cache_lookup, span
 
 
-@dataclass
+@dataclass(slots=True)
+class HorizonPredictions:
+    y_true: np.ndarray
+    y_pred: np.ndarray
+    close_ref: np.ndarray
+
+
+@dataclass(slots=True)
 class HorizonScore:
+    # Scores are cached for every (candidate, horizon) pair, so the out-of-fold arrays are only kept when
+    # asked for; materialize_predictions() recomputes them for the few scores that are backtested or plotted.
     horizon: int
     normalized_rmse: float
     normalized_mae: float
     composite_error: float
     directional_hit_rate: float
-    y_true: np.ndarray
-    y_pred: np.ndarray
-    close_ref: np.ndarray
+    calibration_error: float = 0.0
+    predictions: HorizonPredictions | None = None
+
+    def _require_predictions(self) -> HorizonPredictions:
+        if self.predictions is None:
+            raise ValueError(f"Predictions for horizon {self.horizon} were not materialized")
+        return self.predictions
+
+    @property
+    def y_true(self) -> np.ndarray:
+        return self._require_predictions().y_true
+
+    @property
+    def y_pred(self) -> np.ndarray:
+        return self._require_predictions().y_pred
+
+    @property
+    def close_ref(self) -> np.ndarray:
+        return self._require_predictions().close_ref
+
+
+HorizonSearchMode = Literal["grid", "adaptive"]
+_INV_PHI = (math.sqrt(5.0) - 1.0) / 2.0
 
 
 @dataclass
@@ -37,13 +70,26 @@ class EvalCache:
         self.augmented_feature: dict[str, np.ndarray] = {}
 
 
+CONTEXT_FIELDS = ("open", "high", "low", "close", "volume", "hlc3", "ohlc4", "logret", "range")
+
+
 def build_context(frame: pl.DataFrame) -> dict[str, np.ndarray]:
-    close = frame["close"].to_numpy().astype(np.float64)
-    open_ = frame["open"].to_numpy().astype(np.float64)
-    high = frame["high"].to_numpy().astype(np.float64)
-    low = frame["low"].to_numpy().astype(np.float64)
-    volume = frame["volume"].to_numpy().astype(np.float64)
+    return derive_context(
+        open_=frame["open"].to_numpy().astype(np.float64),
+        high=frame["high"].to_numpy().astype(np.float64),
+        low=frame["low"].to_numpy().astype(np.float64),
+        close=frame["close"].to_numpy().astype(np.float64),
+        volume=frame["volume"].to_numpy().astype(np.float64),
+    )
+
 
+def derive_context(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+) -> dict[str, np.ndarray]:
     logret = np.zeros_like(close)
     logret[1:] = np.log((close[1:] + 1e-9) / (close[:-1] + 1e-9))
 
@@ -60,6 +106,20 @@ def build_context(frame: pl.DataFrame) -> dict[str, np.ndarray]:
     }
 
 
+def build_context_from_columns(columns: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    # Columns persisted by ArtifactStore.save_bar_columns already hold float64 base and derived
+    # fields, so they are mapped as-is instead of being copied.
+    if all(name in columns for name in CONTEXT_FIELDS):
+        return {name: columns[name] for name in CONTEXT_FIELDS}
+    return derive_context(
+        open_=np.asarray(columns["open"], dtype=np.float64),
+        high=np.asarray(columns["high"], dtype=np.float64),
+        low=np.asarray(columns["low"], dtype=np.float64),
+        close=np.asarray(columns["close"], dtype=np.float64),
+        volume=np.asarray(columns["volume"], dtype=np.float64),
+    )
+
+
 def build_baseline_matrix(close: np.ndarray) -> np.ndarray:
     n = len(close)
     ret1 = np.zeros(n, dtype=np.float64)
@@ -88,38 +148,88 @@ def evaluate_candidate_horizons(
     cache: EvalCache,
     focus_horizon: int | None = None,
     focus_span: int | None = None,
+    mode: HorizonSearchMode = "grid",
 ) -> CandidateEvaluation:
-    search_min = horizon_min
-    search_max = horizon_max
-    if focus_horizon is not None and focus_span is not None and focus_span > 0:
-        search_min = max(horizon_min, focus_horizon - focus_span)
-        search_max = min(horizon_max, focus_horizon + focus_span)
-
-    coarse_horizons = sorted(set([search_min] + list(range(search_min, search_max + 1, coarse_step)) + [search_max]))
-    coarse_scores: dict[int, HorizonScore] = {}
-    for h in coarse_horizons:
-        coarse_scores[h] = _score_horizon(indicator_id, feature, close, folds, h, cache)
-
-    ranked = sorted(coarse_scores.values(), key=lambda s: s.composite_error)
-    best_coarse = ranked[0].composite_error if ranked else 9_999.0
-    seed_count = 7 if best_coarse <= 0.35 else 4
-    seed_horizons = [x.horizon for x in ranked[: min(seed_count, len(ranked))]]
-    local_refine_radius = refine_radius if best_coarse <= 0.35 else max(1, refine_radius // 2)
-
-    fine_horizons: set[int] = set(coarse_horizons)
-    for h in seed_horizons:
-        for delta in range(-local_refine_radius, local_refine_radius + 1):
-            cand = h + delta
-            if search_min <= cand <= search_max:
-                fine_horizons.add(cand)
-
-    all_scores = dict(coarse_scores)
-    for h in sorted(fine_horizons):
-        if h not in all_scores:
-            all_scores[h] = _score_horizon(indicator_id, feature, close, folds, h, cache)
-
-    best = min(all_scores.values(), key=lambda s: s.composite_error)
-    return CandidateEvaluation(best_horizon=best.horizon, best_score=best, all_scores=all_scores)
+    with span("evaluate_candidate_horizons"):
+        search_min = horizon_min
+        search_max = horizon_max
+        if focus_horizon is not None and focus_span is not None and focus_span > 0:
+            search_min = max(horizon_min, focus_horizon - focus_span)
+            search_max = min(horizon_max, focus_horizon + focus_span)
+
+        if mode == "adaptive":
+            all_scores = _adaptive_horizon_scores(
+                lambda h: _score_horizon(indicator_id, feature, close, folds, h, cache),
+                search_min,
+                search_max,
+                coarse_step,
+            )
+            best = min(all_scores.values(), key=lambda s: s.composite_error)
+            return CandidateEvaluation(best_horizon=best.horizon, best_score=best, all_scores=all_scores)
+
+        coarse_horizons = sorted(set([search_min] + list(range(search_min, search_max + 1, coarse_step)) + [search_max]))
+        coarse_scores: dict[int, HorizonScore] = {}
+        for h in coarse_horizons:
+            coarse_scores[h] = _score_horizon(indicator_id, feature, close, folds, h, cache)
+
+        ranked = sorted(coarse_scores.values(), key=lambda s: s.composite_error)
+        best_coarse = ranked[0].composite_error if ranked else 9_999.0
+        seed_count = 7 if best_coarse <= 0.35 else 4
+        seed_horizons = [x.horizon for x in ranked[: min(seed_count, len(ranked))]]
+        local_refine_radius = refine_radius if best_coarse <= 0.35 else max(1, refine_radius // 2)
+
+        fine_horizons: set[int] = set(coarse_horizons)
+        for h in seed_horizons:
+            for delta in range(-local_refine_radius, local_refine_radius + 1):
+                cand = h + delta
+                if search_min <= cand <= search_max:
+                    fine_horizons.add(cand)
+
+        all_scores = dict(coarse_scores)
+        for h in sorted(fine_horizons):
+            if h not in all_scores:
+                all_scores[h] = _score_horizon(indicator_id, feature, close, folds, h, cache)
+
+        best = min(all_scores.values(), key=lambda s: s.composite_error)
+        return CandidateEvaluation(best_horizon=best.horizon, best_score=best, all_scores=all_scores)
+
+
+def _adaptive_horizon_scores(
+    score: Callable[[int], HorizonScore],
+    search_min: int,
+    search_max: int,
+    coarse_step: int,
+) -> dict[int, HorizonScore]:
+    # Error is smooth in the horizon, so instead of densely refining around several coarse seeds, the
+    # coarse minima are bracketed by their grid neighbours and narrowed by integer golden-section search;
+    # the last few bars of each bracket are scored exhaustively. Typically a third of the grid's fits.
+    scores: dict[int, HorizonScore] = {}
+
+    def error(h: int) -> float:
+        if h not in scores:
+            scores[h] = score(h)
+        return scores[h].composite_error
+
+    grid = sorted(set(range(search_min, search_max + 1, coarse_step)) | {search_max})
+    for h in grid:
+        error(h)
+    ranked = sorted(grid, key=error)
+    # A second bracket guards against a lone coarse point landing on the wrong side of a narrow dip.
+    for h in ranked[:2]:
+        i = grid.index(h)
+        lo, hi = grid[max(0, i - 1)], grid[min(len(grid) - 1, i + 1)]
+        while hi - lo > 3:
+            c = hi - int(round((hi - lo) * _INV_PHI))
+            d = lo + int(round((hi - lo) * _INV_PHI))
+            if c >= d:
+                c, d = (lo + hi) // 2, (lo + hi) // 2 + 1
+            if error(c) <= error(d):
+                hi = d
+            else:
+                lo = c
+        for h_fine in range(lo, hi + 1):
+            error(h_fine)
+    return scores
 
 
 def evaluate_feature_combo(
@@ -128,8 +238,44 @@ def evaluate_feature_combo(
     close: np.ndarray,
     folds: list[Fold],
     horizon: int,
+    keep_predictions: bool = False,
+) -> HorizonScore:
+    return _score_horizon(combo_id, features, close, folds, horizon, cache=None, keep_predictions=keep_predictions)
+
+
+def materialize_predictions(
+    score: HorizonScore,
+    features: np.ndarray,
+    close: np.ndarray,
+    folds: list[Fold],
 ) -> HorizonScore:
-    return _score_horizon(combo_id, features, close, folds, horizon, cache=None)
+    if score.predictions is not None:
+        return score
+    return _score_horizon("materialize", features, close, folds, score.horizon, cache=None, keep_predictions=True)
+
+
+def stack_predictions(predictions: list[HorizonPredictions]) -> HorizonPredictions:
+    # Candidates keep different horizons and valid rows, so rows are right-padded with NaN to a common length.
+    width = max((len(p.y_true) for p in predictions), default=0)
+    stacked = np.full((3, len(predictions), width), np.nan)
+    for row, pred in enumerate(predictions):
+        n = len(pred.y_true)
+        stacked[0, row, :n] = pred.y_true
+        stacked[1, row, :n] = pred.y_pred
+        stacked[2, row, :n] = pred.close_ref
+    return HorizonPredictions(y_true=stacked[0], y_pred=stacked[1], close_ref=stacked[2])
+
+
+def fit_final_model(features: np.ndarray, close: np.ndarray, horizon: int) -> RidgeForecaster:
+    if features.ndim == 1:
+        features = features[:, None]
+    design = np.column_stack([features, build_baseline_matrix(close)])
+    y = make_target(close, horizon)
+    valid = np.all(np.isfinite(design), axis=1) & np.isfinite(y)
+    if int(valid.sum()) < 30:
+        raise ValueError("Insufficient rows to fit final combo model")
+    y_delta = (y[valid] - close[valid]) / (close[valid] + 1e-9)
+    return RidgeForecaster(alpha=1.0).fit(design[valid], y_delta)
 
 
 def rolling_std_fast(x: np.ndarray, window: int) -> np.ndarray:
@@ -157,105 +303,116 @@ def _score_horizon(
     folds: list[Fold],
     horizon: int,
     cache: EvalCache | None,
+    keep_predictions: bool = False,
 ) -> HorizonScore:
-    if cache is not None:
+    if cache is not None and not keep_predictions:
         cache_key = (key, horizon)
         if cache_key in cache.horizon_scores:
+            cache_lookup("horizon_score", True)
             return cache.horizon_scores[cache_key]
+        cache_lookup("horizon_score", False)
 
-    if cache is not None and horizon in cache.targets:
-        y = cache.targets[horizon]
-    else:
-        y = make_target(close, horizon)
+    with span("score_horizon"):
         if cache is not None:
-            cache.targets[horizon] = y
+            cache_lookup("target", horizon in cache.targets)
+            cache_lookup("design", key in cache.augmented_feature)
 
-    if cache is not None and key in cache.augmented_feature:
-        design = cache.augmented_feature[key]
-    else:
-        if cache is not None and cache.baseline_matrix is not None and len(cache.baseline_matrix) == len(close):
-            baseline = cache.baseline_matrix
+        if cache is not None and horizon in cache.targets:
+            y = cache.targets[horizon]
         else:
-            baseline = build_baseline_matrix(close)
+            y = make_target(close, horizon)
             if cache is not None:
-                cache.baseline_matrix = baseline
+                cache.targets[horizon] = y
 
-        if feature.ndim == 1:
-            design = np.column_stack([feature[:, None], baseline])
+        if cache is not None and key in cache.augmented_feature:
+            design = cache.augmented_feature[key]
         else:
-            design = np.column_stack([feature, baseline])
-        if cache is not None:
-            cache.augmented_feature[key] = design
-
-    fold_true: list[np.ndarray] = []
-    fold_pred: list[np.ndarray] = []
-    fold_ref: list[np.ndarray] = []
-
-    valid = np.all(np.isfinite(design), axis=1) & np.isfinite(y)
-
-    for fold in folds:
-        train_idx = fold.train_idx[valid[fold.train_idx]]
-        val_idx = fold.val_idx[valid[fold.val_idx]]
-        if len(train_idx) < 30 or len(val_idx) < 20:
-            continue
+            if cache is not None and cache.baseline_matrix is not None and len(cache.baseline_matrix) == len(close):
+                baseline = cache.baseline_matrix
+            else:
+                baseline = build_baseline_matrix(close)
+                if cache is not None:
+                    cache.baseline_matrix = baseline
+
+            if feature.ndim == 1:
+                design = np.column_stack([feature[:, None], baseline])
+            else:
+                design = np.column_stack([feature, baseline])
+            if cache is not None:
+                cache.augmented_feature[key] = design
+
+        fold_true: list[np.ndarray] = []
+        fold_pred: list[np.ndarray] = []
+        fold_ref: list[np.ndarray] = []
+
+        valid = np.all(np.isfinite(design), axis=1) & np.isfinite(y)
+
+        for fold in folds:
+            train_idx = fold.train_idx[valid[fold.train_idx]]
+            val_idx = fold.val_idx[valid[fold.val_idx]]
+            if len(train_idx) < 30 or len(val_idx) < 20:
+                continue
+
+            x_train = design[train_idx]
+            x_val = design[val_idx]
+
+            y_train = y[train_idx]
+            y_val = y[val_idx]
+            close_val = close[val_idx]
+            y_train_delta = (y_train - close[train_idx]) / (close[train_idx] + 1e-9)
+
+            with span("ridge_fit"):
+                model = RidgeForecaster(alpha=1.0)
+                model.fit(x_train, y_train_delta)
+                pred_delta = np.clip(model.predict(x_val), -0.8, 0.8)
+            pred = close_val * (1.0 + pred_delta)
+
+            fold_true.append(y_val)
+            fold_pred.append(pred)
+            fold_ref.append(close_val)
+
+        if not fold_true:
+            huge = HorizonScore(
+                horizon=horizon,
+                normalized_rmse=9_999.0,
+                normalized_mae=9_999.0,
+                composite_error=9_999.0,
+                directional_hit_rate=0.0,
+                calibration_error=9_999.0,
+                predictions=HorizonPredictions(np.array([]), np.array([]), np.array([])) if keep_predictions else None,
+            )
+            if cache is not None:
+                cache.horizon_scores[(key, horizon)] = replace(huge, predictions=None)
+            return huge
 
-        x_train = design[train_idx]
-        x_val = design[val_idx]
+        y_true = np.concatenate(fold_true)
+        y_pred = np.concatenate(fold_pred)
+        close_ref = np.concatenate(fold_ref)
 
-        y_train = y[train_idx]
-        y_val = y[val_idx]
-        close_val = close[val_idx]
-        y_train_delta = (y_train - close[train_idx]) / (close[train_idx] + 1e-9)
+        nrmse = rmse(y_true, y_pred) / (np.std(y_true) + 1e-9)
+        nmae = mae(y_true, y_pred) / (np.mean(np.abs(y_true)) + 1e-9)
+        composite = 0.5 * (nrmse + nmae)
 
-        model = RidgeForecaster(alpha=1.0)
-        model.fit(x_train, y_train_delta)
-        pred_delta = np.clip(model.predict(x_val), -0.8, 0.8)
-        pred = close_val * (1.0 + pred_delta)
+        direction_true = np.sign(y_true - close_ref)
+        direction_pred = np.sign(y_pred - close_ref)
+        hit_rate = float(np.mean(direction_true == direction_pred))
 
-        fold_true.append(y_val)
-        fold_pred.append(pred)
-        fold_ref.append(close_val)
+        true_delta = (y_true - close_ref) / (close_ref + 1e-9)
+        pred_delta = (y_pred - close_ref) / (close_ref + 1e-9)
+        calibration = abs(np.mean(pred_delta) - np.mean(true_delta)) + abs(np.std(pred_delta) - np.std(true_delta))
 
-    if not fold_true:
-        huge = HorizonScore(
+        score = HorizonScore(
             horizon=horizon,
-            normalized_rmse=9_999.0,
-            normalized_mae=9_999.0,
-            composite_error=9_999.0,
-            directional_hit_rate=0.0,
-            y_true=np.array([]),
-            y_pred=np.array([]),
-            close_ref=np.array([]),
+            normalized_rmse=float(nrmse),
+            normalized_mae=float(nmae),
+            composite_error=float(composite),
+            directional_hit_rate=hit_rate,
+            calibration_error=float(calibration),
+            predictions=HorizonPredictions(y_true, y_pred, close_ref) if keep_predictions else None,
         )
         if cache is not None:
-            cache.horizon_scores[(key, horizon)] = huge
-        return huge
-
-    y_true = np.concatenate(fold_true)
-    y_pred = np.concatenate(fold_pred)
-    close_ref = np.concatenate(fold_ref)
-
-    nrmse = rmse(y_true, y_pred) / (np.std(y_true) + 1e-9)
-    nmae = mae(y_true, y_pred) / (np.mean(np.abs(y_true)) + 1e-9)
-    composite = 0.5 * (nrmse + nmae)
-
-    direction_true = np.sign(y_true - close_ref)
-    direction_pred = np.sign(y_pred - close_ref)
-    hit_rate = float(np.mean(direction_true == direction_pred))
-
-    score = HorizonScore(
-        horizon=horizon,
-        normalized_rmse=float(nrmse),
-        normalized_mae=float(nmae),
-        composite_error=float(composite),
-        directional_hit_rate=hit_rate,
-        y_true=y_true,
-        y_pred=y_pred,
-        close_ref=close_ref,
-    )
-    if cache is not None:
-        cache.horizon_scores[(key, horizon)] = score
-    return score
+            cache.horizon_scores[(key, horizon)] = replace(score, predictions=None)
+        return score
 
 
 def make_target(close: np.ndarray, horizon: int) -> np.ndarray:
@@ -1,6 +1,7 @@
 ﻿from __future__ import annotations
 
 import re
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 
 import numpy as np
@@ -35,6 +36,12 @@ def signature_similarity(a: str, b: str) -> float:
     return len(ta & tb) / len(union)
 
 
+def novelty_score(signature: str, peers: Iterable[str] = ()) -> float:
+    # 1.0 means no canonical indicator or peer shares any tokens with the signature.
+    closest = max((signature_similarity(signature, other) for other in (*CANONICAL_SIGNATURES, *peers)), default=0.0)
+    return 1.0 - closest
+
+
 @dataclass
 class NoveltyFilter:
     similarity_threshold: float
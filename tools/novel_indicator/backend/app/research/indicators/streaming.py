@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from collections.abc import Mapping
+from typing import Protocol
+
+import numpy as np
+
+from app.research.indicators.dsl import (
+    EPS,
+    AdaptiveSmoothNode,
+    BinaryNode,
+    ConstNode,
+    FieldNode,
+    Node,
+    RollingNode,
+    UnaryNode,
+)
+from app.research.search.candidate import CandidateIndicator
+
+
+class _Step(Protocol):
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float: ...
+
+
+class _FieldStep:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float:
+        return float(fields[self.name])
+
+
+class _ConstStep:
+    def __init__(self, value: float) -> None:
+        self.value = float(value)
+
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float:
+        return self.value
+
+
+class _UnaryStep:
+    def __init__(self, op: str, child: int) -> None:
+        if op not in {"abs", "neg", "log1p_abs", "sqrt_abs", "tanh", "sign"}:
+            raise ValueError(f"unknown unary op: {op}")
+        self.op = op
+        self.child = child
+
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float:
+        x = values[self.child]
+        op = self.op
+        if op == "abs":
+            return abs(x)
+        if op == "neg":
+            return -x
+        if op == "log1p_abs":
+            return math.log1p(abs(x))
+        if op == "sqrt_abs":
+            return math.sqrt(abs(x) + EPS)
+        if op == "tanh":
+            return math.tanh(x)
+        if x > 0.0:
+            return 1.0
+        if x < 0.0:
+            return -1.0
+        return x
+
+
+class _BinaryStep:
+    def __init__(self, op: str, left: int, right: int) -> None:
+        if op not in {"add", "sub", "mul", "div", "max", "min"}:
+            raise ValueError(f"unknown binary op: {op}")
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float:
+        a = values[self.left]
+        b = values[self.right]
+        op = self.op
+        if op == "add":
+            return a + b
+        if op == "sub":
+            return a - b
+        if op == "mul":
+            return a * b
+        if op == "div":
+            return a / (abs(b) + EPS)
+        # np.maximum/np.minimum propagate NaN, the builtins do not.
+        if a != a or b != b:
+            return math.nan
+        if op == "max":
+            return a if a >= b else b
+        return a if a <= b else b
+
+
+class _SmaStep:
+    def __init__(self, child: int, window: int) -> None:
+        self.child = child
+        self.window = window
+        # Mirrors the cumulative-sum formulation of rolling_mean so results match batch eval bit for bit.
+        self._csum = 0.0
+        self._history: deque[float] = deque([0.0], maxlen=window + 1)
+
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float:
+        x = values[self.child]
+        if self.window <= 1:
+            return x
+        self._csum += x
+        self._history.append(self._csum)
+        if len(self._history) <= self.window:
+            return math.nan
+        return (self._history[-1] - self._history[0]) / float(self.window)
+
+
+class _EmaStep:
+    def __init__(self, child: int, window: int) -> None:
+        self.child = child
+        self.alpha = 2.0 / (window + 1.0)
+        self._prev: float | None = None
+
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float:
+        x = values[self.child]
+        if self._prev is None:
+            self._prev = x
+        else:
+            self._prev = self.alpha * x + (1.0 - self.alpha) * self._prev
+        return self._prev
+
+
+class _StdStep:
+    def __init__(self, child: int, window: int) -> None:
+        self.child = child
+        self.window = window
+        self._buf: deque[float] = deque(maxlen=max(1, window))
+        self._nonfinite = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._dirty = True
+        self._since_rebuild = 0
+
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float:
+        x = values[self.child]
+        if self.window <= 1:
+            return 0.0
+
+        evicted: float | None = None
+        if len(self._buf) == self.window:
+            evicted = self._buf[0]
+            if not math.isfinite(evicted):
+                self._nonfinite -= 1
+        self._buf.append(x)
+        finite = math.isfinite(x)
+        if not finite:
+            self._nonfinite += 1
+
+        if len(self._buf) < self.window:
+            self._dirty = True
+            return math.nan
+        if self._nonfinite:
+            self._dirty = True
+            return math.nan
+
+        # Sliding Welford update; rebuilt once per window to bound floating-point drift.
+        self._since_rebuild += 1
+        if self._dirty or evicted is None or self._since_rebuild >= self.window:
+            self._rebuild()
+        else:
+            n = float(self.window)
+            delta = x - evicted
+            old_mean = self._mean
+            self._mean = old_mean + delta / n
+            self._m2 += delta * (x - self._mean + evicted - old_mean)
+        return math.sqrt(max(self._m2 / self.window, 0.0))
+
+    def _rebuild(self) -> None:
+        arr = np.fromiter(self._buf, dtype=np.float64, count=len(self._buf))
+        self._mean = float(np.mean(arr))
+        self._m2 = float(np.sum((arr - self._mean) ** 2))
+        self._dirty = False
+        self._since_rebuild = 0
+
+
+class _ExtremumStep:
+    def __init__(self, child: int, window: int, is_max: bool) -> None:
+        self.child = child
+        self.window = max(1, window)
+        self.is_max = is_max
+        # Monotonic deque of (index, value); NaN never enters it and poisons the window instead.
+        self._queue: deque[tuple[int, float]] = deque()
+        self._index = -1
+        self._last_nan = -(10**18)
+
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float:
+        x = values[self.child]
+        self._index += 1
+        i = self._index
+        queue = self._queue
+        while queue and queue[0][0] <= i - self.window:
+            queue.popleft()
+        if x != x:
+            self._last_nan = i
+        elif self.is_max:
+            while queue and queue[-1][1] <= x:
+                queue.pop()
+            queue.append((i, x))
+        else:
+            while queue and queue[-1][1] >= x:
+                queue.pop()
+            queue.append((i, x))
+
+        if i < self.window - 1 or i - self._last_nan < self.window:
+            return math.nan
+        return queue[0][1]
+
+
+class _AdaptiveStep:
+    def __init__(self, child: int, fast: int, slow: int) -> None:
+        self.child = child
+        self.fast_alpha = 2.0 / (fast + 1.0)
+        self.slow_alpha = 2.0 / (slow + 1.0)
+        self._prev_x: float | None = None
+        self._prev_out = math.nan
+
+    def update(self, values: list[float], fields: Mapping[str, float]) -> float:
+        x = values[self.child]
+        if self._prev_x is None:
+            out = x
+        else:
+            delta = abs(x - self._prev_x)
+            norm = delta / (abs(self._prev_x) + EPS)
+            alpha = self.slow_alpha + min(1.0, norm) * (self.fast_alpha - self.slow_alpha)
+            out = self._prev_out + alpha * (x - self._prev_out)
+        self._prev_x = x
+        self._prev_out = out
+        return out
+
+
+class StreamingProgram:
+    """Stateful, bar-at-a-time evaluator for a set of DSL trees sharing common subexpressions."""
+
+    def __init__(self) -> None:
+        self._steps: list[_Step] = []
+        self._slots: dict[Node, int] = {}
+        self._values: list[float] = []
+        self.bars_seen = 0
+
+    def compile(self, node: Node) -> int:
+        slot = self._slots.get(node)
+        if slot is not None:
+            return slot
+        if self.bars_seen:
+            raise RuntimeError("cannot add indicators to a program that has already consumed bars")
+        step = self._build_step(node)
+        slot = len(self._steps)
+        self._steps.append(step)
+        self._values.append(math.nan)
+        self._slots[node] = slot
+        return slot
+
+    def _build_step(self, node: Node) -> _Step:
+        if isinstance(node, FieldNode):
+            return _FieldStep(node.name)
+        if isinstance(node, ConstNode):
+            return _ConstStep(node.value)
+        if isinstance(node, UnaryNode):
+            return _UnaryStep(node.op, self.compile(node.child))
+        if isinstance(node, BinaryNode):
+            return _BinaryStep(node.op, self.compile(node.left), self.compile(node.right))
+        if isinstance(node, RollingNode):
+            child = self.compile(node.child)
+            if node.op == "sma":
+                return _SmaStep(child, node.window)
+            if node.op == "ema":
+                return _EmaStep(child, node.window)
+            if node.op == "std":
+                return _StdStep(child, node.window)
+            if node.op in {"min", "max"}:
+                return _ExtremumStep(child, node.window, is_max=node.op == "max")
+            raise ValueError(f"unknown rolling op: {node.op}")
+        if isinstance(node, AdaptiveSmoothNode):
+            return _AdaptiveStep(self.compile(node.child), node.fast, node.slow)
+        raise TypeError(f"unsupported node type: {type(node).__name__}")
+
+    def update(self, fields: Mapping[str, float]) -> None:
+        values = self._values
+        # Steps are appended in post-order, so every child slot is refreshed before its parents.
+        for slot, step in enumerate(self._steps):
+            values[slot] = step.update(values, fields)
+        self.bars_seen += 1
+
+    def value(self, slot: int) -> float:
+        return self._values[slot]
+
+
+class _StreamSanitizer:
+    def __init__(self) -> None:
+        self._last = math.nan
+
+    def update(self, x: float) -> float:
+        # Causal counterpart of sanitize_series: forward-fill NaN and zero out infinities.
+        # Leading NaNs stay NaN because the batch back-fill would need future bars.
+        if x == x:
+            self._last = x
+        if math.isinf(self._last):
+            return 0.0
+        return self._last
+
+
+class BarFields:
+    """Derives the DSL input fields (hlc3, ohlc4, logret, range) one bar at a time, as build_context does."""
+
+    def __init__(self) -> None:
+        self._prev_close: float | None = None
+
+    def update(self, bar: Mapping[str, float]) -> dict[str, float]:
+        open_ = float(bar["open"])
+        high = float(bar["high"])
+        low = float(bar["low"])
+        close = float(bar["close"])
+        if self._prev_close is None:
+            logret = 0.0
+        else:
+            logret = math.log((close + 1e-9) / (self._prev_close + 1e-9))
+        self._prev_close = close
+        return {
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": float(bar["volume"]),
+            "hlc3": (high + low + close) / 3.0,
+            "ohlc4": (open_ + high + low + close) / 4.0,
+            "logret": logret,
+            "range": high - low,
+        }
+
+
+class StreamingIndicatorBank:
+    def __init__(self, candidates: list[CandidateIndicator] | None = None) -> None:
+        self.program = StreamingProgram()
+        self.bar_fields = BarFields()
+        self._slots: dict[str, int] = {}
+        self._sanitizers: dict[str, _StreamSanitizer] = {}
+        for cand in candidates or []:
+            self.add(cand)
+
+    @property
+    def indicator_ids(self) -> list[str]:
+        return list(self._slots.keys())
+
+    def add(self, candidate: CandidateIndicator) -> None:
+        if candidate.indicator_id in self._slots:
+            return
+        self._slots[candidate.indicator_id] = self.program.compile(candidate.root)
+        self._sanitizers[candidate.indicator_id] = _StreamSanitizer()
+
+    def update_fields(self, fields: Mapping[str, float]) -> dict[str, float]:
+        self.program.update(fields)
+        return {
+            indicator_id: self._sanitizers[indicator_id].update(self.program.value(slot))
+            for indicator_id, slot in self._slots.items()
+        }
+
+    def update_bar(self, bar: Mapping[str, float]) -> dict[str, float]:
+        return self.update_fields(self.bar_fields.update(bar))
+
+    def raw_value(self, indicator_id: str) -> float:
+        return self.program.value(self._slots[indicator_id])
+
+
+class StreamingIndicator:
+    def __init__(self, candidate: CandidateIndicator) -> None:
+        self.candidate = candidate
+        self._bank = StreamingIndicatorBank([candidate])
+
+    @classmethod
+    def from_candidate(cls, candidate: CandidateIndicator) -> "StreamingIndicator":
+        return cls(candidate)
+
+    @property
+    def value(self) -> float:
+        return self._bank.raw_value(self.candidate.indicator_id)
+
+    def update_fields(self, fields: Mapping[str, float]) -> float:
+        return self._bank.update_fields(fields)[self.candidate.indicator_id]
+
+    def update_bar(self, bar: Mapping[str, float]) -> float:
+        return self._bank.update_bar(bar)[self.candidate.indicator_id]
+
+    def replay(self, ctx: Mapping[str, np.ndarray]) -> np.ndarray:
+        n = len(next(iter(ctx.values())))
+        columns = {name: np.asarray(values, dtype=np.float64).tolist() for name, values in ctx.items()}
+        out = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            self.update_fields({name: values[i] for name, values in columns.items()})
+            out[i] = self.value
+        return out
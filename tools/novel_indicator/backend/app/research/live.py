@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+import numpy as np
+
+from app.data.storage import ArtifactStore
+from app.research.indicators.dsl import node_from_dict, node_to_dict
+from app.research.indicators.streaming import StreamingIndicatorBank
+from app.research.search.candidate import CandidateIndicator
+from app.research.search.optimizer import SearchOutcome
+
+LIVE_MODELS_FILE = "live_models.json"
+
+
+@dataclass
+class LiveModelSpec:
+    symbol: str
+    timeframe: str
+    horizon: int
+    candidates: list[CandidateIndicator]
+    coef: np.ndarray
+
+    @property
+    def key(self) -> str:
+        return f"{self.symbol}:{self.timeframe}"
+
+    @classmethod
+    def from_outcome(cls, outcome: SearchOutcome) -> "LiveModelSpec":
+        if outcome.combo_coef is None:
+            raise ValueError(f"Outcome {outcome.symbol}:{outcome.timeframe} has no fitted combo coefficients")
+        return cls(
+            symbol=outcome.symbol,
+            timeframe=outcome.timeframe,
+            horizon=int(outcome.combo_score.horizon),
+            candidates=list(outcome.best_combo),
+            coef=np.asarray(outcome.combo_coef, dtype=np.float64),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "horizon": self.horizon,
+            "indicators": [
+                {
+                    "indicator_id": cand.indicator_id,
+                    "expression": cand.expression(),
+                    "complexity": cand.complexity,
+                    "tree": node_to_dict(cand.root),
+                }
+                for cand in self.candidates
+            ],
+            "coef": [float(v) for v in self.coef],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LiveModelSpec":
+        candidates = [
+            CandidateIndicator(
+                indicator_id=str(item["indicator_id"]),
+                root=node_from_dict(item["tree"]),
+                complexity=int(item.get("complexity", 1)),
+            )
+            for item in data["indicators"]
+        ]
+        return cls(
+            symbol=str(data["symbol"]),
+            timeframe=str(data["timeframe"]),
+            horizon=int(data["horizon"]),
+            candidates=candidates,
+            coef=np.asarray(data["coef"], dtype=np.float64),
+        )
+
+
+def live_models_payload(run_id: str, outcomes: list[SearchOutcome]) -> dict[str, Any]:
+    return {
+        "run_id": run_id,
+        "models": [LiveModelSpec.from_outcome(o).to_dict() for o in outcomes if o.combo_coef is not None],
+    }
+
+
+def _sign(x: float) -> float:
+    if x > 0.0:
+        return 1.0
+    if x < 0.0:
+        return -1.0
+    return 0.0
+
+
+class _BaselineStream:
+    # Causal equivalent of build_baseline_matrix: ret1, mom5 and the expanding-then-rolling vol10.
+    def __init__(self) -> None:
+        self._closes: deque[float] = deque(maxlen=6)
+        self._rets: deque[float] = deque(maxlen=10)
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        closes = self._closes
+        ret1 = (close - closes[-1]) / (closes[-1] + 1e-9) if closes else 0.0
+        mom5 = (close - closes[-5]) / (closes[-5] + 1e-9) if len(closes) >= 5 else 0.0
+        closes.append(close)
+        self._rets.append(ret1)
+        count = float(len(self._rets))
+        mean = sum(self._rets) / count
+        var = max(sum(r * r for r in self._rets) / count - mean * mean, 0.0)
+        vol10 = math.sqrt(var)
+        return (
+            ret1 if math.isfinite(ret1) else 0.0,
+            mom5 if math.isfinite(mom5) else 0.0,
+            vol10 if math.isfinite(vol10) else 0.0,
+        )
+
+
+@dataclass
+class OnlineErrorStats:
+    count: int = 0
+    sum_sq_err: float = 0.0
+    sum_abs_err: float = 0.0
+    sum_true: float = 0.0
+    sum_true_sq: float = 0.0
+    sum_abs_true: float = 0.0
+    hits: int = 0
+
+    def add(self, y_true: float, y_pred: float, close_ref: float) -> None:
+        err = y_true - y_pred
+        self.count += 1
+        self.sum_sq_err += err * err
+        self.sum_abs_err += abs(err)
+        self.sum_true += y_true
+        self.sum_true_sq += y_true * y_true
+        self.sum_abs_true += abs(y_true)
+        if _sign(y_true - close_ref) == _sign(y_pred - close_ref):
+            self.hits += 1
+
+    def summary(self) -> dict[str, float | int | None]:
+        if self.count == 0:
+            return {"count": 0, "normalized_rmse": None, "normalized_mae": None, "composite_error": None, "directional_hit_rate": None}
+        n = float(self.count)
+        mean_true = self.sum_true / n
+        std_true = math.sqrt(max(self.sum_true_sq / n - mean_true * mean_true, 0.0))
+        nrmse = math.sqrt(self.sum_sq_err / n) / (std_true + 1e-9)
+        nmae = (self.sum_abs_err / n) / (self.sum_abs_true / n + 1e-9)
+        return {
+            "count": self.count,
+            "normalized_rmse": nrmse,
+            "normalized_mae": nmae,
+            "composite_error": 0.5 * (nrmse + nmae),
+            "directional_hit_rate": self.hits / n,
+        }
+
+
+class LiveForecaster:
+    def __init__(self, spec: LiveModelSpec) -> None:
+        expected = 1 + len(spec.candidates) + 3
+        if len(spec.coef) != expected:
+            raise ValueError(f"Model {spec.key} expects {expected} coefficients, got {len(spec.coef)}")
+        self.spec = spec
+        self._bank = StreamingIndicatorBank(spec.candidates)
+        self._ids = [cand.indicator_id for cand in spec.candidates]
+        self._baseline = _BaselineStream()
+        self._intercept = float(spec.coef[0])
+        self._weights = [float(v) for v in spec.coef[1:]]
+        self._pending: deque[tuple[int, float, float]] = deque()
+        self.errors = OnlineErrorStats()
+        self.bar_index = -1
+        self.last_timestamp: int | None = None
+        self.last_forecast: dict[str, Any] | None = None
+        self.last_latency_us = 0.0
+        self._latency_total_us = 0.0
+        self._latency_count = 0
+
+    def update(self, bar: Mapping[str, float], track: bool = True) -> dict[str, Any] | None:
+        started = time.perf_counter()
+        self.bar_index += 1
+        close = float(bar["close"])
+        timestamp = int(bar["timestamp"]) if "timestamp" in bar else None
+
+        horizon = self.spec.horizon
+        while self._pending and self._pending[0][0] <= self.bar_index - horizon:
+            made_at, close_ref, forecast = self._pending.popleft()
+            if track and made_at == self.bar_index - horizon:
+                self.errors.add(y_true=close, y_pred=forecast, close_ref=close_ref)
+
+        self.last_timestamp = timestamp
+        features = self._bank.update_bar(bar)
+        x = [features[i] for i in self._ids]
+        x.extend(self._baseline.update(close))
+        if not all(math.isfinite(v) for v in x):
+            self._record_latency(started, track)
+            return None
+
+        pred_delta = self._intercept + sum(w * v for w, v in zip(self._weights, x))
+        pred_delta = min(0.8, max(-0.8, pred_delta))
+        forecast = close * (1.0 + pred_delta)
+        self._pending.append((self.bar_index, close, forecast))
+        self.last_forecast = {
+            "symbol": self.spec.symbol,
+            "timeframe": self.spec.timeframe,
+            "horizon": horizon,
+            "timestamp": timestamp,
+            "close": close,
+            "forecast": forecast,
+            "forecast_return": pred_delta,
+        }
+        self._record_latency(started, track)
+        return self.last_forecast
+
+    def warm_up(self, bars: list[Mapping[str, float]]) -> None:
+        for bar in bars:
+            self.update(bar, track=False)
+
+    def _record_latency(self, started: float, track: bool) -> None:
+        self.last_latency_us = (time.perf_counter() - started) * 1e6
+        if track:
+            self._latency_total_us += self.last_latency_us
+            self._latency_count += 1
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "symbol": self.spec.symbol,
+            "timeframe": self.spec.timeframe,
+            "horizon": self.spec.horizon,
+            "expressions": [cand.expression() for cand in self.spec.candidates],
+            "bars_seen": self.bar_index + 1,
+            "last_timestamp": self.last_timestamp,
+            "last_forecast": self.last_forecast,
+            "pending_forecasts": len(self._pending),
+            "realized": self.errors.summary(),
+            "mean_latency_us": self._latency_total_us / self._latency_count if self._latency_count else None,
+        }
+
+
+class BarFeed(Protocol):
+    def fetch_since(self, symbol: str, timeframe: str, after_ts: int | None) -> list[dict[str, float]]: ...
+
+
+class ArtifactBarFeed:
+    # Polls the run's local bar cache; new rows appear whenever the parquet for a symbol/timeframe is refreshed.
+    def __init__(self, store: ArtifactStore, run_id: str) -> None:
+        self.store = store
+        self.run_id = run_id
+
+    def fetch_since(self, symbol: str, timeframe: str, after_ts: int | None) -> list[dict[str, float]]:
+        frame = self.store.load_bars(self.run_id, symbol, timeframe)
+        if after_ts is not None:
+            frame = frame.filter(frame["timestamp"] > after_ts)
+        return list(frame.iter_rows(named=True))
+
+
+@dataclass
+class LiveSession:
+    run_id: str
+    forecasters: dict[str, LiveForecaster]
+    feed: BarFeed
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def ingest(self, symbol: str, timeframe: str, bars: list[Mapping[str, float]]) -> list[dict[str, Any]]:
+        forecaster = self.forecasters.get(f"{symbol}:{timeframe}")
+        if forecaster is None:
+            raise KeyError(f"No live model for {symbol}:{timeframe}")
+        emitted: list[dict[str, Any]] = []
+        with self.lock:
+            for bar in sorted(bars, key=lambda b: int(b["timestamp"])):
+                if forecaster.last_timestamp is not None and int(bar["timestamp"]) <= forecaster.last_timestamp:
+                    continue
+                forecast = forecaster.update(bar)
+                if forecast is not None:
+                    emitted.append(forecast)
+        return emitted
+
+    def poll(self) -> list[dict[str, Any]]:
+        emitted: list[dict[str, Any]] = []
+        for forecaster in self.forecasters.values():
+            bars = self.feed.fetch_since(forecaster.spec.symbol, forecaster.spec.timeframe, forecaster.last_timestamp)
+            if bars:
+                emitted.extend(self.ingest(forecaster.spec.symbol, forecaster.spec.timeframe, bars))
+        return emitted
+
+    def status(self) -> dict[str, Any]:
+        with self.lock:
+            return {"run_id": self.run_id, "models": [f.status() for f in self.forecasters.values()]}
+
+
+class LiveScoringService:
+    def __init__(self, store: ArtifactStore, warmup_bars: int = 1500) -> None:
+        self.store = store
+        self.warmup_bars = warmup_bars
+        self._sessions: dict[str, LiveSession] = {}
+        self._lock = threading.Lock()
+
+    def models_path(self, run_id: str) -> Path:
+        return self.store.run_dir(run_id) / LIVE_MODELS_FILE
+
+    def start(self, run_id: str, feed: BarFeed | None = None) -> LiveSession:
+        with self._lock:
+            existing = self._sessions.get(run_id)
+            if existing is not None:
+                return existing
+
+        path = self.models_path(run_id)
+        if not path.exists():
+            raise FileNotFoundError(f"No live models recorded for run {run_id}")
+        specs = [LiveModelSpec.from_dict(item) for item in self.store.load_json(path).get("models", [])]
+        if not specs:
+            raise FileNotFoundError(f"No live models recorded for run {run_id}")
+
+        forecasters: dict[str, LiveForecaster] = {}
+        for spec in specs:
+            forecaster = LiveForecaster(spec)
+            try:
+                history = self.store.load_bars(run_id, spec.symbol, spec.timeframe).tail(self.warmup_bars)
+                forecaster.warm_up(list(history.iter_rows(named=True)))
+            except FileNotFoundError:
+                pass
+            forecasters[spec.key] = forecaster
+
+        session = LiveSession(run_id=run_id, forecasters=forecasters, feed=feed or ArtifactBarFeed(self.store, run_id))
+        with self._lock:
+            return self._sessions.setdefault(run_id, session)
+
+    def get(self, run_id: str) -> LiveSession | None:
+        with self._lock:
+            return self._sessions.get(run_id)
+
+    def stop(self, run_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(run_id, None) is not None
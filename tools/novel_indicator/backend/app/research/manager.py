@@ -1,49 +1,117 @@
 ﻿from __future__ import annotations
 
-import concurrent.futures as futures
 import threading
-from collections.abc import Callable
 
-from app.core.schemas import RunConfig
+from app.core.schemas import (
+    RunConfig,
+    RunPriorityEnum,
+    RunQueue,
+    RunStageEnum,
+    RunStatusEnum,
+)
 from app.research.runner import ExperimentRunner
+from app.research.scheduler import RunScheduler
+
+
+class RunAlreadyActiveError(RuntimeError):
+    pass
+
+
+class RunCapacityError(RuntimeError):
+    pass
 
 
 class RunManager:
-    def __init__(self, runner: ExperimentRunner, max_workers: int = 2) -> None:
+    # Each run gets its own thread; RunScheduler decides when it may compute, so a queued urgent run only
+    # waits for the current job of a long run rather than the whole run. At most `max_active_runs` threads
+    # exist at once; beyond that submit refuses the run instead of parking another thread.
+    def __init__(
+        self,
+        runner: ExperimentRunner,
+        max_workers: int = 2,
+        default_cpu_quota: float | None = None,
+        max_active_runs: int = 16,
+    ) -> None:
         self.runner = runner
-        self.executor = futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ni-run")
-        self._futures: dict[str, futures.Future] = {}
-        self._cancel_flags: dict[str, threading.Event] = {}
+        self.default_cpu_quota = default_cpu_quota
+        self.max_active_runs = max(1, max_active_runs)
+        self.scheduler = RunScheduler(slots=max_workers, log=self._log)
+        self._threads: dict[str, threading.Thread] = {}
         self._lock = threading.Lock()
 
-    def submit(self, run_id: str, config: RunConfig) -> None:
+    def submit(
+        self,
+        run_id: str,
+        config: RunConfig,
+        priority: RunPriorityEnum = RunPriorityEnum.normal,
+        cpu_quota: float | None = None,
+    ) -> None:
         with self._lock:
-            if run_id in self._futures and not self._futures[run_id].done():
-                raise RuntimeError(f"Run {run_id} is already active")
+            thread = self._threads.get(run_id)
+            if thread is not None and thread.is_alive():
+                raise RunAlreadyActiveError(f"Run {run_id} is already active")
+            active = len(self._threads)
+            if active >= self.max_active_runs:
+                raise RunCapacityError(f"{active} runs are already active; retry when one finishes")
+
+            quota = cpu_quota if cpu_quota is not None else self.default_cpu_quota
+            cancel_event = self.scheduler.admit(run_id, priority=priority, cpu_quota=quota)
+            thread = threading.Thread(target=self._run, args=(run_id, config, cancel_event), name=f"ni-run-{run_id}")
+            self._threads[run_id] = thread
+            thread.start()
 
-            cancel_event = threading.Event()
-            self._cancel_flags[run_id] = cancel_event
-            future = self.executor.submit(self.runner.execute, run_id, config, cancel_event.is_set)
-            self._futures[run_id] = future
+    def _run(self, run_id: str, config: RunConfig, cancel_event: threading.Event) -> None:
+        try:
+            # Take a slot before any work, so nothing the runner does ahead of its first checkpoint runs
+            # outside the slot budget.
+            if self.scheduler.checkpoint(run_id):
+                self.runner.db.record_progress(
+                    run_id,
+                    status=RunStatusEnum.canceled,
+                    stage=RunStageEnum.finished,
+                    progress=1.0,
+                    message="Run canceled before it started",
+                    error="Canceled by user",
+                )
+                return
+            self.runner.execute(run_id, config, lambda: self.scheduler.checkpoint(run_id), cancel_event.is_set)
+        finally:
+            self.scheduler.finish(run_id)
+            with self._lock:
+                if self._threads.get(run_id) is threading.current_thread():
+                    del self._threads[run_id]
 
-    def resume(self, run_id: str, config: RunConfig) -> None:
-        self.submit(run_id, config)
+    def _log(self, run_id: str, message: str) -> None:
+        row = self.runner.db.get_run(run_id)
+        stage = RunStageEnum(row["stage"]) if row is not None else RunStageEnum.created
+        self.runner.db.add_log(run_id, stage, message)
+
+    def resume(
+        self,
+        run_id: str,
+        config: RunConfig,
+        priority: RunPriorityEnum = RunPriorityEnum.normal,
+        cpu_quota: float | None = None,
+    ) -> None:
+        self.submit(run_id, config, priority=priority, cpu_quota=cpu_quota)
 
     def cancel(self, run_id: str) -> bool:
-        with self._lock:
-            event = self._cancel_flags.get(run_id)
-            if event is None:
-                return False
-            event.set()
-            return True
+        return self.scheduler.cancel(run_id)
 
     def is_active(self, run_id: str) -> bool:
         with self._lock:
-            fut = self._futures.get(run_id)
-            if fut is None:
-                return False
-            return not fut.done()
+            thread = self._threads.get(run_id)
+            return thread is not None and thread.is_alive()
 
     def active_runs(self) -> list[str]:
         with self._lock:
-            return [run_id for run_id, fut in self._futures.items() if not fut.done()]
+            return [run_id for run_id, thread in self._threads.items() if thread.is_alive()]
+
+    def queue(self) -> RunQueue:
+        return self.scheduler.snapshot()
+
+    def join(self, run_id: str, timeout: float | None = None) -> None:
+        with self._lock:
+            thread = self._threads.get(run_id)
+        if thread is not None:
+            thread.join(timeout)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+PROFILE_FILE = "profile.json"
+
+_local = threading.local()
+_ACTIVE: dict[str, "Profiler"] = {}
+_ACTIVE_LOCK = threading.Lock()
+
+
+class _SpanStats:
+    __slots__ = ("count", "total", "max", "samples", "_rng", "_cap")
+
+    def __init__(self, cap: int) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: list[float] = []
+        self._rng = random.Random(0)
+        self._cap = cap
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        # Reservoir sample keeps percentile estimates bounded in memory on long runs.
+        if len(self.samples) < self._cap:
+            self.samples.append(seconds)
+        else:
+            slot = self._rng.randrange(self.count)
+            if slot < self._cap:
+                self.samples[slot] = seconds
+
+    def summary(self) -> dict[str, float | int]:
+        ordered = sorted(self.samples)
+
+        def pct(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] * 1000.0
+
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000.0,
+            "mean_ms": self.total / self.count * 1000.0 if self.count else 0.0,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "max_ms": self.max * 1000.0,
+        }
+
+
+class Profiler:
+    def __init__(self, run_id: str | None = None, sample_cap: int = 4096) -> None:
+        self.run_id = run_id
+        self.sample_cap = sample_cap
+        self.started_at = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans: dict[str, _SpanStats] = {}
+        self._caches: dict[str, list[int]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._spans.get(name)
+            if stats is None:
+                stats = self._spans[name] = _SpanStats(self.sample_cap)
+            stats.add(seconds)
+
+    def cache(self, name: str, hit: bool) -> None:
+        with self._lock:
+            counts = self._caches.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            spans = {name: stats.summary() for name, stats in sorted(self._spans.items())}
+            caches = {
+                name: {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+                for name, (hits, misses) in sorted(self._caches.items())
+            }
+        return {
+            "run_id": self.run_id,
+            "wall_ms": (time.perf_counter() - self.started_at) * 1000.0,
+            "spans": spans,
+            "caches": caches,
+        }
+
+
+def current_profiler() -> Profiler | None:
+    return getattr(_local, "profiler", None)
+
+
+def activate(profiler: Profiler) -> Profiler | None:
+    previous = current_profiler()
+    _local.profiler = profiler
+    if profiler.run_id is not None:
+        with _ACTIVE_LOCK:
+            _ACTIVE[profiler.run_id] = profiler
+    return previous
+
+
+def deactivate(profiler: Profiler, previous: Profiler | None = None) -> None:
+    _local.profiler = previous
+    if profiler.run_id is not None:
+        with _ACTIVE_LOCK:
+            if _ACTIVE.get(profiler.run_id) is profiler:
+                del _ACTIVE[profiler.run_id]
+
+
+@contextmanager
+def profiling(profiler: Profiler) -> Iterator[Profiler]:
+    previous = activate(profiler)
+    try:
+        yield profiler
+    finally:
+        deactivate(profiler, previous)
+
+
+def get_active_profiler(run_id: str) -> Profiler | None:
+    with _ACTIVE_LOCK:
+        return _ACTIVE.get(run_id)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    profiler = current_profiler()
+    if profiler is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.record(name, time.perf_counter() - started)
+
+
+def lap(name: str, started: float) -> float:
+    # Records the time since `started` and returns now, so sequential sections can be timed without nesting.
+    now = time.perf_counter()
+    profiler = current_profiler()
+    if profiler is not None:
+        profiler.record(name, now - started)
+    return now
+
+
+def cache_lookup(name: str, hit: bool) -> None:
+    profiler = current_profiler()
+    if profiler is not None:
+        profiler.cache(name, hit)
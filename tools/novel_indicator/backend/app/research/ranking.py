@@ -5,7 +5,17 @@ from datetime import datetime, timezone
 
 import numpy as np
 
-from app.core.schemas import AssetRecommendation, IndicatorSpec, ResultSummary, ScoreCard
+from app.core.schemas import (
+    AssetRecommendation,
+    FrontierEntry,
+    HorizonMetadata,
+    IndicatorCubeSummary,
+    IndicatorSpec,
+    ResultSummary,
+    ScoreCard,
+)
+from app.data.binance import INTERVAL_MS
+from app.research.cross_asset import CrossAssetScore
 from app.research.search.optimizer import SearchOutcome
 
 
@@ -13,6 +23,9 @@ def build_result_summary(
     run_id: str,
     outcomes: list[SearchOutcome],
     backtests: dict[tuple[str, str], dict[str, float | list[float]]],
+    cross_asset: list[CrossAssetScore] | None = None,
+    frontier: list[FrontierEntry] | None = None,
+    cube_summary: IndicatorCubeSummary | None = None,
 ) -> ResultSummary:
     per_asset: list[AssetRecommendation] = []
 
@@ -30,12 +43,15 @@ def build_result_summary(
         score = ScoreCard(
             normalized_rmse=outcome.combo_score.normalized_rmse,
             normalized_mae=outcome.combo_score.normalized_mae,
+            calibration_error=outcome.combo_score.calibration_error,
             composite_error=outcome.combo_score.composite_error,
             directional_hit_rate=outcome.combo_score.directional_hit_rate,
             pnl_total=float(bt.get("pnl_total", 0.0)),
             max_drawdown=float(bt.get("max_drawdown", 0.0)),
             turnover=float(bt.get("turnover", 0.0)),
             stability_score=_stability_from_outcome(outcome),
+            best_threshold=bt.get("best_threshold"),
+            best_threshold_pnl=bt.get("best_threshold_pnl"),
         )
         rec = AssetRecommendation(
             symbol=outcome.symbol,
@@ -46,12 +62,21 @@ def build_result_summary(
         )
         per_asset.append(rec)
 
-    universal = _build_universal_recommendation(per_asset)
+    if cross_asset:
+        universal = _build_cross_asset_recommendation(cross_asset)
+    else:
+        universal = _build_universal_recommendation(per_asset)
 
     return ResultSummary(
         run_id=run_id,
         universal_recommendation=universal,
         per_asset_recommendations=sorted(per_asset, key=lambda x: x.score.composite_error),
+        horizon_metadata=HorizonMetadata(
+            timeframe_ms={o.timeframe: INTERVAL_MS[o.timeframe] for o in outcomes if o.timeframe in INTERVAL_MS},
+            note="Bars-ahead is translated to wall-clock time based on source timeframe.",
+        ),
+        per_indicator_frontier=frontier,
+        indicator_cube_summary=cube_summary,
         generated_at=datetime.now(timezone.utc),
     )
 
@@ -108,6 +133,48 @@ def _build_universal_recommendation(per_asset: list[AssetRecommendation]) -> Ass
     )
 
 
+def _build_cross_asset_recommendation(cross_asset: list[CrossAssetScore]) -> AssetRecommendation:
+    # Ranked on error re-scored on every stacked asset, not on how often a combo happened to win locally.
+    max_coverage = max(score.coverage for score in cross_asset)
+
+    def cross_rank(score: CrossAssetScore) -> tuple[float, float, int]:
+        avg_err = score.mean("composite_error")
+        coverage_penalty = 1.0 - score.coverage / max_coverage
+        return (avg_err + 0.05 * coverage_penalty + 0.05 * score.std("composite_error"), avg_err, -score.coverage)
+
+    best = min(cross_asset, key=cross_rank)
+    timeframes = sorted({asset.split(":", 1)[1] for asset in best.per_asset}, key=_timeframe_order)
+    universal_score = ScoreCard(
+        normalized_rmse=best.mean("normalized_rmse"),
+        normalized_mae=best.mean("normalized_mae"),
+        composite_error=best.mean("composite_error"),
+        directional_hit_rate=best.mean("directional_hit_rate"),
+        pnl_total=best.mean("pnl_total"),
+        max_drawdown=best.mean("max_drawdown"),
+        turnover=best.mean("turnover"),
+        stability_score=float(1.0 / (best.std("composite_error") + 1e-6)),
+    )
+    return AssetRecommendation(
+        symbol="UNIVERSAL",
+        timeframe="|".join(timeframes),
+        # In bars of the first (shortest) timeframe listed.
+        best_horizon=best.horizons[timeframes[0]],
+        indicator_combo=[
+            IndicatorSpec(indicator_id=c.indicator_id, expression=c.expression(), complexity=c.complexity, params=c.params)
+            for c in best.combo
+        ],
+        score=universal_score,
+    )
+
+
+def _timeframe_order(timeframe: str) -> tuple[int, str]:
+    units = {"m": 1, "h": 60, "d": 1440}
+    try:
+        return (int(timeframe[:-1]) * units.get(timeframe[-1], 0), timeframe)
+    except ValueError:
+        return (0, timeframe)
+
+
 def _stability_from_outcome(outcome: SearchOutcome) -> float:
     top_errors = [ev.best_score.composite_error for _, ev in outcome.best_candidates[:5]]
     if len(top_errors) < 2:
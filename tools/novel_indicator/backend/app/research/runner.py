@@ -3,23 +3,37 @@
 import hashlib
 import json
 import logging
+import time
+from collections.abc import Callable, Iterator, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable
 
+import numpy as np
 import polars as pl
 
-from app.core.schemas import RunConfig, RunStageEnum, RunStatusEnum
+from app.core.schemas import RunConfig, RunStageEnum, RunStatusEnum, SearchJobStatusEnum, WarmStartModeEnum
 from app.data.binance import BinanceClient
 from app.data.storage import ArtifactStore
 from app.db.sqlite import Database
 from app.exporters.pine import PineExporter
 from app.reporting.plots import build_plot_payloads
-from app.reporting.report_builder import ReportBuilder
-from app.research.backtest.engine import run_backtest_from_forecasts
+from app.research.backtest.engine import (
+    BacktestSweep,
+    run_backtest_batch,
+    run_backtest_from_forecasts,
+    run_backtest_sweep,
+    sweep_grid,
+)
+from app.research.cross_asset import CrossAssetScore, evaluate_cross_asset, select_universal_combos, stack_contexts
+from app.research.cube import build_frontier, build_indicator_cube, frontier_entries, write_cube
+from app.research.indicators.evaluator import build_context, build_context_from_columns
+from app.research.live import LIVE_MODELS_FILE, live_models_payload
+from app.research.profiling import PROFILE_FILE, Profiler, activate, deactivate, lap, span
 from app.research.ranking import build_result_summary
+from app.research.search.candidate import CandidateIndicator
 from app.research.search.optimizer import SearchOutcome, run_indicator_search, search_outcome_to_dict
+from app.research.search.warm_start import EliteArchive, run_seeds, warm_start_pool
 from app.research.telemetry import LiveTelemetry
 
 logger = logging.getLogger(__name__)
@@ -30,6 +44,26 @@ class RunnerDeps:
     db: Database
     store: ArtifactStore
     binance: BinanceClient
+    bar_format: str = "parquet"
+    telemetry_console: bool = True
+    telemetry_min_update_seconds: float = 0.25
+    search_backend: str = "local"
+    search_job_max_attempts: int = 3
+    search_poll_seconds: float = 1.0
+    search_stall_seconds: float = 900.0
+    archive: EliteArchive | None = None
+
+
+@dataclass
+class SearchJobResult:
+    # Everything one (symbol, timeframe) discovery job contributes to the run; workers pickle it to the
+    # run's jobs/ directory and the run thread loads it back.
+    symbol: str
+    timeframe: str
+    outcome: SearchOutcome
+    backtest: dict[str, float]
+    sweep: BacktestSweep
+    candidate_backtests: dict[str, dict[str, float]]
 
 
 class ExperimentRunner:
@@ -37,7 +71,14 @@ class ExperimentRunner:
         self.db = deps.db
         self.store = deps.store
         self.binance = deps.binance
-        self.report_builder = ReportBuilder(self.store)
+        self.bar_format = deps.bar_format
+        self.telemetry_console = deps.telemetry_console
+        self.telemetry_min_update_seconds = deps.telemetry_min_update_seconds
+        self.search_backend = deps.search_backend
+        self.search_job_max_attempts = deps.search_job_max_attempts
+        self.search_poll_seconds = deps.search_poll_seconds
+        self.search_stall_seconds = deps.search_stall_seconds
+        self.archive = deps.archive
         self.pine_exporter = PineExporter(self.store)
 
     def execute(
@@ -45,9 +86,20 @@ class ExperimentRunner:
         run_id: str,
         config: RunConfig,
         is_cancelled: Callable[[], bool],
+        cancel_requested: Callable[[], bool] | None = None,
     ) -> None:
-        telemetry = LiveTelemetry(run_id=run_id, run_dir=self.store.run_dir(run_id))
+        # is_cancelled doubles as the scheduler checkpoint between jobs; cancel_requested, when given, is a
+        # plain flag read for waits that are not units of work (polling the search queue).
+        telemetry = LiveTelemetry(
+            run_id=run_id,
+            run_dir=self.store.run_dir(run_id),
+            console=self.telemetry_console,
+            min_update_seconds=self.telemetry_min_update_seconds,
+        )
         telemetry.start()
+        profiler = Profiler(run_id=run_id)
+        previous_profiler = activate(profiler)
+        mark = time.perf_counter()
         final_status = "completed"
         final_message = "Run completed"
         try:
@@ -71,7 +123,7 @@ class ExperimentRunner:
                 RunStageEnum.created,
                 _effective_profile_message(config=config, effective_config=effective_config, total_jobs=total_jobs),
             )
-            overall_total_units = float(1 + (2 * total_jobs) + 1 + 3)  # universe + ingest + discovery + ranking + artifacts
+            overall_total_units = float(1 + (2 * total_jobs) + 1 + 2)  # universe + ingest + discovery + ranking + artifacts
 
             telemetry.update(
                 stage=RunStageEnum.universe.value,
@@ -93,9 +145,12 @@ class ExperimentRunner:
             snapshot_path = self.store.run_dir(run_id) / "universe_snapshot.json"
             self.store.save_json(snapshot_path, snapshot)
             self.db.add_artifact(run_id, "universe_snapshot", str(snapshot_path))
+            mark = lap("stage.universe", mark)
 
             outcomes: list[SearchOutcome] = []
             backtests: dict[tuple[str, str], dict] = {}
+            sweeps: dict[tuple[str, str], BacktestSweep] = {}
+            candidate_backtests: dict[tuple[str, str], dict[str, dict[str, float]]] = {}
 
             overall_done = 1.0
             telemetry.update(
@@ -134,6 +189,10 @@ class ExperimentRunner:
                     frame = self._clean_rows(raw_rows)
                     bars_path = self.store.save_bars(run_id, symbol, timeframe, frame)
                     self.db.add_artifact(run_id, "bars", str(bars_path))
+                    if self.bar_format == "npy":
+                        columns = {"timestamp": frame["timestamp"].to_numpy(), **build_context(frame)}
+                        columns_path = self.store.save_bar_columns(run_id, symbol, timeframe, columns)
+                        self.db.add_artifact(run_id, "bar_columns", str(columns_path))
 
                     ingest_done += 1
                     overall_done = 1.0 + ingest_done
@@ -155,6 +214,7 @@ class ExperimentRunner:
                         stage_total=float(total_jobs),
                     )
 
+            mark = lap("stage.ingest", mark)
             self._update(run_id, RunStatusEnum.running, RunStageEnum.discovery, 0.18, "Running symbolic indicator discovery")
             telemetry.update(
                 stage=RunStageEnum.discovery.value,
@@ -168,52 +228,52 @@ class ExperimentRunner:
             )
 
             done = 0
-            for symbol in symbols:
-                for timeframe in effective_config.timeframes:
-                    if is_cancelled():
-                        final_status = "canceled"
-                        final_message = "Run canceled by user request during discovery"
-                        self._cancel(run_id)
-                        return
-
-                    frame = self.store.load_bars(run_id, symbol, timeframe)
-                    outcome = run_indicator_search(frame=frame, symbol=symbol, timeframe=timeframe, config=effective_config)
-                    outcomes.append(outcome)
-
-                    bt = run_backtest_from_forecasts(
-                        y_true=outcome.combo_score.y_true,
-                        y_pred=outcome.combo_score.y_pred,
-                        close_ref=outcome.combo_score.close_ref,
-                        fee_bps=effective_config.backtest.fee_bps,
-                        slippage_bps=effective_config.backtest.slippage_bps,
-                        threshold=effective_config.backtest.signal_threshold,
-                    )
-                    backtests[(symbol, timeframe)] = bt
-
-                    summary_path = self.store.run_dir(run_id) / "debug" / f"search_{symbol}_{timeframe}.json"
-                    self.store.save_json(summary_path, search_outcome_to_dict(outcome))
-
-                    done += 1
-                    overall_done = 1.0 + total_jobs + done
-                    progress = min(0.99, overall_done / overall_total_units)
-                    self._update(
-                        run_id,
-                        RunStatusEnum.running,
-                        RunStageEnum.optimization,
-                        progress,
-                        f"Scored {symbol} {timeframe} ({done}/{total_jobs})",
-                    )
-                    telemetry.update(
-                        stage=RunStageEnum.optimization.value,
-                        working_on=f"Scoring and optimizing {symbol} {timeframe}",
-                        achieved=f"{done}/{total_jobs} discovery jobs complete",
-                        remaining=f"{total_jobs - done} discovery units remaining",
-                        overall_done=overall_done,
-                        overall_total=overall_total_units,
-                        stage_done=float(done),
-                        stage_total=float(total_jobs),
-                    )
-
+            jobs = [(symbol, timeframe) for symbol in symbols for timeframe in effective_config.timeframes]
+            if self.search_backend == "queue":
+                job_results = self._queued_search_jobs(run_id, jobs, effective_config, cancel_requested or is_cancelled)
+            else:
+                job_results = self._local_search_jobs(run_id, jobs, effective_config, is_cancelled)
+            finished: dict[tuple[str, str], SearchJobResult] = {}
+            for job in job_results:
+                symbol, timeframe = job.symbol, job.timeframe
+                finished[(symbol, timeframe)] = job
+                done += 1
+                overall_done = 1.0 + total_jobs + done
+                progress = min(0.99, overall_done / overall_total_units)
+                self._update(
+                    run_id,
+                    RunStatusEnum.running,
+                    RunStageEnum.optimization,
+                    progress,
+                    f"Scored {symbol} {timeframe} ({done}/{total_jobs})",
+                )
+                telemetry.update(
+                    stage=RunStageEnum.optimization.value,
+                    working_on=f"Scoring and optimizing {symbol} {timeframe}",
+                    achieved=f"{done}/{total_jobs} discovery jobs complete",
+                    remaining=f"{total_jobs - done} discovery units remaining",
+                    overall_done=overall_done,
+                    overall_total=overall_total_units,
+                    stage_done=float(done),
+                    stage_total=float(total_jobs),
+                )
+
+            if len(finished) < total_jobs:
+                final_status = "canceled"
+                final_message = "Run canceled by user request during discovery"
+                self._cancel(run_id)
+                return
+            # Queue workers finish out of order; ranking and the cube expect the symbol-major job order.
+            for key in jobs:
+                job = finished[key]
+                outcomes.append(job.outcome)
+                backtests[key] = job.backtest
+                sweeps[key] = job.sweep
+                candidate_backtests[key] = job.candidate_backtests
+            if self.archive is not None:
+                self.archive.record(run_id, outcomes)
+
+            mark = lap("stage.discovery", mark)
             self._update(run_id, RunStatusEnum.running, RunStageEnum.ranking, 0.83, "Building universal-first ranking")
             telemetry.update(
                 stage=RunStageEnum.ranking.value,
@@ -225,7 +285,20 @@ class ExperimentRunner:
                 stage_done=0.0,
                 stage_total=1.0,
             )
-            result_summary = build_result_summary(run_id=run_id, outcomes=outcomes, backtests=backtests)
+            cross_asset = self._cross_asset_scores(run_id, symbols, outcomes, effective_config)
+            with span("indicator_cube"):
+                cube = build_indicator_cube(run_id, outcomes, candidate_backtests)
+                frontier = build_frontier(cube)
+                cube_summary = write_cube(self.store.run_dir(run_id), cube, frontier)
+            self.db.add_artifact(run_id, "indicator_cube", cube_summary.path)
+            result_summary = build_result_summary(
+                run_id=run_id,
+                outcomes=outcomes,
+                backtests=backtests,
+                cross_asset=cross_asset,
+                frontier=frontier_entries(frontier),
+                cube_summary=cube_summary,
+            )
             result_json = result_summary.model_dump(mode="json")
             self.db.save_result(run_id, result_json)
 
@@ -233,21 +306,28 @@ class ExperimentRunner:
             self.store.save_json(result_path, result_json)
             self.db.add_artifact(run_id, "result_summary", str(result_path))
             overall_done = 1.0 + (2 * total_jobs) + 1.0
+            mark = lap("stage.ranking", mark)
 
             self._update(run_id, RunStatusEnum.running, RunStageEnum.artifacts, 0.9, "Generating visualization payloads")
-            artifact_stage_total = 3.0
+            # The HTML/PDF report is rendered lazily by ReportService on first request, not here.
+            artifact_stage_total = 2.0
             artifact_stage_done = 0.0
             telemetry.update(
                 stage=RunStageEnum.artifacts.value,
                 working_on="Generating visualization payloads",
                 achieved="Ranking complete",
-                remaining="Plots, report, and Pine exports pending",
+                remaining="Plots and Pine exports pending",
                 overall_done=overall_done,
                 overall_total=overall_total_units,
                 stage_done=artifact_stage_done,
                 stage_total=artifact_stage_total,
             )
-            plot_payloads = build_plot_payloads(outcomes, backtests=backtests)
+            plot_payloads = build_plot_payloads(
+                outcomes,
+                backtests=backtests,
+                sweeps=sweeps,
+                candidate_backtests=candidate_backtests,
+            )
             for plot_id, payload in plot_payloads.items():
                 self.db.save_plot(run_id, plot_id, payload)
                 path = self.store.plot_dir(run_id) / f"{plot_id}.json"
@@ -255,37 +335,11 @@ class ExperimentRunner:
                 self.db.add_artifact(run_id, "plot", str(path))
             artifact_stage_done = 1.0
             overall_done = overall_done + 1.0
-            telemetry.update(
-                stage=RunStageEnum.artifacts.value,
-                working_on="Visualization payload generation complete",
-                achieved="Plots generated",
-                remaining="Report and Pine export pending",
-                overall_done=overall_done,
-                overall_total=overall_total_units,
-                stage_done=artifact_stage_done,
-                stage_total=artifact_stage_total,
-            )
-
-            self._update(run_id, RunStatusEnum.running, RunStageEnum.artifacts, 0.95, "Generating report and Pine exports")
-            telemetry.update(
-                stage=RunStageEnum.artifacts.value,
-                working_on="Generating professional HTML/PDF report",
-                achieved="Plots generated",
-                remaining="Report and Pine export pending",
-                overall_done=overall_done,
-                overall_total=overall_total_units,
-                stage_done=artifact_stage_done,
-                stage_total=artifact_stage_total,
-            )
-            report = self.report_builder.build(run_id, result_summary)
-            self.db.add_artifact(run_id, "report_html", report.html_path)
-            self.db.add_artifact(run_id, "report_pdf", report.pdf_path)
-            artifact_stage_done = 2.0
-            overall_done = overall_done + 1.0
+            mark = lap("stage.artifacts.plots", mark)
             telemetry.update(
                 stage=RunStageEnum.artifacts.value,
                 working_on="Generating PineScript exports",
-                achieved="Report generated",
+                achieved="Plots generated",
                 remaining="Pine export pending",
                 overall_done=overall_done,
                 overall_total=overall_total_units,
@@ -293,6 +347,8 @@ class ExperimentRunner:
                 stage_total=artifact_stage_total,
             )
 
+            self._update(run_id, RunStatusEnum.running, RunStageEnum.artifacts, 0.95, "Generating Pine exports")
+
             expression_map: dict[str, str] = {}
             for outcome in outcomes:
                 for cand in outcome.best_combo:
@@ -304,6 +360,10 @@ class ExperimentRunner:
             self.store.save_json(expression_map_path, expression_map)
             self.db.add_artifact(run_id, "pine_expression_map", str(expression_map_path))
 
+            live_models_path = self.store.run_dir(run_id) / LIVE_MODELS_FILE
+            self.store.save_json(live_models_path, live_models_payload(run_id, outcomes))
+            self.db.add_artifact(run_id, "live_models", str(live_models_path))
+
             pine_bundle = self.pine_exporter.export(
                 run_id,
                 result_summary,
@@ -313,12 +373,13 @@ class ExperimentRunner:
             )
             for pine in pine_bundle.files:
                 self.db.add_artifact(run_id, "pine", pine.path)
-            artifact_stage_done = 3.0
+            artifact_stage_done = 2.0
             overall_done = overall_total_units
+            lap("stage.artifacts.exports", mark)
             telemetry.update(
                 stage=RunStageEnum.artifacts.value,
                 working_on="Artifacts complete",
-                achieved="Plots + report + Pine exports complete",
+                achieved="Plots + Pine exports complete",
                 remaining="0 units remaining",
                 overall_done=overall_done,
                 overall_total=overall_total_units,
@@ -333,8 +394,219 @@ class ExperimentRunner:
             logger.exception("run failed", exc_info=exc)
             self._update(run_id, RunStatusEnum.failed, RunStageEnum.finished, 1.0, f"Run failed: {exc}", error=str(exc))
         finally:
+            deactivate(profiler, previous_profiler)
+            profile_path = self.store.run_dir(run_id) / PROFILE_FILE
+            self.store.save_json(profile_path, profiler.summary())
+            self.db.add_artifact(run_id, "profile", str(profile_path))
             telemetry.stop(final_status=final_status, final_message=final_message)
 
+    def run_search_job(
+        self,
+        run_id: str,
+        symbol: str,
+        timeframe: str,
+        config: RunConfig,
+        prior: Sequence[SearchOutcome] = (),
+    ) -> SearchJobResult:
+        outcome = self._search(run_id, symbol, timeframe, config, self._warm_start_seeds(symbol, timeframe, config, prior))
+        with span("backtest"):
+            bt = run_backtest_from_forecasts(
+                y_true=outcome.combo_score.y_true,
+                y_pred=outcome.combo_score.y_pred,
+                close_ref=outcome.combo_score.close_ref,
+                fee_bps=config.backtest.fee_bps,
+                slippage_bps=config.backtest.slippage_bps,
+                threshold=config.backtest.signal_threshold,
+            )
+            sweep = self._threshold_sweep(outcome, config)
+            candidate_backtests = self._backtest_candidates(outcome, config)
+        best_point = sweep.best_operating_point(config.backtest.fee_bps + config.backtest.slippage_bps)
+        bt["best_threshold"] = best_point["threshold"]
+        bt["best_threshold_pnl"] = best_point["pnl_total"]
+
+        summary_path = self.store.run_dir(run_id) / "debug" / f"search_{symbol}_{timeframe}.json"
+        self.store.save_json(summary_path, search_outcome_to_dict(outcome))
+        return SearchJobResult(symbol, timeframe, outcome, bt, sweep, candidate_backtests)
+
+    def _local_search_jobs(
+        self,
+        run_id: str,
+        jobs: list[tuple[str, str]],
+        config: RunConfig,
+        is_cancelled: Callable[[], bool],
+    ) -> Iterator[SearchJobResult]:
+        prior: list[SearchOutcome] = []
+        for symbol, timeframe in jobs:
+            if is_cancelled():
+                return
+            job = self.run_search_job(run_id, symbol, timeframe, config, prior)
+            prior.append(job.outcome)
+            yield job
+
+    def _queued_search_jobs(
+        self,
+        run_id: str,
+        jobs: list[tuple[str, str]],
+        config: RunConfig,
+        is_cancelled: Callable[[], bool],
+    ) -> Iterator[SearchJobResult]:
+        # Publishes the jobs for `python -m app.worker` processes and yields results as they land. Retrying
+        # lapsed leases is the workers' side of the protocol; this thread polls, honours cancels and gives up
+        # when a job can no longer finish: failed or canceled, its last lease lapsed, or no live lease and
+        # nothing landing for search_stall_seconds (no workers running).
+        self.db.publish_search_jobs(run_id, jobs, config.model_dump_json(), max_attempts=self.search_job_max_attempts)
+        self.db.add_log(run_id, RunStageEnum.discovery, f"Published {len(jobs)} search jobs to the work queue")
+        pending = set(jobs)
+        last_progress = time.monotonic()
+        while pending:
+            if is_cancelled():
+                self.db.cancel_search_jobs(run_id)
+                return
+            landed = False
+            leased = False
+            for row in self.db.get_search_jobs(run_id):
+                key = (row["symbol"], row["timeframe"])
+                if key not in pending:
+                    continue
+                status = row["status"]
+                if status == SearchJobStatusEnum.canceled.value:
+                    self.db.cancel_search_jobs(run_id)
+                    self.db.add_log(run_id, RunStageEnum.discovery, f"Search job {key[0]} {key[1]} was canceled")
+                    return
+                lapsed = status == SearchJobStatusEnum.leased.value and row["lease_expires_at"] < time.time()
+                if status == SearchJobStatusEnum.failed.value or (lapsed and row["attempts"] >= row["max_attempts"]):
+                    self.db.cancel_search_jobs(run_id)
+                    reason = row["error"] or f"lease of {row['worker_id']} expired on the final attempt"
+                    raise RuntimeError(
+                        f"Search job {key[0]} {key[1]} failed after {row['attempts']} attempt(s): {reason}"
+                    )
+                if status == SearchJobStatusEnum.leased.value and not lapsed:
+                    leased = True
+                if status == SearchJobStatusEnum.done.value:
+                    pending.discard(key)
+                    landed = True
+                    yield self.store.load_job_result(Path(row["result_path"]))
+            if landed or leased:
+                last_progress = time.monotonic()
+            elif time.monotonic() - last_progress > self.search_stall_seconds:
+                self.db.cancel_search_jobs(run_id)
+                raise RuntimeError(
+                    f"No search worker progress for {self.search_stall_seconds:.0f}s with {len(pending)} job(s) "
+                    "pending; start workers with `python -m app.worker`"
+                )
+            if pending and not landed:
+                time.sleep(self.search_poll_seconds)
+
+    @staticmethod
+    def _threshold_sweep(outcome: SearchOutcome, config: RunConfig) -> BacktestSweep:
+        thresholds, cost_bps = sweep_grid(
+            threshold=config.backtest.signal_threshold,
+            fee_bps=config.backtest.fee_bps,
+            slippage_bps=config.backtest.slippage_bps,
+        )
+        return run_backtest_sweep(
+            y_true=outcome.combo_score.y_true,
+            y_pred=outcome.combo_score.y_pred,
+            close_ref=outcome.combo_score.close_ref,
+            thresholds=thresholds,
+            cost_bps=cost_bps,
+        )
+
+    @staticmethod
+    def _backtest_candidates(outcome: SearchOutcome, config: RunConfig) -> dict[str, dict[str, float]]:
+        preds = outcome.candidate_predictions
+        if preds is None or not outcome.best_candidates:
+            return {}
+        batch = run_backtest_batch(
+            y_true=preds.y_true,
+            y_pred=preds.y_pred,
+            close_ref=preds.close_ref,
+            fee_bps=config.backtest.fee_bps,
+            slippage_bps=config.backtest.slippage_bps,
+            threshold=config.backtest.signal_threshold,
+        )
+        # The padded matrices are only needed for this pass; outcomes stay in memory until the run ends.
+        outcome.candidate_predictions = None
+        return {
+            cand.indicator_id: {metric: float(values[row]) for metric, values in batch.items()}
+            for row, (cand, _) in enumerate(outcome.best_candidates)
+        }
+
+    def _warm_start_seeds(
+        self,
+        symbol: str,
+        timeframe: str,
+        config: RunConfig,
+        prior: Sequence[SearchOutcome],
+    ) -> list[CandidateIndicator]:
+        # Queue workers see no prior outcomes of the run, so for them only the archive contributes.
+        mode = config.search.warm_start
+        if mode == WarmStartModeEnum.off or config.search.warm_start_seeds < 1:
+            return []
+        seeds = run_seeds(symbol, prior)
+        if mode == WarmStartModeEnum.archive and self.archive is not None:
+            seeds += self.archive.seeds(symbol, timeframe)
+        return warm_start_pool(seeds, limit=config.search.warm_start_seeds)
+
+    def _search(
+        self,
+        run_id: str,
+        symbol: str,
+        timeframe: str,
+        config: RunConfig,
+        seeds: list[CandidateIndicator] | None = None,
+    ) -> SearchOutcome:
+        if self.bar_format == "npy" and self.store.has_bar_columns(run_id, symbol, timeframe):
+            columns = self.store.load_bar_columns(run_id, symbol, timeframe)
+            return run_indicator_search(
+                frame=None, symbol=symbol, timeframe=timeframe, config=config, columns=columns, seeds=seeds
+            )
+        frame = self.store.load_bars(run_id, symbol, timeframe)
+        return run_indicator_search(frame=frame, symbol=symbol, timeframe=timeframe, config=config, seeds=seeds)
+
+    def _load_context(self, run_id: str, symbol: str, timeframe: str) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+        if self.bar_format == "npy" and self.store.has_bar_columns(run_id, symbol, timeframe):
+            columns = self.store.load_bar_columns(run_id, symbol, timeframe)
+            return np.asarray(columns["timestamp"], dtype=np.int64), build_context_from_columns(columns)
+        frame = self.store.load_bars(run_id, symbol, timeframe)
+        return frame["timestamp"].to_numpy().astype(np.int64), build_context(frame)
+
+    def _cross_asset_scores(
+        self,
+        run_id: str,
+        symbols: list[str],
+        outcomes: list[SearchOutcome],
+        config: RunConfig,
+    ) -> list[CrossAssetScore]:
+        if len(symbols) < 2 or config.search.cross_asset_top_k < 1:
+            return []
+        combos = select_universal_combos(outcomes, top_k=config.search.cross_asset_top_k)
+        stacks = []
+        for timeframe in config.timeframes:
+            contexts = {}
+            missing = []
+            for symbol in symbols:
+                try:
+                    contexts[symbol] = self._load_context(run_id, symbol, timeframe)
+                except FileNotFoundError:
+                    missing.append(symbol)
+            if missing:
+                self.db.add_log(
+                    run_id,
+                    RunStageEnum.ranking,
+                    f"Cross-asset evaluation skips {', '.join(missing)} on {timeframe}: no bars",
+                )
+            if len(contexts) >= 2:
+                stacks.append(stack_contexts(timeframe, contexts))
+        scores = evaluate_cross_asset(stacks, combos, config)
+        self.db.add_log(
+            run_id,
+            RunStageEnum.ranking,
+            f"Cross-asset evaluation re-scored {len(scores)}/{len(combos)} combos on "
+            f"{len(symbols)} symbols x {len(stacks)} timeframes",
+        )
+        return scores
+
     def _clean_rows(self, rows: list[list]) -> pl.DataFrame:
         if not rows:
             raise ValueError("No OHLCV rows returned from Binance")
@@ -391,18 +663,17 @@ class ExperimentRunner:
         message: str,
         error: str | None = None,
     ) -> None:
-        self.db.update_run_status(run_id, status=status, stage=stage, progress=progress, error=error)
-        self.db.add_log(run_id, stage=stage, message=message)
+        self.db.record_progress(run_id, status=status, stage=stage, progress=progress, message=message, error=error)
 
     def _cancel(self, run_id: str) -> None:
-        self.db.update_run_status(
+        self.db.record_progress(
             run_id,
             status=RunStatusEnum.canceled,
             stage=RunStageEnum.finished,
             progress=1.0,
+            message="Run canceled",
             error="Canceled by user",
         )
-        self.db.add_log(run_id, RunStageEnum.finished, "Run canceled")
 
 
 def config_hash(config: RunConfig) -> str:
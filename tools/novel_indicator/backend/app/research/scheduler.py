@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.core.schemas import QueueStateEnum, RunPriorityEnum, RunQueue, RunQueueEntry
+
+PRIORITY_RANK = {RunPriorityEnum.urgent: 0, RunPriorityEnum.normal: 1, RunPriorityEnum.batch: 2}
+PRIORITY_WEIGHT = {RunPriorityEnum.urgent: 4.0, RunPriorityEnum.normal: 2.0, RunPriorityEnum.batch: 1.0}
+# Waits and throttles shorter than this are not worth a run log line.
+LOG_MIN_DELAY_SECONDS = 0.5
+
+
+@dataclass
+class _Ticket:
+    run_id: str
+    priority: RunPriorityEnum
+    cpu_quota: float | None
+    cancel_event: threading.Event
+    seq: int
+    submitted_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    state: QueueStateEnum = QueueStateEnum.starting
+    virtual_time: float = 0.0
+    jobs_completed: int = 0
+    cpu_seconds: float = 0.0
+    slot_seconds: float = 0.0
+    waited_seconds: float = 0.0
+    throttled_seconds: float = 0.0
+    started_wall: float | None = None
+    held_since: float | None = None
+    held_cpu_since: float = 0.0
+
+
+class RunScheduler:
+    # Runs are admitted immediately but compute only while holding one of `slots` worker slots. A run gives
+    # its slot back at every checkpoint (between ingest/discovery jobs) and queues for the next one, so the
+    # slots are shared job by job: strict priority between classes, and within a class the run that has
+    # used the least weighted slot time goes first. An optional per-run CPU quota (fraction of one core) is
+    # enforced by sleeping without a slot at checkpoints. It is measured with time.thread_time() on the run
+    # thread only: CPU spent by threads the run starts, native BLAS threads or queue worker processes is
+    # not charged, so it bounds the coordinating thread rather than everything the run causes.
+    def __init__(self, slots: int, log: Callable[[str, str], None] | None = None) -> None:
+        self.slots = max(1, slots)
+        self._log = log
+        self._tickets: dict[str, _Ticket] = {}
+        self._holders: set[str] = set()
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def admit(
+        self,
+        run_id: str,
+        priority: RunPriorityEnum = RunPriorityEnum.normal,
+        cpu_quota: float | None = None,
+        cancel_event: threading.Event | None = None,
+    ) -> threading.Event:
+        with self._cond:
+            if run_id in self._tickets:
+                raise RuntimeError(f"Run {run_id} is already scheduled")
+            self._seq += 1
+            ticket = _Ticket(run_id, priority, cpu_quota, cancel_event or threading.Event(), self._seq)
+            # Start level with the least-served run of the same class so a newcomer neither starves the
+            # runs already queued nor is starved by them.
+            peers = [t.virtual_time for t in self._tickets.values() if t.priority == priority]
+            ticket.virtual_time = min(peers) if peers else 0.0
+            self._tickets[run_id] = ticket
+        quota = f", CPU quota {cpu_quota:.0%} of a core" if cpu_quota else ""
+        self._emit(run_id, f"Scheduled with {priority.value} priority on {self.slots} shared worker slot(s){quota}")
+        return ticket.cancel_event
+
+    def checkpoint(self, run_id: str) -> bool:
+        # Called by the run thread between units of work; returns True when the run should stop.
+        with self._cond:
+            ticket = self._tickets[run_id]
+            self._release(ticket)
+        if ticket.cancel_event.is_set():
+            return True
+        self._throttle(ticket)
+        self._acquire(ticket)
+        return ticket.cancel_event.is_set()
+
+    def finish(self, run_id: str) -> None:
+        with self._cond:
+            ticket = self._tickets.pop(run_id, None)
+            if ticket is not None:
+                self._release(ticket)
+            self._cond.notify_all()
+
+    def cancel(self, run_id: str) -> bool:
+        with self._cond:
+            ticket = self._tickets.get(run_id)
+            if ticket is None:
+                return False
+            ticket.cancel_event.set()
+            self._cond.notify_all()
+            return True
+
+    def snapshot(self) -> RunQueue:
+        with self._cond:
+            waiting = sorted((t for t in self._tickets.values() if t.state == QueueStateEnum.waiting), key=self._order)
+            positions = {t.run_id: i + 1 for i, t in enumerate(waiting)}
+            entries = [
+                RunQueueEntry(
+                    run_id=t.run_id,
+                    priority=t.priority,
+                    state=t.state,
+                    position=positions.get(t.run_id),
+                    cpu_quota=t.cpu_quota,
+                    jobs_completed=t.jobs_completed,
+                    cpu_seconds=t.cpu_seconds,
+                    slot_seconds=t.slot_seconds,
+                    waited_seconds=t.waited_seconds,
+                    throttled_seconds=t.throttled_seconds,
+                    submitted_at=t.submitted_at,
+                )
+                for t in sorted(self._tickets.values(), key=lambda t: (PRIORITY_RANK[t.priority], t.seq))
+            ]
+            return RunQueue(slots=self.slots, slots_in_use=len(self._holders), entries=entries)
+
+    @staticmethod
+    def _order(ticket: _Ticket) -> tuple[int, float, int]:
+        return PRIORITY_RANK[ticket.priority], ticket.virtual_time, ticket.seq
+
+    def _release(self, ticket: _Ticket) -> None:
+        # Caller holds self._cond.
+        if ticket.held_since is None:
+            return
+        held = time.monotonic() - ticket.held_since
+        ticket.slot_seconds += held
+        ticket.cpu_seconds += max(0.0, time.thread_time() - ticket.held_cpu_since)
+        ticket.virtual_time += held / PRIORITY_WEIGHT[ticket.priority]
+        ticket.jobs_completed += 1
+        ticket.held_since = None
+        self._holders.discard(ticket.run_id)
+        self._cond.notify_all()
+
+    def _throttle(self, ticket: _Ticket) -> None:
+        if not ticket.cpu_quota or ticket.started_wall is None:
+            return
+        elapsed = time.monotonic() - ticket.started_wall
+        delay = ticket.cpu_seconds / ticket.cpu_quota - elapsed
+        if delay <= 0.0:
+            return
+        with self._cond:
+            ticket.state = QueueStateEnum.throttled
+        if delay >= LOG_MIN_DELAY_SECONDS:
+            self._emit(
+                ticket.run_id,
+                f"Throttled {delay:.1f}s to hold CPU quota {ticket.cpu_quota:.0%} ({ticket.cpu_seconds:.1f}s CPU in {elapsed:.1f}s)",
+            )
+        ticket.cancel_event.wait(delay)
+        ticket.throttled_seconds += delay
+
+    def _eligible(self, ticket: _Ticket) -> bool:
+        if len(self._holders) >= self.slots:
+            return False
+        waiting = [
+            t for t in self._tickets.values() if t.state == QueueStateEnum.waiting and not t.cancel_event.is_set()
+        ]
+        return min(waiting, key=self._order) is ticket
+
+    def _acquire(self, ticket: _Ticket) -> None:
+        started = time.monotonic()
+        with self._cond:
+            ticket.state = QueueStateEnum.waiting
+            ahead = sum(1 for t in self._tickets.values() if t.state == QueueStateEnum.waiting and self._order(t) < self._order(ticket))
+            while not ticket.cancel_event.is_set() and not self._eligible(ticket):
+                self._cond.wait(timeout=1.0)
+            waited = time.monotonic() - started
+            ticket.waited_seconds += waited
+            if ticket.cancel_event.is_set():
+                ticket.state = QueueStateEnum.waiting
+                self._cond.notify_all()
+                return
+            now = time.monotonic()
+            ticket.state = QueueStateEnum.running
+            ticket.held_since = now
+            ticket.held_cpu_since = time.thread_time()
+            if ticket.started_wall is None:
+                ticket.started_wall = now
+            self._holders.add(ticket.run_id)
+            in_use = len(self._holders)
+            # Another waiter may now be first in line for a remaining free slot.
+            self._cond.notify_all()
+        if waited >= LOG_MIN_DELAY_SECONDS:
+            self._emit(
+                ticket.run_id,
+                f"Granted worker slot ({in_use}/{self.slots} in use) after waiting {waited:.1f}s behind {ahead} run(s)",
+            )
+
+    def _emit(self, run_id: str, message: str) -> None:
+        if self._log is not None:
+            self._log(run_id, message)
@@ -1,6 +1,7 @@
 ﻿from __future__ import annotations
 
 import hashlib
+import time
 from dataclasses import dataclass
 from typing import Any
 
@@ -13,13 +14,19 @@ from app.research.indicators.dsl import sanitize_series
 from app.research.indicators.evaluator import (
     CandidateEvaluation,
     EvalCache,
+    HorizonPredictions,
     HorizonScore,
     build_context,
+    build_context_from_columns,
     evaluate_candidate_horizons,
     evaluate_feature_combo,
+    fit_final_model,
+    materialize_predictions,
+    stack_predictions,
 )
 from app.research.indicators.generator import IndicatorGenerator
 from app.research.indicators.novelty import NoveltyFilter
+from app.research.profiling import cache_lookup, lap, span
 from app.research.search.candidate import CandidateIndicator
 
 
@@ -31,17 +38,30 @@ class SearchOutcome:
     best_combo: list[CandidateIndicator]
     combo_score: HorizonScore
     folds: list[Fold]
+    combo_coef: np.ndarray | None = None
+    # NaN-padded (K, n) out-of-fold predictions for best_candidates, consumed by the batched backtest.
+    candidate_predictions: HorizonPredictions | None = None
+    warm_start_seeds: int = 0
 
 
 def run_indicator_search(
-    frame: pl.DataFrame,
+    frame: pl.DataFrame | None,
     symbol: str,
     timeframe: str,
     config: RunConfig,
+    columns: dict[str, np.ndarray] | None = None,
+    seeds: list[CandidateIndicator] | None = None,
 ) -> SearchOutcome:
-    ctx = build_context(frame)
+    search_started = time.perf_counter()
+    if columns is not None:
+        ctx = build_context_from_columns(columns)
+        timestamps = np.asarray(columns["timestamp"], dtype=np.int64)
+    elif frame is not None:
+        ctx = build_context(frame)
+        timestamps = frame["timestamp"].to_numpy().astype(np.int64)
+    else:
+        raise ValueError("run_indicator_search requires a frame or mapped bar columns")
     close = ctx["close"]
-    timestamps = frame["timestamp"].to_numpy().astype(np.int64)
 
     assert_no_lookahead(
         feature_timestamps=timestamps[:- config.horizon.max_bar],
@@ -64,14 +84,20 @@ def run_indicator_search(
     cache = EvalCache()
 
     pool = generator.generate_pool(size=config.search.candidate_pool_size)
+    if seeds:
+        # Warm-start seeds take the front of the pool (and so first claim on novelty) in place of the tail
+        # of the random draw; the full draw keeps the generator's later mutations identical to a cold start.
+        seeds = seeds[: config.search.candidate_pool_size]
+        pool = seeds + pool[: len(pool) - len(seeds)]
+    mark = lap("search.setup", search_started)
 
     # Stage A: broad screening with novelty filter.
     stage_a: list[tuple[CandidateIndicator, CandidateEvaluation]] = []
     for cand in pool:
         feature = _feature_for_candidate(cand, ctx, cache)
-        if not novelty.is_novel_signature(cand):
-            continue
-        if novelty.is_collinear(feature):
+        with span("novelty"):
+            novel = novelty.is_novel_signature(cand) and not novelty.is_collinear(feature)
+        if not novel:
             continue
 
         eval_result = evaluate_candidate_horizons(
@@ -84,12 +110,15 @@ def run_indicator_search(
             coarse_step=max(config.horizon.coarse_step * 2, 16),
             refine_radius=max(1, config.horizon.refine_radius // 2),
             cache=cache,
+            mode=config.horizon.search_mode,
         )
         stage_a.append((cand, eval_result))
-        novelty.accept(cand, feature)
+        with span("novelty"):
+            novelty.accept(cand, feature)
 
     stage_a.sort(key=lambda item: item[1].best_score.composite_error)
     stage_a = stage_a[: config.search.stage_a_keep]
+    mark = lap("search.stage_a", mark)
 
     # Stage B: richer evaluation for survivors.
     stage_b_input_limit = min(len(stage_a), max(config.search.stage_b_keep * 2, 24))
@@ -108,6 +137,7 @@ def run_indicator_search(
             coarse_step=config.horizon.coarse_step,
             refine_radius=config.horizon.refine_radius,
             cache=cache,
+            mode=config.horizon.search_mode,
             focus_horizon=stage_a_eval.best_horizon,
             focus_span=local_focus_span,
         )
@@ -116,6 +146,7 @@ def run_indicator_search(
     stage_b.sort(key=lambda item: item[1].best_score.composite_error)
     stage_b = stage_b[: config.search.stage_b_keep]
     best_stage_b_error = stage_b[0][1].best_score.composite_error if stage_b else 9_999.0
+    mark = lap("search.stage_b", mark)
 
     # Stage C: parameter mutation tuning.
     tuned: list[tuple[CandidateIndicator, CandidateEvaluation]] = []
@@ -142,6 +173,7 @@ def run_indicator_search(
                 coarse_step=config.horizon.coarse_step,
                 refine_radius=config.horizon.refine_radius,
                 cache=cache,
+                mode=config.horizon.search_mode,
                 focus_horizon=best_pair[1].best_horizon,
                 focus_span=local_focus_span,
             )
@@ -156,6 +188,7 @@ def run_indicator_search(
 
     tuned.sort(key=lambda item: item[1].best_score.composite_error)
     tuned = tuned[: config.search.stage_b_keep]
+    mark = lap("search.stage_c", mark)
 
     # Final global reevaluation on narrowed survivor set for reliable ranking across full horizon continuum.
     globally_scored: list[tuple[CandidateIndicator, CandidateEvaluation]] = []
@@ -171,10 +204,12 @@ def run_indicator_search(
             coarse_step=config.horizon.coarse_step,
             refine_radius=config.horizon.refine_radius,
             cache=cache,
+            mode=config.horizon.search_mode,
         )
         globally_scored.append((cand, global_eval))
 
     tuned = sorted(globally_scored, key=lambda item: item[1].best_score.composite_error)[: config.search.stage_b_keep]
+    mark = lap("search.global_reeval", mark)
 
     # Stage D: sparse combo search.
     best_combo, combo_score = _greedy_combo(
@@ -185,22 +220,47 @@ def run_indicator_search(
         context=ctx,
         max_size=config.search.max_combo_size,
     )
+    mark = lap("search.combo", mark)
+    combo_matrix = _build_matrix(best_combo, ctx, cache)
+    # Only the winning combo's out-of-fold predictions are needed downstream (backtest, plots).
+    combo_score = materialize_predictions(combo_score, combo_matrix, close, folds)
+    # Refit the winning combo on the full history so live scoring can reuse the coefficients. Too few valid
+    # rows (short or mostly-NaN history) leaves the outcome without a live model instead of failing the search.
+    try:
+        combo_coef = fit_final_model(combo_matrix, close, combo_score.horizon).coef_
+    except ValueError:
+        combo_coef = None
+    mark = lap("search.final_fit", mark)
+    best_candidates = tuned[:10]
+    candidate_predictions = stack_predictions(
+        [
+            materialize_predictions(ev.best_score, _feature_for_candidate(cand, ctx, cache), close, folds).predictions
+            for cand, ev in best_candidates
+        ]
+    )
+    lap("search.candidate_predictions", mark)
+    lap("search.total", search_started)
 
     return SearchOutcome(
         symbol=symbol,
         timeframe=timeframe,
-        best_candidates=tuned[:10],
+        best_candidates=best_candidates,
         best_combo=best_combo,
         combo_score=combo_score,
         folds=folds,
+        combo_coef=combo_coef,
+        candidate_predictions=candidate_predictions,
+        warm_start_seeds=len(seeds or []),
     )
 
 
 def _feature_for_candidate(cand: CandidateIndicator, ctx: dict[str, np.ndarray], cache: EvalCache) -> np.ndarray:
     key = cand.expression()
+    cache_lookup("feature", key in cache.feature)
     if key in cache.feature:
         return cache.feature[key]
-    feature = sanitize_series(cand.root.eval(ctx))
+    with span("dsl_eval"):
+        feature = sanitize_series(cand.root.eval(ctx))
     cache.feature[key] = feature
     return feature
 
@@ -283,6 +343,7 @@ def search_outcome_to_dict(outcome: SearchOutcome) -> dict[str, Any]:
     return {
         "symbol": outcome.symbol,
         "timeframe": outcome.timeframe,
+        "warm_start_seeds": outcome.warm_start_seeds,
         "best_combo_ids": [cand.indicator_id for cand in outcome.best_combo],
         "best_combo_expr": [cand.expression() for cand in outcome.best_combo],
         "combo_score": {
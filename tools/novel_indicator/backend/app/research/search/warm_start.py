@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.research.indicators.dsl import node_from_dict, node_to_dict
+from app.research.search.candidate import CandidateIndicator
+
+if TYPE_CHECKING:
+    from app.research.search.optimizer import SearchOutcome
+
+ARCHIVE_FILE = "elite_archive.json"
+# Per outcome, only the head of best_candidates is worth re-screening elsewhere.
+SEEDS_PER_OUTCOME = 6
+
+
+class EliteArchive:
+    # The best candidates of finished runs, kept per (symbol, timeframe) in one JSON file so later runs can
+    # seed their searches with them. Written only by the run threads of the API process.
+    def __init__(self, path: Path, per_key: int = 12) -> None:
+        self.path = path
+        self.per_key = per_key
+        self._lock = threading.Lock()
+
+    def load(self) -> list[dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        with self.path.open("r", encoding="utf-8") as f:
+            return list(json.load(f).get("entries", []))
+
+    def record(self, run_id: str, outcomes: Sequence[SearchOutcome]) -> int:
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            entries = {(e["symbol"], e["timeframe"], e["signature"]): e for e in self.load()}
+            for outcome in outcomes:
+                for cand, evaluation in outcome.best_candidates[: self.per_key]:
+                    key = (outcome.symbol, outcome.timeframe, cand.signature())
+                    error = float(evaluation.best_score.composite_error)
+                    if key in entries and entries[key]["composite_error"] <= error:
+                        continue
+                    entries[key] = {
+                        "symbol": outcome.symbol,
+                        "timeframe": outcome.timeframe,
+                        "signature": cand.signature(),
+                        "expression": cand.expression(),
+                        "node": node_to_dict(cand.root),
+                        "composite_error": error,
+                        "run_id": run_id,
+                        "recorded_at": now,
+                    }
+            by_key: dict[tuple[str, str], list[dict[str, Any]]] = {}
+            for entry in entries.values():
+                by_key.setdefault((entry["symbol"], entry["timeframe"]), []).append(entry)
+            kept = [
+                entry
+                for key in sorted(by_key)
+                for entry in sorted(by_key[key], key=lambda e: e["composite_error"])[: self.per_key]
+            ]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # The archive sits in the shared artifacts directory, so the temp name must not be just a PID.
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path.parent, prefix=f"{self.path.name}.", suffix=".tmp", delete=False
+            ) as f:
+                json.dump({"entries": kept}, f, indent=2)
+            Path(f.name).replace(self.path)
+            return len(kept)
+
+    def seeds(self, symbol: str, timeframe: str) -> list[tuple[str, CandidateIndicator]]:
+        # Same market first, then the same symbol on other timeframes, the same timeframe on other
+        # symbols, and everything else; best error first within each group.
+        def group(entry: dict[str, Any]) -> int:
+            return (entry["symbol"] != symbol) * 2 + (entry["timeframe"] != timeframe)
+
+        ranked = sorted(self.load(), key=lambda e: (group(e), e["composite_error"]))
+        out = []
+        for entry in ranked:
+            root = node_from_dict(entry["node"])
+            out.append(("archive", CandidateIndicator(indicator_id="", root=root, complexity=root.complexity())))
+        return out
+
+
+def run_seeds(symbol: str, outcomes: Sequence[SearchOutcome]) -> list[tuple[str, CandidateIndicator]]:
+    # Sibling timeframes of the same symbol first, then other symbols, in the order they finished.
+    ranked = sorted(outcomes, key=lambda o: o.symbol != symbol)
+    return [
+        ("sibling" if outcome.symbol == symbol else "run", cand)
+        for outcome in ranked
+        for cand, _ in outcome.best_candidates[:SEEDS_PER_OUTCOME]
+    ]
+
+
+def warm_start_pool(seeds: Sequence[tuple[str, CandidateIndicator]], limit: int) -> list[CandidateIndicator]:
+    # Deduplicates by tree signature and gives the seeds their own ids; the source lands in params so a
+    # seeded winner can be told apart in results.
+    pool: list[CandidateIndicator] = []
+    seen: set[str] = set()
+    for source, cand in seeds:
+        if len(pool) >= limit:
+            break
+        signature = cand.signature()
+        if signature in seen:
+            continue
+        seen.add(signature)
+        pool.append(
+            CandidateIndicator(
+                indicator_id=f"warm_{len(pool):04d}",
+                root=cand.root,
+                complexity=cand.complexity,
+                params={"warm_start": source},
+            )
+        )
+    return pool
@@ -5,6 +5,7 @@ import math
 import os
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
@@ -12,6 +13,8 @@ from typing import Any
 
 import psutil
 
+TELEMETRY_FILE = "telemetry.jsonl"
+
 
 def _fmt_seconds(value: float | None) -> str:
     if value is None or not math.isfinite(value) or value < 0:
@@ -36,6 +39,69 @@ def _fmt_rate(value: float | None, unit: str) -> str:
     return f"{value:.4f} {unit}"
 
 
+def _parse_lines(data: bytes) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for raw in data.split(b"\n"):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            rows.append(json.loads(raw))
+        except ValueError:
+            continue
+    return rows
+
+
+def read_jsonl_tail(path: Path, limit: int, chunk_size: int = 65_536) -> tuple[list[dict[str, Any]], int]:
+    # Reads backwards from the last complete line until `limit` lines are found; cost scales with
+    # the tail, not the file. Returns the rows and the byte offset just past the last complete line.
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        pos = size
+        data = b""
+        while pos > 0 and data.count(b"\n") <= limit:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+
+    end = data.rfind(b"\n") + 1
+    complete = data[:end]
+    if pos > 0:
+        # The first line in the buffer may have been cut by the chunk boundary.
+        complete = complete[complete.find(b"\n") + 1 :]
+    rows = _parse_lines(complete)
+    return rows[-limit:] if limit > 0 else [], pos + end
+
+
+def read_jsonl_since(
+    path: Path,
+    offset: int,
+    max_lines: int | None = None,
+    max_bytes: int = 4_194_304,
+) -> tuple[list[dict[str, Any]], int]:
+    # Resumes from a byte offset returned by a previous read. Only complete lines are consumed, so a
+    # snapshot that is still being appended is picked up by the next call. An offset past the end of
+    # the file means it was replaced and reading restarts from the beginning.
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if offset < 0 or offset > size:
+            offset = 0
+        f.seek(offset)
+        data = f.read(min(max_bytes, size - offset))
+
+    rows: list[dict[str, Any]] = []
+    consumed = 0
+    for raw in data.split(b"\n")[:-1]:
+        consumed += len(raw) + 1
+        rows.extend(_parse_lines(raw))
+        if max_lines is not None and len(rows) >= max_lines:
+            break
+    return rows, offset + consumed
+
+
 class CpuTempReader:
     def __init__(self) -> None:
         self._last_read = 0.0
@@ -103,15 +169,41 @@ class TelemetryState:
     stage_total: float = 1.0
 
 
+_ACTIVE: dict[str, "LiveTelemetry"] = {}
+_ACTIVE_LOCK = threading.Lock()
+
+
+def get_live_telemetry(run_id: str) -> "LiveTelemetry | None":
+    with _ACTIVE_LOCK:
+        return _ACTIVE.get(run_id)
+
+
 class LiveTelemetry:
-    def __init__(self, run_id: str, run_dir: Path, tick_seconds: float = 1.0) -> None:
+    # Snapshots land in an in-memory ring that the API reads directly. File writes and console output
+    # are queued and flushed by the tick thread; update()-driven emits are rate limited except on stage
+    # changes. Ring entries carry the byte offset the snapshot will occupy in telemetry.jsonl, so
+    # offsets handed out from memory stay valid for file-based reads once the run is gone.
+    def __init__(
+        self,
+        run_id: str,
+        run_dir: Path,
+        tick_seconds: float = 1.0,
+        console: bool = True,
+        min_update_seconds: float = 0.25,
+        ring_size: int = 512,
+        system_sample_seconds: float = 1.0,
+    ) -> None:
         self.run_id = run_id
         self.run_dir = run_dir
         self.tick_seconds = tick_seconds
+        self.console = console
+        self.min_update_seconds = min_update_seconds
+        self.system_sample_seconds = system_sample_seconds
 
         self._state = TelemetryState()
         self._run_started_at = time.monotonic()
         self._stage_started_at = self._run_started_at
+        self._last_emit_at = float("-inf")
 
         self._lock = threading.Lock()
         self._stop = threading.Event()
@@ -120,9 +212,11 @@ class LiveTelemetry:
         self._cpu_temp_reader = CpuTempReader()
         self._process = psutil.Process()
         self._logical_cores = max(1, psutil.cpu_count(logical=True) or 1)
+        self._system_sampled_at = float("-inf")
+        self._system_stats: dict[str, Any] = {}
 
         self.log_path = self.run_dir / "telemetry.log"
-        self.jsonl_path = self.run_dir / "telemetry.jsonl"
+        self.jsonl_path = self.run_dir / TELEMETRY_FILE
 
         self.run_dir.mkdir(parents=True, exist_ok=True)
         if not self.log_path.exists():
@@ -130,6 +224,12 @@ class LiveTelemetry:
         if not self.jsonl_path.exists():
             self.jsonl_path.write_text("", encoding="utf-8")
 
+        self._ring: deque[tuple[int, int, dict[str, Any]]] = deque(maxlen=ring_size)
+        self._ring_lock = threading.Lock()
+        self._logical_size = self.jsonl_path.stat().st_size
+        self._pending: list[tuple[dict[str, Any], bytes]] = []
+        self._write_lock = threading.Lock()
+
         # Prime CPU counters.
         psutil.cpu_percent(interval=None)
         self._process.cpu_percent(interval=None)
@@ -137,6 +237,8 @@ class LiveTelemetry:
     def start(self) -> None:
         if self._thread is not None:
             return
+        with _ACTIVE_LOCK:
+            _ACTIVE[self.run_id] = self
         self._thread = threading.Thread(target=self._loop, daemon=True, name=f"telemetry-{self.run_id}")
         self._thread.start()
 
@@ -144,7 +246,12 @@ class LiveTelemetry:
         self._stop.set()
         if self._thread is not None:
             self._thread.join(timeout=3)
+        self._emit(self._snapshot())
+        self.flush()
         self._write_line(f"FINAL | status={final_status} | message={final_message}")
+        with _ACTIVE_LOCK:
+            if _ACTIVE.get(self.run_id) is self:
+                del _ACTIVE[self.run_id]
 
     def update(
         self,
@@ -158,9 +265,11 @@ class LiveTelemetry:
         stage_done: float,
         stage_total: float,
     ) -> None:
+        now = time.monotonic()
         with self._lock:
-            if stage != self._state.stage:
-                self._stage_started_at = time.monotonic()
+            stage_changed = stage != self._state.stage
+            if stage_changed:
+                self._stage_started_at = now
             self._state.stage = stage
             self._state.working_on = working_on
             self._state.achieved = achieved
@@ -169,17 +278,63 @@ class LiveTelemetry:
             self._state.overall_total = max(1.0, overall_total)
             self._state.stage_done = max(0.0, stage_done)
             self._state.stage_total = max(1.0, stage_total)
+            due = stage_changed or now - self._last_emit_at >= self.min_update_seconds
+            if due:
+                self._last_emit_at = now
 
-        # Emit immediately on state transitions and progress updates, not only on timer ticks.
-        snapshot = self._snapshot()
-        self._emit(snapshot)
+        # Stage transitions always emit; progress inside a stage is sampled at most every min_update_seconds
+        # and otherwise picked up by the next tick.
+        if due:
+            self._emit(self._snapshot())
 
     def _loop(self) -> None:
         while not self._stop.is_set():
             if self._stop.wait(self.tick_seconds):
                 break
-            snapshot = self._snapshot()
-            self._emit(snapshot)
+            with self._lock:
+                self._last_emit_at = time.monotonic()
+            self._emit(self._snapshot())
+            self.flush()
+
+    def recent(self, limit: int) -> tuple[list[dict[str, Any]], int]:
+        with self._ring_lock:
+            entries = list(self._ring)[-limit:] if limit > 0 else []
+            return [snap for _, _, snap in entries], self._logical_size
+
+    def since(self, offset: int, limit: int) -> tuple[list[dict[str, Any]], int] | None:
+        # None when the offset predates the ring; callers then fall back to the file.
+        with self._ring_lock:
+            if offset < 0 or offset > self._logical_size:
+                return None
+            if offset == self._logical_size:
+                return [], offset
+            if not self._ring or offset < self._ring[0][0]:
+                return None
+            rows: list[dict[str, Any]] = []
+            next_offset = offset
+            for start, end, snap in self._ring:
+                if start < offset:
+                    continue
+                rows.append(snap)
+                next_offset = end
+                if len(rows) >= limit:
+                    break
+            return rows, next_offset
+
+    def _system_sample(self) -> dict[str, Any]:
+        now = time.monotonic()
+        if now - self._system_sampled_at >= self.system_sample_seconds:
+            vm = psutil.virtual_memory()
+            self._system_stats = {
+                "system_cpu_percent": psutil.cpu_percent(interval=None),
+                "process_cpu_percent": self._process.cpu_percent(interval=None),
+                "ram_used_gb": vm.used / (1024**3),
+                "ram_total_gb": vm.total / (1024**3),
+                "ram_percent": vm.percent,
+                "cpu_temp_c": self._cpu_temp_reader.read(),
+            }
+            self._system_sampled_at = now
+        return self._system_stats
 
     def _snapshot(self) -> dict[str, Any]:
         now_monotonic = time.monotonic()
@@ -202,9 +357,8 @@ class LiveTelemetry:
         eta_total = remaining_total_units / total_rate if total_rate > 1e-9 else None
         eta_stage = remaining_stage_units / stage_rate if stage_rate > 1e-9 else None
 
-        system_cpu_percent = psutil.cpu_percent(interval=None)
-        process_cpu_percent = self._process.cpu_percent(interval=None)
-        vm = psutil.virtual_memory()
+        system = self._system_sample()
+        process_cpu_percent = system["process_cpu_percent"]
 
         if process_cpu_percent >= 0.1:
             cpu_cores_used = process_cpu_percent / 100.0
@@ -214,8 +368,6 @@ class LiveTelemetry:
             rate_per_core = None
             rate_per_cpu_pct = None
 
-        cpu_temp_c = self._cpu_temp_reader.read()
-
         return {
             "ts": now_utc,
             "run_id": self.run_id,
@@ -237,43 +389,61 @@ class LiveTelemetry:
             "rate_stage_units_per_sec": stage_rate,
             "rate_units_per_core_sec": rate_per_core,
             "rate_units_per_cpu_pct_sec": rate_per_cpu_pct,
-            "system_cpu_percent": system_cpu_percent,
+            "system_cpu_percent": system["system_cpu_percent"],
             "process_cpu_percent": process_cpu_percent,
             "logical_cores": self._logical_cores,
-            "ram_used_gb": vm.used / (1024**3),
-            "ram_total_gb": vm.total / (1024**3),
-            "ram_percent": vm.percent,
-            "cpu_temp_c": cpu_temp_c,
+            "ram_used_gb": system["ram_used_gb"],
+            "ram_total_gb": system["ram_total_gb"],
+            "ram_percent": system["ram_percent"],
+            "cpu_temp_c": system["cpu_temp_c"],
         }
 
     def _emit(self, snapshot: dict[str, Any]) -> None:
-        total_bar = _bar(snapshot["overall_progress"], width=34)
-        stage_bar = _bar(snapshot["stage_progress"], width=22)
-        temp_text = "n/a" if snapshot["cpu_temp_c"] is None else f"{snapshot['cpu_temp_c']:.1f}C"
-
-        line = (
-            f"[{snapshot['ts']}] run={snapshot['run_id']} stage={snapshot['stage']} "
-            f"work='{snapshot['working_on']}'\n"
-            f"  overall {total_bar} {snapshot['overall_progress'] * 100:6.2f}% "
-            f"({snapshot['overall_done']:.2f}/{snapshot['overall_total']:.2f}) "
-            f"elapsed={_fmt_seconds(snapshot['run_elapsed_sec'])} eta={_fmt_seconds(snapshot['eta_total_sec'])}\n"
-            f"  task    {stage_bar} {snapshot['stage_progress'] * 100:6.2f}% "
-            f"({snapshot['stage_done']:.2f}/{snapshot['stage_total']:.2f}) "
-            f"elapsed={_fmt_seconds(snapshot['stage_elapsed_sec'])} eta={_fmt_seconds(snapshot['eta_stage_sec'])}\n"
-            f"  achieved='{snapshot['achieved']}' left='{snapshot['remaining']}'\n"
-            f"  rate={snapshot['rate_units_per_sec']:.4f} u/s | "
-            f"{_fmt_rate(snapshot['rate_units_per_core_sec'], 'u/core-s')} | "
-            f"{_fmt_rate(snapshot['rate_units_per_cpu_pct_sec'], 'u/%cpu-s')}\n"
-            f"  cpu sys={snapshot['system_cpu_percent']:.1f}% proc={snapshot['process_cpu_percent']:.1f}% "
-            f"ram={snapshot['ram_used_gb']:.2f}/{snapshot['ram_total_gb']:.2f}GB ({snapshot['ram_percent']:.1f}%) "
-            f"cpu_temp={temp_text}"
-        )
-
-        print(line, flush=True)
-        self._write_line(line)
-        with self.jsonl_path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(snapshot) + "\n")
+        encoded = (json.dumps(snapshot) + "\n").encode("utf-8")
+        with self._ring_lock:
+            start = self._logical_size
+            self._logical_size += len(encoded)
+            self._ring.append((start, self._logical_size, snapshot))
+            self._pending.append((snapshot, encoded))
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._ring_lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                return
+            text = "\n".join(_format_snapshot(snapshot) for snapshot, _ in pending)
+            if self.console:
+                print(text, flush=True)
+            with self.log_path.open("a", encoding="utf-8") as f:
+                f.write(text + "\n")
+            with self.jsonl_path.open("ab") as f:
+                f.write(b"".join(encoded for _, encoded in pending))
 
     def _write_line(self, line: str) -> None:
         with self.log_path.open("a", encoding="utf-8") as f:
             f.write(line + "\n")
+
+
+def _format_snapshot(snapshot: dict[str, Any]) -> str:
+    total_bar = _bar(snapshot["overall_progress"], width=34)
+    stage_bar = _bar(snapshot["stage_progress"], width=22)
+    temp_text = "n/a" if snapshot["cpu_temp_c"] is None else f"{snapshot['cpu_temp_c']:.1f}C"
+
+    return (
+        f"[{snapshot['ts']}] run={snapshot['run_id']} stage={snapshot['stage']} "
+        f"work='{snapshot['working_on']}'\n"
+        f"  overall {total_bar} {snapshot['overall_progress'] * 100:6.2f}% "
+        f"({snapshot['overall_done']:.2f}/{snapshot['overall_total']:.2f}) "
+        f"elapsed={_fmt_seconds(snapshot['run_elapsed_sec'])} eta={_fmt_seconds(snapshot['eta_total_sec'])}\n"
+        f"  task    {stage_bar} {snapshot['stage_progress'] * 100:6.2f}% "
+        f"({snapshot['stage_done']:.2f}/{snapshot['stage_total']:.2f}) "
+        f"elapsed={_fmt_seconds(snapshot['stage_elapsed_sec'])} eta={_fmt_seconds(snapshot['eta_stage_sec'])}\n"
+        f"  achieved='{snapshot['achieved']}' left='{snapshot['remaining']}'\n"
+        f"  rate={snapshot['rate_units_per_sec']:.4f} u/s | "
+        f"{_fmt_rate(snapshot['rate_units_per_core_sec'], 'u/core-s')} | "
+        f"{_fmt_rate(snapshot['rate_units_per_cpu_pct_sec'], 'u/%cpu-s')}\n"
+        f"  cpu sys={snapshot['system_cpu_percent']:.1f}% proc={snapshot['process_cpu_percent']:.1f}% "
+        f"ram={snapshot['ram_used_gb']:.2f}/{snapshot['ram_total_gb']:.2f}GB ({snapshot['ram_percent']:.1f}%) "
+        f"cpu_temp={temp_text}"
+    )
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.research.runner import ExperimentRunner
+
+logger = logging.getLogger(__name__)
+
+
+class SearchWorker:
+    # Leases (symbol, timeframe) search jobs from the search_jobs table and runs them with the same code
+    # as a local run, writing each result to the run's jobs/ directory. A heartbeat thread pushes the lease
+    # forward while the job runs; if this process dies, the lease lapses and another worker retries it.
+    def __init__(self, runner: ExperimentRunner, worker_id: str, lease_seconds: float, poll_seconds: float) -> None:
+        self.runner = runner
+        self.db = runner.db
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+
+    def run_once(self) -> bool:
+        from app.core.schemas import RunConfig
+
+        job = self.db.claim_search_job(self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+        job_id, run_id, symbol, timeframe = job["job_id"], job["run_id"], job["symbol"], job["timeframe"]
+        logger.info("%s leased %s %s %s (attempt %d)", self.worker_id, run_id, symbol, timeframe, job["attempts"])
+        stop = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job_id, stop), daemon=True, name="ni-worker-heartbeat")
+        beat.start()
+        try:
+            config = RunConfig.model_validate_json(job["config_json"])
+            result = self.runner.run_search_job(run_id, symbol, timeframe, config)
+            path = self.runner.store.save_job_result(run_id, symbol, timeframe, result)
+        except Exception as exc:
+            logger.exception("%s failed %s %s %s", self.worker_id, run_id, symbol, timeframe)
+            self.db.fail_search_job(job_id, self.worker_id, f"{type(exc).__name__}: {exc}")
+            return True
+        finally:
+            stop.set()
+            beat.join()
+        if not self.db.complete_search_job(job_id, self.worker_id, str(path)):
+            logger.warning("%s lost the lease on %s %s %s; result discarded", self.worker_id, run_id, symbol, timeframe)
+        return True
+
+    def run(self, max_jobs: int | None = None, exit_when_idle: float | None = None) -> int:
+        processed = 0
+        idle_since = time.monotonic()
+        while max_jobs is None or processed < max_jobs:
+            if self.run_once():
+                processed += 1
+                idle_since = time.monotonic()
+                continue
+            if exit_when_idle is not None and time.monotonic() - idle_since >= exit_when_idle:
+                break
+            time.sleep(self.poll_seconds)
+        return processed
+
+    def _heartbeat(self, job_id: int, stop: threading.Event) -> None:
+        # Three beats per lease, so one slow write does not cost the lease.
+        while not stop.wait(self.lease_seconds / 3.0):
+            if not self.db.heartbeat_search_job(job_id, self.worker_id, self.lease_seconds):
+                logger.warning("%s heartbeat rejected for job %d", self.worker_id, job_id)
+                return
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.worker",
+        description="Run discovery search jobs published to the work queue by runs with NI_SEARCH_BACKEND=queue",
+    )
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument("--lease-seconds", type=float, default=settings.worker_lease_seconds)
+    parser.add_argument("--poll-seconds", type=float, default=settings.search_poll_seconds)
+    parser.add_argument("--max-jobs", type=int, default=None, help="Exit after this many jobs")
+    parser.add_argument("--exit-when-idle", type=float, default=None, help="Exit after this many seconds without work")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    from app.core.container import get_db, get_runner
+
+    worker = SearchWorker(get_runner(), args.worker_id, args.lease_seconds, args.poll_seconds)
+    try:
+        processed = worker.run(max_jobs=args.max_jobs, exit_when_idle=args.exit_when_idle)
+    finally:
+        get_db().close()
+    logger.info("%s processed %d job(s)", args.worker_id, processed)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.suite import compare, run_suite
+
+BASELINES_DIR = Path(__file__).resolve().parent / "baselines"
+
+
+def _load(path_or_name: str) -> dict:
+    path = Path(path_or_name)
+    if not path.exists():
+        path = BASELINES_DIR / f"{path_or_name}.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _print_comparison(rows: list[dict], threshold: float) -> bool:
+    def fmt(value: float | None) -> str:
+        return "-" if value is None else f"{value:.3f}"
+
+    print(f"{'case':<40} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}  status")
+    for row in rows:
+        print(f"{row['case']:<40} {fmt(row['baseline_ms']):>12} {fmt(row['current_ms']):>12} {fmt(row['ratio']):>7}  {row['status']}")
+    regressed = [row for row in rows if row["status"] == "regressed"]
+    if regressed:
+        print(f"\n{len(regressed)} case(s) slower than baseline by more than {threshold:.0%}")
+    return not regressed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Research engine benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run the suite and write a JSON result")
+    run_p.add_argument("-k", "--filter", default=None, help="Only run cases whose name contains this text")
+    run_p.add_argument("--timeframes", default="5m,1h,4h")
+    run_p.add_argument("--scale", type=float, default=1.0, help="Fraction of the default bar counts to generate")
+    run_p.add_argument("--output", default=None, help="Write results to this path")
+    run_p.add_argument("--save-baseline", default=None, metavar="NAME", help="Write results to baselines/NAME.json")
+    run_p.add_argument("--compare-to", default=None, metavar="BASELINE", help="Compare against a baseline after running")
+    run_p.add_argument("--threshold", type=float, default=0.15)
+
+    cmp_p = sub.add_parser("compare", help="Compare two result files")
+    cmp_p.add_argument("baseline", help="Baseline path or name under baselines/")
+    cmp_p.add_argument("current", help="Result path or name under baselines/")
+    cmp_p.add_argument("--threshold", type=float, default=0.15)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        ok = _print_comparison(compare(_load(args.baseline), _load(args.current), args.threshold), args.threshold)
+        return 0 if ok else 1
+
+    result = run_suite(
+        name_filter=args.filter,
+        timeframes=tuple(tf.strip() for tf in args.timeframes.split(",") if tf.strip()),
+        scale=args.scale,
+        log=lambda line: print(line, file=sys.stderr, flush=True),
+    )
+    targets = [Path(args.output)] if args.output else []
+    if args.save_baseline:
+        targets.append(BASELINES_DIR / f"{args.save_baseline}.json")
+    for path in targets:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    if not targets:
+        print(json.dumps(result, indent=2, sort_keys=True))
+    if args.compare_to:
+        baseline = _load(args.compare_to)
+        if args.filter:
+            baseline["results"] = {k: v for k, v in baseline["results"].items() if k in result["results"]}
+        ok = _print_comparison(compare(baseline, result, args.threshold), args.threshold)
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.core.schemas import RunStageEnum, RunStatusEnum
+from app.db.sqlite import Database
+
+
+def run(writers: int = 4, readers: int = 4, duration_seconds: float = 3.0, runs: int = 50) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.sqlite3")
+        run_ids = [f"run{i:04d}" for i in range(runs)]
+        for run_id in run_ids:
+            db.create_run(run_id=run_id, config_json={}, config_hash="bench")
+
+        stop = threading.Event()
+        write_counts = [0] * writers
+        read_latencies: list[list[float]] = [[] for _ in range(readers)]
+
+        def writer(slot: int) -> None:
+            i = 0
+            while not stop.is_set():
+                run_id = run_ids[(slot + i) % runs]
+                db.record_progress(run_id, RunStatusEnum.running, RunStageEnum.discovery, 0.5, f"step {i}")
+                db.add_log(run_id, RunStageEnum.discovery, f"detail {i}")
+                db.add_artifact(run_id, "plot", f"/tmp/{run_id}/{i}.json")
+                i += 1
+            write_counts[slot] = i
+
+        def reader(slot: int) -> None:
+            i = 0
+            while not stop.is_set():
+                run_id = run_ids[(slot * 7 + i) % runs]
+                started = time.perf_counter()
+                db.get_run(run_id)
+                db.list_runs(limit=100)
+                read_latencies[slot].append(time.perf_counter() - started)
+                i += 1
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration_seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        db.close()
+
+    latencies = np.array([v for rows in read_latencies for v in rows]) * 1000.0
+    return {
+        "writers": writers,
+        "readers": readers,
+        "duration_seconds": duration_seconds,
+        "writes_per_sec": sum(write_counts) / duration_seconds,
+        "reads_per_sec": len(latencies) / duration_seconds,
+        "read_p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+        "read_p95_ms": float(np.percentile(latencies, 95)) if len(latencies) else None,
+        "read_p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read latency of Database under concurrent writers")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+    print(json.dumps(run(writers=args.writers, readers=args.readers, duration_seconds=args.duration), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any
+
+import numpy as np
+
+from app.core.schemas import HorizonConfig
+from app.research.cv import build_purged_walk_forward_folds
+from app.research.indicators.dsl import sanitize_series
+from app.research.indicators.evaluator import (
+    EvalCache,
+    build_context,
+    evaluate_candidate_horizons,
+)
+from app.research.indicators.generator import IndicatorGenerator
+from benchmarks.synthetic import synthetic_ohlcv
+
+SEED = 20240611
+
+
+def _features(close: np.ndarray, ctx: dict[str, np.ndarray], candidates: int, planted: int, max_bar: int) -> dict[str, np.ndarray]:
+    # Random generated candidates mostly have their best horizon at the short end on a random walk; the
+    # planted features leak a noisy future return at a known horizon so the optimum sits mid-range.
+    features = {
+        cand.indicator_id: sanitize_series(cand.root.eval(ctx))
+        for cand in IndicatorGenerator(seed=SEED).generate_pool(size=candidates)
+    }
+    rng = np.random.default_rng(SEED)
+    logc = np.log(close)
+    for i in range(planted):
+        lead = int(rng.integers(8, min(64, max_bar - 8)))
+        future = np.r_[logc[lead:] - logc[:-lead], np.zeros(lead)]
+        noisy = future + rng.normal(0.0, float(rng.uniform(0.05, 0.4)) * future.std(), len(close))
+        features[f"planted_{i:02d}_h{lead}"] = noisy / noisy.std()
+    return features
+
+
+def _evaluate(
+    features: dict[str, np.ndarray],
+    close: np.ndarray,
+    folds: list,
+    cfg: HorizonConfig,
+    mode: str,
+    coarse_step: int,
+    refine_radius: int,
+) -> tuple[dict[str, tuple[int, int, float]], float]:
+    # Per feature: (_score_horizon calls, best horizon, best composite error). A fresh cache per feature
+    # makes the number of distinct horizons scored equal to the number of fits.
+    started = time.perf_counter()
+    out = {}
+    for key, feature in features.items():
+        if mode == "dense":
+            # Exhaustive reference: the true optimum over every horizon in range.
+            ev = evaluate_candidate_horizons(key, feature, close, folds, cfg.min_bar, cfg.max_bar, 1, 0, EvalCache())
+        else:
+            ev = evaluate_candidate_horizons(
+                key, feature, close, folds, cfg.min_bar, cfg.max_bar, coarse_step, refine_radius, EvalCache(), mode=mode
+            )
+        out[key] = (len(ev.all_scores), ev.best_horizon, ev.best_score.composite_error)
+    return out, time.perf_counter() - started
+
+
+def _compare(
+    keys: list[str],
+    grid: dict[str, tuple[int, int, float]],
+    adaptive: dict[str, tuple[int, int, float]],
+    dense: dict[str, tuple[int, int, float]],
+) -> dict[str, Any]:
+    gaps = np.array([adaptive[k][2] / grid[k][2] - 1.0 for k in keys])
+    return {
+        "candidates": len(keys),
+        "grid_calls": int(sum(grid[k][0] for k in keys)),
+        "adaptive_calls": int(sum(adaptive[k][0] for k in keys)),
+        "same_best_horizon": float(np.mean([grid[k][1] == adaptive[k][1] for k in keys])),
+        "grid_found_optimum": float(np.mean([grid[k][1] == dense[k][1] for k in keys])),
+        "adaptive_found_optimum": float(np.mean([adaptive[k][1] == dense[k][1] for k in keys])),
+        "adaptive_error_vs_grid_mean": float(gaps.mean()),
+        "adaptive_error_vs_grid_max": float(gaps.max()),
+        "adaptive_better": int((gaps < -1e-12).sum()),
+        "adaptive_worse": int((gaps > 1e-12).sum()),
+    }
+
+
+def run(bars: int = 3000, candidates: int = 40, planted: int = 20, timeframe: str = "1h") -> dict[str, Any]:
+    cfg = HorizonConfig()
+    frame = synthetic_ohlcv(timeframe, bars=bars, seed=SEED % 1000)
+    ctx = build_context(frame)
+    close = ctx["close"]
+    folds = build_purged_walk_forward_folds(n_rows=len(close), folds=4, max_horizon=cfg.max_bar, purge_bars=8, embargo_bars=8)
+    features = _features(close, ctx, candidates, planted, cfg.max_bar)
+
+    # The full-range passes of the optimizer: Stage A screening and the Stage B / global re-evaluation.
+    passes = {
+        "stage_a": (max(cfg.coarse_step * 2, 16), max(1, cfg.refine_radius // 2)),
+        "full": (cfg.coarse_step, cfg.refine_radius),
+    }
+    dense, _ = _evaluate(features, close, folds, cfg, "dense", 1, 0)
+    groups = {
+        "generated": [k for k in features if not k.startswith("planted")],
+        "planted": [k for k in features if k.startswith("planted")],
+    }
+    report: dict[str, Any] = {"bars": bars, "horizon": cfg.model_dump(), "passes": {}}
+    for name, (step, radius) in passes.items():
+        grid, grid_s = _evaluate(features, close, folds, cfg, "grid", step, radius)
+        adaptive, adaptive_s = _evaluate(features, close, folds, cfg, "adaptive", step, radius)
+        summary = _compare(list(features), grid, adaptive, dense)
+        summary["call_ratio"] = summary["adaptive_calls"] / summary["grid_calls"]
+        summary["grid_s"], summary["adaptive_s"] = grid_s, adaptive_s
+        summary["by_group"] = {group: _compare(keys, grid, adaptive, dense) for group, keys in groups.items() if keys}
+        report["passes"][name] = summary
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Horizon fits and best-horizon agreement: grid vs adaptive search")
+    parser.add_argument("--bars", type=int, default=3000)
+    parser.add_argument("--candidates", type=int, default=40)
+    parser.add_argument("--planted", type=int, default=20)
+    parser.add_argument("--timeframe", default="1h")
+    args = parser.parse_args()
+    print(json.dumps(run(args.bars, args.candidates, args.planted, args.timeframe), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.db.codec import default_compression
+from app.db.sqlite import Database
+from benchmarks.results_api import _summary
+
+
+def _plots(rng: np.random.Generator, points: int) -> dict[str, dict[str, Any]]:
+    # Shapes follow build_plot_payloads: capped line plots, a horizon heatmap and a threshold sweep matrix.
+    x = list(range(points))
+    line = {
+        "title": "Equity",
+        "type": "line",
+        "x": x,
+        "series": [{"name": f"c{i}", "values": np.cumsum(rng.normal(size=points) * 1e-3).tolist()} for i in range(5)],
+    }
+    overlay = {
+        "title": "Forecast overlay",
+        "type": "line",
+        "x": x,
+        "series": [{"name": name, "values": rng.normal(size=points).tolist()} for name in ("actual", "predicted")],
+    }
+    heatmap = {"title": "Horizon heatmap", "type": "heatmap", "x": list(range(1, 97)), "y": [f"c{i}" for i in range(40)]}
+    heatmap["z"] = rng.random((40, 96)).tolist()
+    sweep = {"title": "Threshold sensitivity", "type": "heatmap", "x": [0.25 * i for i in range(12)], "y": [0.5, 1, 2, 4]}
+    sweep["z"] = rng.normal(size=(4, 12)).tolist()
+    return {"equity_curve": line, "forecast_overlay": overlay, "horizon_heatmap": heatmap, "threshold_sensitivity": sweep}
+
+
+def _time(fn: Callable[[], Any], repeats: int) -> dict[str, float]:
+    fn()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    arr = np.array(samples)
+    return {"p50_ms": float(np.percentile(arr, 50)), "p95_ms": float(np.percentile(arr, 95))}
+
+
+def _measure(root: Path, fmt: str, runs: int, points: int, cube_rows: int, repeats: int) -> dict[str, Any]:
+    path = root / f"{fmt}.sqlite3"
+    db = Database(path, payload_format=fmt)
+    rng = np.random.default_rng(1234)
+    result = _summary("r0", cube_rows).model_dump(mode="json")
+    started = time.perf_counter()
+    for i in range(runs):
+        run_id = f"r{i}"
+        db.create_run(run_id=run_id, config_json={}, config_hash="bench")
+        for plot_id, payload in _plots(rng, points).items():
+            db.save_plot(run_id, plot_id, payload)
+        db.save_result(run_id, {**result, "run_id": run_id})
+    write_ms = (time.perf_counter() - started) * 1000.0
+    db.vacuum()
+    out = {
+        "db_bytes": path.stat().st_size,
+        "write_all_ms": write_ms,
+        "get_plot_equity": _time(lambda: db.get_plot("r0", "equity_curve"), repeats),
+        "get_plot_heatmap": _time(lambda: db.get_plot("r0", "horizon_heatmap"), repeats),
+        "get_result": _time(lambda: db.get_result("r0"), repeats),
+    }
+    db.close()
+    return out
+
+
+def run(runs: int = 20, points: int = 4000, cube_rows: int = 2000, repeats: int = 20) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        json_stats = _measure(root, "json", runs, points, cube_rows, repeats)
+        packed_stats = _measure(root, "packed", runs, points, cube_rows, repeats)
+    return {
+        "runs": runs,
+        "points": points,
+        "cube_rows": cube_rows,
+        "compression": {0: "none", 1: "zlib", 2: "zstd"}[default_compression()],
+        "json": json_stats,
+        "packed": packed_stats,
+        "size_ratio": packed_stats["db_bytes"] / json_stats["db_bytes"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite size and read latency for JSON vs packed plot/result payloads")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--points", type=int, default=4000)
+    parser.add_argument("--cube-rows", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.points, args.cube_rows, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
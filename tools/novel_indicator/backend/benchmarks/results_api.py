@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.api.compression import encode_body, zstandard
+from app.api.responses import PayloadCache
+from app.core.container import get_db, get_payload_cache
+from app.core.schemas import (
+    AssetRecommendation,
+    IndicatorCubeRow,
+    IndicatorSpec,
+    ResultSummary,
+    ScoreCard,
+)
+from app.db.sqlite import Database
+from app.main import app
+
+
+def _summary(run_id: str, rows: int, seed: int = 1234) -> ResultSummary:
+    rng = np.random.default_rng(seed)
+    score = ScoreCard(
+        normalized_rmse=0.9,
+        normalized_mae=0.8,
+        composite_error=0.85,
+        directional_hit_rate=0.55,
+        pnl_total=0.02,
+        max_drawdown=-0.01,
+        turnover=0.1,
+        stability_score=3.0,
+    )
+    rec = AssetRecommendation(
+        symbol="BTCUSDT",
+        timeframe="1h",
+        best_horizon=12,
+        indicator_combo=[IndicatorSpec(indicator_id="c1", expression="ema(logret,8)", complexity=2)],
+        score=score,
+    )
+    errors = rng.random(rows)
+    cube = [
+        IndicatorCubeRow(
+            symbol=f"SYM{i % 20}USDT",
+            timeframe=("5m", "1h", "4h")[i % 3],
+            indicator_id=f"c{i // 96}",
+            expression=f"ema(sub(close,sma(close,{5 + i % 40})),{3 + i % 17})",
+            family="ema",
+            complexity=4,
+            novelty_score=float(errors[i] * 0.5),
+            horizon_bar=1 + i % 96,
+            horizon_time_ms=(1 + i % 96) * 3_600_000,
+            normalized_rmse=float(errors[i]),
+            normalized_mae=float(errors[i] * 0.9),
+            calibration_error=0.01,
+            composite_error=float(errors[i] * 0.95),
+            directional_hit_rate=0.5,
+            pnl_total=0.0,
+            max_drawdown=0.0,
+            turnover=0.0,
+            stability_score=1.0,
+        )
+        for i in range(rows)
+    ]
+    return ResultSummary(
+        run_id=run_id,
+        universal_recommendation=rec,
+        per_asset_recommendations=[rec] * 20,
+        indicator_cube=cube,
+        generated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def _time(fn: Callable[[], Any], repeats: int) -> dict[str, float]:
+    fn()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    arr = np.array(samples)
+    return {"p50_ms": float(np.percentile(arr, 50)), "p95_ms": float(np.percentile(arr, 95))}
+
+
+def run(rows: int = 20_000, repeats: int = 20) -> dict[str, Any]:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.sqlite3")
+        db.create_run(run_id="bench", config_json={}, config_hash="bench")
+        db.save_result("bench", _summary("bench", rows).model_dump(mode="json"))
+        cache = PayloadCache()
+        app.dependency_overrides[get_db] = lambda: db
+        app.dependency_overrides[get_payload_cache] = lambda: cache
+        try:
+            with TestClient(app) as client:
+                url = "/api/runs/bench/results"
+
+                def legacy() -> Any:
+                    # The previous handler: parse, validate and re-serialize on every request.
+                    return ResultSummary.model_validate(db.get_result("bench")).model_dump_json()
+
+                def cold() -> Any:
+                    cache.clear()
+                    return client.get(url, headers={"Accept-Encoding": "identity"})
+
+                def warm() -> Any:
+                    return client.get(url, headers={"Accept-Encoding": "identity"})
+
+                def warm_gzip() -> Any:
+                    return client.get(url, headers={"Accept-Encoding": "gzip"})
+
+                etag = warm().headers["etag"]
+
+                def not_modified() -> Any:
+                    return client.get(url, headers={"If-None-Match": etag})
+
+                body = warm().content
+                result = {
+                    "cube_rows": rows,
+                    "bytes": {"identity": len(body), "gzip": len(encode_body(body, "gzip"))},
+                    "legacy_handler": _time(legacy, repeats),
+                    "cold_cache": _time(cold, repeats),
+                    "warm_cache": _time(warm, repeats),
+                    "warm_cache_gzip": _time(warm_gzip, repeats),
+                    "not_modified": _time(not_modified, repeats),
+                }
+                if zstandard is not None:
+                    result["bytes"]["zstd"] = len(encode_body(body, "zstd"))
+                    result["warm_cache_zstd"] = _time(lambda: client.get(url, headers={"Accept-Encoding": "zstd"}), repeats)
+        finally:
+            app.dependency_overrides.clear()
+            db.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GET /runs/{id}/results latency and payload size for a large summary")
+    parser.add_argument("--rows", type=int, default=20_000, help="Inline indicator cube rows in the summary")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from app.api.routes_runs import _row_to_run_status, list_run_summaries, list_runs
+from app.core.schemas import RunStageEnum, RunStatusEnum
+from app.db.sqlite import Database
+
+
+def _seed(db: Database, runs: int, logs_per_run: int) -> None:
+    statuses = [RunStatusEnum.completed, RunStatusEnum.failed, RunStatusEnum.running, RunStatusEnum.queued]
+    with db._lock, db._conn:
+        for i in range(runs):
+            run_id = f"run{i:06d}"
+            created = f"2026-01-01T00:00:00.{i:06d}+00:00"
+            db._conn.execute(
+                """
+                INSERT INTO runs (run_id, status, stage, progress, created_at, updated_at, config_json, config_hash)
+                VALUES (?, ?, ?, 1.0, ?, ?, '{}', 'bench')
+                """,
+                (run_id, statuses[i % len(statuses)].value, RunStageEnum.finished.value, created, created),
+            )
+            db._conn.executemany(
+                "INSERT INTO run_logs (run_id, timestamp, stage, message) VALUES (?, ?, ?, ?)",
+                [(run_id, created, RunStageEnum.discovery.value, f"log line {j}") for j in range(logs_per_run)],
+            )
+
+
+def _time(fn: Callable[[], Any], repeats: int) -> dict[str, float]:
+    fn()
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    arr = np.array(samples)
+    return {"p50_ms": float(np.percentile(arr, 50)), "p95_ms": float(np.percentile(arr, 95))}
+
+
+def run(runs: int = 10_000, logs_per_run: int = 20, page_size: int = 100, repeats: int = 30) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(Path(tmp) / "bench.sqlite3")
+        _seed(db, runs, logs_per_run)
+
+        def per_run() -> Any:
+            # GET /runs before: two queries per run.
+            return [_row_to_run_status(db, row["run_id"]) for row in db.list_runs(limit=100)]
+
+        def full() -> Any:
+            # GET /runs: the newest 100 runs with every log line, in two queries.
+            return list_runs(db=db)
+
+        def summary() -> Any:
+            return list_run_summaries(limit=page_size, cursor=None, status=None, include_logs=False, db=db)
+
+        def filtered_deep_page() -> Any:
+            page = list_run_summaries(limit=page_size, cursor=None, status=RunStatusEnum.failed, include_logs=False, db=db)
+            return list_run_summaries(
+                limit=page_size, cursor=page.next_cursor, status=RunStatusEnum.failed, include_logs=False, db=db
+            )
+
+        result = {
+            "runs": runs,
+            "logs_per_run": logs_per_run,
+            "page_size": page_size,
+            "per_run": _time(per_run, repeats),
+            "full": _time(full, repeats),
+            "summary": _time(summary, repeats),
+            "summary_status_second_page": _time(filtered_deep_page, repeats),
+        }
+        db.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GET /runs and GET /runs/summaries latency with a large run table")
+    parser.add_argument("--runs", type=int, default=10_000)
+    parser.add_argument("--logs-per-run", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=30)
+    args = parser.parse_args()
+    print(json.dumps(run(args.runs, args.logs_per_run, args.page_size, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+# Import plus first /api/health response in a fresh interpreter; FastAPI itself accounts for most of it.
+STARTUP_BUDGET_SECONDS = 3.0
+# Loaded on first use by the services that need them, never by importing the app.
+HEAVY_MODULES = ("polars", "numpy", "duckdb", "pyarrow", "xhtml2pdf", "reportlab", "jinja2", "requests")
+
+_PROBE = """
+import asyncio, json, sys, time
+
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def health():
+    sent = []
+    scope = {"type": "http", "method": "GET", "path": "/api/health", "raw_path": b"/api/health", "query_string": b"",
+             "headers": [], "http_version": "1.1", "scheme": "http", "server": ("probe", 80), "client": ("probe", 1),
+             "root_path": ""}
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        sent.append(message)
+    await app.main.app(scope, receive, send)
+    return sent[0]["status"]
+
+status = asyncio.run(health())
+done = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "first_health_s": done - imported,
+    "health_status": status,
+    "loaded": [name for name in HEAVY if name in sys.modules],
+}))
+"""
+
+
+def _parse_importtime(stderr: str, top: int) -> list[dict[str, Any]]:
+    rows = []
+    for line in stderr.splitlines():
+        parts = [part.strip() for part in line.removeprefix("import time:").split("|")]
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[0].isdigit():
+            continue
+        self_us, cumulative_us, name = parts
+        rows.append({"module": name, "self_ms": int(self_us) / 1000.0, "cumulative_ms": int(cumulative_us) / 1000.0})
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+
+def profile_startup(top: int = 15) -> dict[str, Any]:
+    # Runs in a fresh interpreter so modules already imported by the caller do not hide the real cost.
+    probe = f"HEAVY = {HEAVY_MODULES!r}\n{_PROBE}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["total_s"] = result["import_s"] + result["first_health_s"]
+    result["budget_s"] = STARTUP_BUDGET_SECONDS
+    result["slowest_imports"] = _parse_importtime(proc.stderr, top)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold import time of app.main and latency of the first health check")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports (cumulative) to report")
+    args = parser.parse_args()
+    print(json.dumps(profile_startup(args.top), indent=2))
+
+
+if __name__ == "__main__":
+    main()
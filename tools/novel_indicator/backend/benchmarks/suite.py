@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import platform
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+import polars as pl
+
+from app.core.schemas import RunConfig
+from app.research.backtest.engine import run_backtest_sweep, sweep_grid
+from app.research.cv import build_purged_walk_forward_folds
+from app.research.indicators.dsl import (
+    AdaptiveSmoothNode,
+    BinaryNode,
+    FieldNode,
+    Node,
+    RollingNode,
+    UnaryNode,
+    sanitize_block,
+    sanitize_series,
+)
+from app.research.indicators.evaluator import (
+    EvalCache,
+    _score_horizon,
+    build_context,
+    evaluate_candidate_horizons,
+)
+from app.research.indicators.generator import (
+    BINARY_OPS,
+    ROLLING_OPS,
+    UNARY_OPS,
+    IndicatorGenerator,
+)
+from app.research.indicators.novelty import NoveltyFilter
+from app.research.search.optimizer import run_indicator_search
+from benchmarks.synthetic import TIMEFRAME_BARS, synthetic_ohlcv
+
+SEED = 1234
+
+
+@dataclass
+class Case:
+    name: str
+    # Builds the timed callable from a bar frame; setup cost is excluded from the measurement.
+    setup: Callable[[pl.DataFrame], Callable[[], Any]]
+    repeats: int = 7
+    timeframes: tuple[str, ...] = ("5m", "1h", "4h")
+
+
+def benchmark_config() -> RunConfig:
+    cfg = RunConfig(random_seed=SEED)
+    cfg.search.candidate_pool_size = 48
+    cfg.search.stage_a_keep = 20
+    cfg.search.stage_b_keep = 8
+    cfg.search.tuning_trials = 2
+    cfg.horizon.max_bar = 96
+    cfg.cv.folds = 4
+    return cfg
+
+
+def _node_case(node: Node) -> Callable[[pl.DataFrame], Callable[[], Any]]:
+    def setup(frame: pl.DataFrame) -> Callable[[], Any]:
+        ctx = build_context(frame)
+        return lambda: node.eval(ctx)
+
+    return setup
+
+
+def _sanitize_case(frame: pl.DataFrame) -> Callable[[], Any]:
+    rng = np.random.default_rng(SEED)
+    x = np.log(frame["close"].to_numpy())
+    x[: 55] = np.nan
+    x[rng.random(len(x)) < 0.05] = np.nan
+    x[rng.random(len(x)) < 0.001] = np.inf
+    return lambda: sanitize_series(x)
+
+
+def _sanitize_block_case(frame: pl.DataFrame) -> Callable[[], Any]:
+    ctx = build_context(frame)
+    pool = IndicatorGenerator(seed=SEED).generate_pool(size=32)
+    block = np.vstack([np.broadcast_to(cand.root.eval(ctx), (len(frame),)) for cand in pool])
+    return lambda: sanitize_block(block)
+
+
+def _eval_inputs(frame: pl.DataFrame) -> tuple[np.ndarray, np.ndarray, list[Any]]:
+    cfg = benchmark_config()
+    ctx = build_context(frame)
+    feature = sanitize_series(RollingNode("ema", FieldNode("logret"), 13).eval(ctx))
+    folds = build_purged_walk_forward_folds(
+        n_rows=len(feature),
+        folds=cfg.cv.folds,
+        max_horizon=cfg.horizon.max_bar,
+        purge_bars=cfg.cv.purge_bars,
+        embargo_bars=cfg.cv.embargo_bars,
+    )
+    return feature, ctx["close"], folds
+
+
+def _score_horizon_case(frame: pl.DataFrame) -> Callable[[], Any]:
+    feature, close, folds = _eval_inputs(frame)
+    return lambda: _score_horizon("bench", feature, close, folds, 24, cache=None)
+
+
+def _horizons_case(frame: pl.DataFrame, mode: str = "grid") -> Callable[[], Any]:
+    feature, close, folds = _eval_inputs(frame)
+    cfg = benchmark_config()
+
+    def run() -> Any:
+        return evaluate_candidate_horizons(
+            indicator_id="bench",
+            feature=feature,
+            close=close,
+            folds=folds,
+            horizon_min=cfg.horizon.min_bar,
+            horizon_max=cfg.horizon.max_bar,
+            coarse_step=cfg.horizon.coarse_step,
+            refine_radius=cfg.horizon.refine_radius,
+            cache=EvalCache(),
+            mode=mode,
+        )
+
+    return run
+
+
+def _novelty_case(frame: pl.DataFrame) -> Callable[[], Any]:
+    ctx = build_context(frame)
+    pool = IndicatorGenerator(seed=SEED).generate_pool(size=60)
+    series = [sanitize_series(cand.root.eval(ctx)) for cand in pool]
+
+    def run() -> int:
+        novelty = NoveltyFilter(similarity_threshold=0.82, collinearity_threshold=0.94)
+        accepted = 0
+        for cand, feature in zip(pool, series):
+            if novelty.is_novel_signature(cand) and not novelty.is_collinear(feature):
+                novelty.accept(cand, feature)
+                accepted += 1
+        return accepted
+
+    return run
+
+
+def _backtest_sweep_case(frame: pl.DataFrame) -> Callable[[], Any]:
+    rng = np.random.default_rng(SEED)
+    close = frame["close"].to_numpy()
+    y_true = np.roll(close, -12)[:-12]
+    close_ref = close[:-12]
+    y_pred = close_ref + 0.3 * (y_true - close_ref) + rng.normal(0.0, 0.002, len(close_ref)) * close_ref
+    cfg = benchmark_config().backtest
+    thresholds, cost_bps = sweep_grid(cfg.signal_threshold, cfg.fee_bps, cfg.slippage_bps)
+    return lambda: run_backtest_sweep(y_true, y_pred, close_ref, thresholds, cost_bps)
+
+
+def _search_case(frame: pl.DataFrame) -> Callable[[], Any]:
+    cfg = benchmark_config()
+    return lambda: run_indicator_search(frame, "BENCHUSDT", "1h", cfg)
+
+
+def _dsl_cases() -> list[Case]:
+    close = FieldNode("close")
+    logret = FieldNode("logret")
+    cases = [Case(f"dsl.unary.{op}", _node_case(UnaryNode(op, logret))) for op in UNARY_OPS]
+    cases += [Case(f"dsl.binary.{op}", _node_case(BinaryNode(op, close, FieldNode("hlc3")))) for op in BINARY_OPS]
+    cases += [Case(f"dsl.rolling.{op}", _node_case(RollingNode(op, close, 21))) for op in ROLLING_OPS]
+    cases.append(Case("dsl.adaptive", _node_case(AdaptiveSmoothNode(close, 5, 34)), repeats=3))
+    return cases
+
+
+def all_cases() -> list[Case]:
+    return _dsl_cases() + [
+        Case("sanitize_series", _sanitize_case),
+        Case("sanitize_block", _sanitize_block_case, repeats=3),
+        Case("score_horizon", _score_horizon_case),
+        Case("evaluate_candidate_horizons", _horizons_case, repeats=3),
+        Case("evaluate_candidate_horizons.adaptive", lambda frame: _horizons_case(frame, "adaptive"), repeats=3),
+        Case("novelty_filter", _novelty_case, repeats=3),
+        Case("backtest_sweep", _backtest_sweep_case, repeats=3),
+        Case("run_indicator_search", _search_case, repeats=1, timeframes=("1h",)),
+    ]
+
+
+def run_suite(
+    name_filter: str | None = None,
+    timeframes: tuple[str, ...] = ("5m", "1h", "4h"),
+    scale: float = 1.0,
+    log: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    frames: dict[str, pl.DataFrame] = {}
+    results: dict[str, dict[str, float | int]] = {}
+    for case in all_cases():
+        if name_filter and name_filter not in case.name:
+            continue
+        for tf in case.timeframes:
+            if tf not in timeframes:
+                continue
+            if tf not in frames:
+                frames[tf] = synthetic_ohlcv(tf, bars=max(1_000, int(TIMEFRAME_BARS[tf] * scale)), seed=SEED)
+            fn = case.setup(frames[tf])
+            samples = []
+            for _ in range(case.repeats):
+                started = time.perf_counter()
+                fn()
+                samples.append((time.perf_counter() - started) * 1000.0)
+            key = f"{case.name}@{tf}"
+            results[key] = {"min_ms": min(samples), "median_ms": statistics.median(samples), "repeats": case.repeats}
+            if log is not None:
+                log(f"{key:<40} {results[key]['min_ms']:>10.3f} ms")
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "polars": pl.__version__,
+            "machine": platform.machine(),
+            "scale": scale,
+            "bars": {tf: len(frame) for tf, frame in frames.items()},
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float) -> list[dict[str, Any]]:
+    # Compares best-of-N times; a case regresses when it is more than `threshold` slower than baseline.
+    rows = []
+    for key, cur in sorted(current["results"].items()):
+        base = baseline["results"].get(key)
+        if base is None:
+            rows.append({"case": key, "baseline_ms": None, "current_ms": cur["min_ms"], "ratio": None, "status": "new"})
+            continue
+        ratio = cur["min_ms"] / max(base["min_ms"], 1e-9)
+        if ratio > 1.0 + threshold:
+            status = "regressed"
+        elif ratio < 1.0 / (1.0 + threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"case": key, "baseline_ms": base["min_ms"], "current_ms": cur["min_ms"], "ratio": ratio, "status": status})
+    for key in sorted(set(baseline["results"]) - set(current["results"])):
+        rows.append({"case": key, "baseline_ms": baseline["results"][key]["min_ms"], "current_ms": None, "ratio": None, "status": "missing"})
+    return rows
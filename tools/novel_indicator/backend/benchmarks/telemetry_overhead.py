@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from app.research.telemetry import LiveTelemetry
+
+
+def _measure(updates: int, synchronous: bool, **kwargs: Any) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        telemetry = LiveTelemetry(run_id="bench", run_dir=Path(tmp), tick_seconds=1.0, **kwargs)
+        telemetry.start()
+        started = time.perf_counter()
+        for i in range(updates):
+            telemetry.update(
+                stage="discovery",
+                working_on=f"candidate {i}",
+                achieved=f"{i} evaluated",
+                remaining=f"{updates - i} left",
+                overall_done=float(i),
+                overall_total=float(updates),
+                stage_done=float(i),
+                stage_total=float(updates),
+            )
+            if synchronous:
+                telemetry.flush()
+        elapsed = time.perf_counter() - started
+        telemetry.stop(final_status="completed", final_message="bench")
+        lines = sum(1 for _ in (Path(tmp) / "telemetry.jsonl").open("rb"))
+    return {"us_per_update": elapsed / updates * 1e6, "snapshots_written": lines}
+
+
+def run(updates: int = 5000) -> dict[str, Any]:
+    return {
+        "updates": updates,
+        # Every update emits, prints and appends to both files before returning (the previous behaviour).
+        "synchronous": _measure(updates, synchronous=True, console=True, min_update_seconds=0.0, system_sample_seconds=0.0),
+        "rate_limited": _measure(updates, synchronous=False, console=True),
+        "rate_limited_quiet": _measure(updates, synchronous=False, console=False),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-update() overhead of LiveTelemetry")
+    parser.add_argument("--updates", type=int, default=5000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.updates), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import polars as pl
+import pytest
+
+
+def random_walk_bars(n: int = 400, seed: int = 7, step_ms: int = 60_000, start: int = 0) -> pl.DataFrame:
+    # Seeded geometric random walk with consistent OHLC; `start` shifts the timestamps by whole bars.
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+    open_ = close * (1.0 + rng.normal(0.0, 0.002, n))
+    high = np.maximum(open_, close) * (1.0 + np.abs(rng.normal(0.0, 0.003, n)))
+    low = np.minimum(open_, close) * (1.0 - np.abs(rng.normal(0.0, 0.003, n)))
+    volume = rng.uniform(100.0, 1000.0, n)
+    return pl.DataFrame(
+        {
+            "timestamp": (np.arange(n, dtype=np.int64) + start) * step_ms,
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+        }
+    )
+
+
+@pytest.fixture
+def bars() -> Callable[..., pl.DataFrame]:
+    return random_walk_bars
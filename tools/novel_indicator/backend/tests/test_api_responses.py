@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.api.compression import CompressionMiddleware, accepts_encoding
+from app.api.responses import PayloadCache
+from app.api.routes_runs import _row_to_run_status
+from app.core.container import get_db, get_payload_cache
+from app.core.schemas import (
+    AssetRecommendation,
+    IndicatorSpec,
+    ResultSummary,
+    RunStageEnum,
+    ScoreCard,
+)
+from app.db.sqlite import Database
+from app.main import app
+
+
+def _summary(pnl: float, assets: int = 40) -> dict:
+    score = ScoreCard(
+        normalized_rmse=0.9,
+        normalized_mae=0.8,
+        composite_error=0.85,
+        directional_hit_rate=0.55,
+        pnl_total=pnl,
+        max_drawdown=-0.01,
+        turnover=0.1,
+        stability_score=3.0,
+    )
+    rec = AssetRecommendation(
+        symbol="BTCUSDT",
+        timeframe="1h",
+        best_horizon=12,
+        indicator_combo=[IndicatorSpec(indicator_id="c1", expression="ema(logret,8)", complexity=2)],
+        score=score,
+    )
+    return ResultSummary(
+        run_id="r1",
+        universal_recommendation=rec,
+        per_asset_recommendations=[rec] * assets,
+        generated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    ).model_dump(mode="json")
+
+
+def test_results_are_served_from_cached_bytes_with_etag(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3")
+    db.create_run(run_id="r1", config_json={}, config_hash="h")
+    db.save_result("r1", _summary(0.02))
+    cache = PayloadCache()
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_payload_cache] = lambda: cache
+    try:
+        with TestClient(app) as client:
+            first = client.get("/api/runs/r1/results", headers={"Accept-Encoding": "gzip"})
+            etag = first.headers["etag"]
+            unchanged = client.get("/api/runs/r1/results", headers={"If-None-Match": etag})
+            plain = client.get("/api/runs/r1/results", headers={"Accept-Encoding": "identity"})
+
+            db.save_result("r1", _summary(0.05))
+            changed = client.get("/api/runs/r1/results", headers={"If-None-Match": etag})
+            missing = client.get("/api/runs/nope/results")
+    finally:
+        app.dependency_overrides.clear()
+        db.close()
+
+    assert first.status_code == 200
+    assert first.headers["content-encoding"] == "gzip"
+    assert ResultSummary.model_validate(first.json()).universal_recommendation.score.pnl_total == 0.02
+    assert unchanged.status_code == 304 and unchanged.content == b""
+    assert "content-encoding" not in plain.headers
+    assert json.loads(plain.content) == first.json()
+    assert changed.status_code == 200 and changed.headers["etag"] != etag
+    assert changed.json()["universal_recommendation"]["score"]["pnl_total"] == 0.05
+    assert missing.status_code == 404
+
+
+def test_plot_etag_and_default_orjson_encoding(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3")
+    db.create_run(run_id="r1", config_json={}, config_hash="h")
+    db.save_plot("r1", "p", {"title": "p", "type": "line", "x": [0, 1, 2], "series": [{"name": "s", "values": [1.0, float("nan"), 2.0]}]})
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_payload_cache] = lambda: PayloadCache()
+    try:
+        with TestClient(app) as client:
+            plot = client.get("/api/runs/r1/plots/p")
+            again = client.get("/api/runs/r1/plots/p", headers={"If-None-Match": f'W/{plot.headers["etag"]}'})
+    finally:
+        app.dependency_overrides.clear()
+        db.close()
+
+    assert plot.json()["payload"]["series"][0]["values"] == [1.0, None, 2.0]
+    assert plot.json()["title"] == "p"
+    assert again.status_code == 304
+
+
+def test_accept_encoding_honours_zero_quality() -> None:
+    assert accepts_encoding("gzip, deflate, br, zstd", "zstd")
+    assert accepts_encoding("zstd;q=0.5", "zstd")
+    assert not accepts_encoding("gzip, zstd;q=0", "zstd")
+    assert not accepts_encoding("identity", "gzip")
+
+
+def test_compression_streams_gzip_and_skips_small_and_event_stream_bodies() -> None:
+    chunks = [b"x" * 700, b"y" * 700, b"z" * 700]
+    mini = FastAPI()
+    mini.add_middleware(CompressionMiddleware, minimum_size=1024)
+    mini.get("/stream")(lambda: StreamingResponse(iter(chunks), media_type="text/plain"))
+    mini.get("/events")(lambda: StreamingResponse(iter(chunks), media_type="text/event-stream"))
+    mini.get("/small")(lambda: PlainTextResponse("tiny"))
+
+    with TestClient(mini) as client:
+        stream = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        events = client.get("/events", headers={"Accept-Encoding": "gzip"})
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    assert stream.headers["content-encoding"] == "gzip"
+    assert "content-length" not in stream.headers
+    assert stream.headers["vary"] == "Accept-Encoding"
+    assert stream.content == b"".join(chunks)
+    assert "content-encoding" not in events.headers and events.content == b"".join(chunks)
+    assert "content-encoding" not in small.headers and small.text == "tiny"
+
+
+def test_run_listing_keeps_its_shape_and_pages_summaries_separately(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3")
+    for run_id in ("a", "b", "c"):
+        db.create_run(run_id=run_id, config_json={}, config_hash="h")
+        db.add_log(run_id, RunStageEnum.created, f"created {run_id}")
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        with TestClient(app) as client:
+            listing = client.get("/api/runs").json()
+            first = client.get("/api/runs/summaries", params={"limit": 2}).json()
+            rest = client.get("/api/runs/summaries", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        per_run = [_row_to_run_status(db, row["run_id"]).model_dump(mode="json") for row in db.list_runs(limit=100)]
+    finally:
+        app.dependency_overrides.clear()
+        db.close()
+
+    assert listing == per_run
+    assert all("last_log" not in run and [log["message"] for log in run["logs"]] == [f"created {run['run_id']}"] for run in listing)
+    assert [run["run_id"] for run in first["runs"] + rest["runs"]] == [run["run_id"] for run in listing]
+    assert first["runs"][0]["last_log"]["message"] == f"created {first['runs'][0]['run_id']}"
+    assert rest["next_cursor"] is None
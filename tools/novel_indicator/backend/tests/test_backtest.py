@@ -2,7 +2,13 @@
 
 import numpy as np
 
-from app.research.backtest.engine import run_backtest_from_forecasts
+from app.research.backtest.engine import (
+    run_backtest_batch,
+    run_backtest_from_forecasts,
+    run_backtest_sweep,
+    sweep_grid,
+)
+from app.research.indicators.evaluator import HorizonPredictions, stack_predictions
 
 
 def test_backtest_returns_metrics() -> None:
@@ -23,3 +29,45 @@ def test_backtest_returns_metrics() -> None:
     assert 'max_drawdown' in result
     assert 'turnover' in result
     assert isinstance(result['equity_curve'], list)
+
+
+def test_backtest_sweep_matches_single_runs() -> None:
+    rng = np.random.default_rng(5)
+    close_ref = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 400)))
+    y_true = close_ref * (1.0 + rng.normal(0.0, 0.004, 400))
+    y_pred = close_ref * (1.0 + 0.5 * (y_true / close_ref - 1.0) + rng.normal(0.0, 0.002, 400))
+    thresholds, cost_bps = sweep_grid(threshold=0.0003, fee_bps=7.0, slippage_bps=5.0)
+    assert 0.0003 in thresholds
+    assert 12.0 in cost_bps
+
+    sweep = run_backtest_sweep(y_true, y_pred, close_ref, thresholds, cost_bps)
+    assert sweep.pnl_total.shape == (len(thresholds), len(cost_bps))
+    for i, thr in enumerate(thresholds):
+        for j, cost in enumerate(cost_bps):
+            single = run_backtest_from_forecasts(y_true, y_pred, close_ref, fee_bps=cost, slippage_bps=0.0, threshold=thr)
+            assert np.isclose(sweep.pnl_total[i, j], single['pnl_total'])
+            assert np.isclose(sweep.max_drawdown[i, j], single['max_drawdown'])
+            assert np.isclose(sweep.turnover[i, j], single['turnover'])
+
+    best = sweep.best_operating_point(12.0)
+    assert best['cost_bps'] == 12.0
+    assert best['pnl_total'] == float(sweep.pnl_total[:, list(cost_bps).index(12.0)].max())
+
+
+def test_backtest_batch_matches_single_runs_on_ragged_rows() -> None:
+    rng = np.random.default_rng(9)
+    rows = []
+    for n in (300, 240, 1, 280):
+        close_ref = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n)))
+        y_true = close_ref * (1.0 + rng.normal(0.0, 0.004, n))
+        y_pred = close_ref * (1.0 + rng.normal(0.0, 0.003, n))
+        rows.append(HorizonPredictions(y_true=y_true, y_pred=y_pred, close_ref=close_ref))
+    stacked = stack_predictions(rows)
+    assert stacked.y_true.shape == (4, 300)
+
+    batch = run_backtest_batch(stacked.y_true, stacked.y_pred, stacked.close_ref, fee_bps=7.0, slippage_bps=5.0, threshold=0.0005)
+    for k, row in enumerate(rows):
+        single = run_backtest_from_forecasts(row.y_true, row.y_pred, row.close_ref, fee_bps=7.0, slippage_bps=5.0, threshold=0.0005)
+        assert np.isclose(batch['pnl_total'][k], single['pnl_total'])
+        assert np.isclose(batch['max_drawdown'][k], single['max_drawdown'])
+        assert np.isclose(batch['turnover'][k], single['turnover'])
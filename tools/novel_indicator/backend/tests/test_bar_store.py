@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+from app.data.storage import ArtifactStore
+from app.research.indicators.dsl import FieldNode, sanitize_series
+from app.research.indicators.evaluator import build_context, build_context_from_columns
+
+
+def test_bar_columns_map_read_only_without_copy(tmp_path: Path) -> None:
+    n = 256
+    close = np.linspace(10.0, 20.0, n)
+    frame = pl.DataFrame(
+        {
+            "timestamp": np.arange(n, dtype=np.int64) * 60_000,
+            "open": close,
+            "high": close + 0.5,
+            "low": close - 0.5,
+            "close": close,
+            "volume": np.full(n, 3.0),
+        }
+    )
+    store = ArtifactStore(tmp_path)
+    expected = build_context(frame)
+    store.save_bar_columns("run1", "BTCUSDT", "1h", {"timestamp": frame["timestamp"].to_numpy(), **expected})
+
+    assert store.has_bar_columns("run1", "BTCUSDT", "1h")
+    columns = store.load_bar_columns("run1", "BTCUSDT", "1h")
+    ctx = build_context_from_columns(columns)
+
+    for name, values in expected.items():
+        assert isinstance(ctx[name], np.memmap)
+        assert not ctx[name].flags.writeable
+        np.testing.assert_array_equal(ctx[name], values)
+    assert columns["timestamp"].dtype == np.int64
+
+    feature = sanitize_series(FieldNode("close").eval(ctx))
+    np.testing.assert_array_equal(feature, close)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import numpy as np
+
+from benchmarks.suite import compare, run_suite
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def test_synthetic_ohlcv_is_seeded_and_consistent() -> None:
+    first = synthetic_ohlcv("4h", bars=2_000, seed=9)
+    second = synthetic_ohlcv("4h", bars=2_000, seed=9)
+    assert first.equals(second)
+    assert not first.equals(synthetic_ohlcv("4h", bars=2_000, seed=10))
+
+    high, low = first["high"].to_numpy(), first["low"].to_numpy()
+    assert np.all(high >= np.maximum(first["open"].to_numpy(), first["close"].to_numpy()))
+    assert np.all(low <= np.minimum(first["open"].to_numpy(), first["close"].to_numpy()))
+    assert np.all(np.diff(first["timestamp"].to_numpy()) == 14_400_000)
+
+
+def test_compare_flags_regressions_beyond_threshold() -> None:
+    current = run_suite(name_filter="dsl.unary.abs", timeframes=("4h",), scale=0.1)
+    assert set(current["results"]) == {"dsl.unary.abs@4h"}
+
+    baseline = {"results": {"dsl.unary.abs@4h": {"min_ms": current["results"]["dsl.unary.abs@4h"]["min_ms"] / 2}, "gone@1h": {"min_ms": 1.0}}}
+    rows = {row["case"]: row for row in compare(baseline, current, threshold=0.15)}
+    assert rows["dsl.unary.abs@4h"]["status"] == "regressed"
+    assert rows["gone@1h"]["status"] == "missing"
+    assert compare(current, current, threshold=0.15)[0]["status"] == "ok"
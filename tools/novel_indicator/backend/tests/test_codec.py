@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import numpy as np
+
+from app.db.codec import MAGIC, decode_payload, pack_payload, unpack_payload
+from app.db.migrate import main as migrate_main
+from app.db.sqlite import Database
+
+
+def _plot(seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    return {
+        "title": "Equity",
+        "type": "line",
+        "x": list(range(500)),
+        "series": [
+            {"name": "strategy", "values": np.cumsum(rng.normal(size=500)).tolist()},
+            {"name": "gappy", "values": [None if i % 7 == 0 else float(i) for i in range(300)]},
+        ],
+        "matrix": rng.random((6, 12)).round(4).tolist(),
+        "flags": [True, False] * 6,
+        "mixed": [1, 2.5] * 6,
+        "labels": ["a"] * 10,
+    }
+
+
+def test_packed_payload_round_trips_exactly() -> None:
+    payload = _plot(0)
+    payload["nan_tail"] = [1.0] * 8 + [math.nan]
+    payload["nan_scalar"] = math.nan
+    blob = pack_payload(payload)
+    assert blob.startswith(MAGIC)
+    restored = unpack_payload(blob)
+    assert math.isnan(restored.pop("nan_tail")[-1]) and math.isnan(restored.pop("nan_scalar"))
+    payload.pop("nan_tail")
+    payload.pop("nan_scalar")
+    assert restored == payload
+    assert type(restored["x"][0]) is int and restored["flags"][0] is True
+    assert restored["series"][1]["values"][0] is None
+    assert decode_payload('{"a": [1, 2]}') == {"a": [1, 2]}
+
+
+def test_packed_storage_and_migration(tmp_path: Path) -> None:
+    path = tmp_path / "ni.sqlite3"
+    db = Database(path)
+    for i in range(3):
+        db.create_run(run_id=f"r{i}", config_json={}, config_hash="h")
+        db.save_plot(f"r{i}", "equity", _plot(i))
+        db.save_result(f"r{i}", {"run_id": f"r{i}", "curve": _plot(i)["series"][0]["values"]})
+    before = db.get_result_version("r0")
+    assert isinstance(db.get_plot_raw("r0", "equity"), str)
+    assert db.migrate_payloads("packed") == {"results": 3, "plots": 3}
+    assert isinstance(db.get_plot_raw("r0", "equity"), bytes)
+    assert db.get_plot("r1", "equity") == _plot(1)
+    assert db.get_result_version("r0") == before
+    assert db.migrate_payloads("packed") == {"results": 0, "plots": 0}
+    db.close()
+
+    packed = Database(path, payload_format="packed")
+    packed.create_run(run_id="r9", config_json={}, config_hash="h")
+    packed.save_plot("r9", "equity", _plot(9))
+    assert isinstance(packed.get_plot_raw("r9", "equity"), bytes)
+    assert packed.get_plot("r9", "equity") == _plot(9)
+    packed.close()
+
+    assert migrate_main(["--to", "json", "--db", str(path)]) == 0
+    db = Database(path)
+    assert isinstance(db.get_plot_raw("r9", "equity"), str)
+    assert db.get_plot("r9", "equity") == _plot(9)
+    db.close()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import polars as pl
+
+from app.core.schemas import RunConfig
+from app.research.cross_asset import evaluate_cross_asset, stack_contexts
+from app.research.indicators.dsl import FieldNode, RollingNode
+from app.research.indicators.evaluator import build_context
+from app.research.ranking import _build_cross_asset_recommendation
+from app.research.search.candidate import CandidateIndicator
+
+
+def _context(bars: Callable[..., pl.DataFrame], seed: int, n: int, offset: int) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    frame = bars(n, seed=seed, step_ms=3_600_000, start=offset)
+    return frame["timestamp"].to_numpy(), build_context(frame)
+
+
+def test_cross_asset_scores_every_symbol_on_aligned_stack(bars: Callable[..., pl.DataFrame]) -> None:
+    stack = stack_contexts("1h", {"AAAUSDT": _context(bars, 1, 1400, 0), "BBBUSDT": _context(bars, 2, 1400, 50)})
+    assert stack.ctx["close"].shape == (2, 1350)
+
+    cfg = RunConfig()
+    cfg.horizon.max_bar = 40
+    cfg.cv.folds = 3
+    combos = [
+        ([CandidateIndicator("a", RollingNode("ema", FieldNode("logret"), 5), 2)], 4, "1h"),
+        ([CandidateIndicator("b", RollingNode("std", FieldNode("close"), 21), 2)], 12, "1h"),
+    ]
+    scores = evaluate_cross_asset([stack], combos, cfg)
+
+    assert len(scores) == 2
+    for score in scores:
+        assert set(score.per_asset) == {"AAAUSDT:1h", "BBBUSDT:1h"}
+
+    universal = _build_cross_asset_recommendation(scores)
+    best = min(scores, key=lambda s: s.mean("composite_error"))
+    assert universal.indicator_combo[0].expression == best.combo[0].expression()
+    assert universal.timeframe == "1h"
+
+
+def test_cross_asset_horizons_keep_their_wall_clock_length_across_timeframes(
+    bars: Callable[..., pl.DataFrame],
+) -> None:
+    contexts = {"AAAUSDT": _context(bars, 1, 1400, 0), "BBBUSDT": _context(bars, 2, 1400, 0)}
+    stacks = [stack_contexts("1h", contexts), stack_contexts("4h", contexts)]
+
+    cfg = RunConfig()
+    cfg.horizon.max_bar = 40
+    cfg.cv.folds = 3
+    combos = [
+        ([CandidateIndicator("a", RollingNode("ema", FieldNode("logret"), 5), 2)], 4, "1h"),
+        ([CandidateIndicator("b", RollingNode("std", FieldNode("close"), 21), 2)], 6, "4h"),
+    ]
+    scores = {score.combo[0].indicator_id: score for score in evaluate_cross_asset(stacks, combos, cfg)}
+
+    # 4 x 1h rounds to 1 bar on 4h, below min_bar, so that combo is only scored on 1h.
+    assert scores["a"].horizons == {"1h": 4}
+    assert set(scores["a"].per_asset) == {"AAAUSDT:1h", "BBBUSDT:1h"}
+    assert scores["b"].horizons == {"1h": 24, "4h": 6}
+    assert len(scores["b"].per_asset) == 4
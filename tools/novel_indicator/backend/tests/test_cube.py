@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import numpy as np
+import polars as pl
+
+from app.research.cube import (
+    build_frontier,
+    build_indicator_cube,
+    frontier_entries,
+    write_cube,
+)
+from app.research.cv import build_purged_walk_forward_folds
+from app.research.indicators.dsl import BinaryNode, FieldNode, RollingNode
+from app.research.indicators.evaluator import EvalCache, evaluate_candidate_horizons
+from app.research.search.candidate import CandidateIndicator
+from app.research.search.optimizer import SearchOutcome
+
+
+def _outcome(seed: int = 4) -> SearchOutcome:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 1200)))
+    ctx = {"close": close, "logret": np.r_[0.0, np.diff(np.log(close))]}
+    folds = build_purged_walk_forward_folds(n_rows=len(close), folds=3, max_horizon=24, purge_bars=4, embargo_bars=4)
+    cands = [
+        CandidateIndicator("ema_ret", RollingNode("ema", FieldNode("logret"), 8), 2),
+        CandidateIndicator("ratio", BinaryNode("div", FieldNode("close"), RollingNode("sma", FieldNode("close"), 30)), 4),
+    ]
+    cache = EvalCache()
+    best = []
+    for cand in cands:
+        feature = np.nan_to_num(cand.root.eval(ctx))
+        best.append((cand, evaluate_candidate_horizons(cand.indicator_id, feature, close, folds, 2, 24, 6, 2, cache)))
+    return SearchOutcome(
+        symbol="BTCUSDT",
+        timeframe="1h",
+        best_candidates=best,
+        best_combo=[cands[0]],
+        combo_score=best[0][1].best_score,
+        folds=folds,
+    )
+
+
+def test_cube_has_a_row_per_scored_horizon_and_frontier_per_candidate(tmp_path) -> None:
+    outcome = _outcome()
+    backtests = {("BTCUSDT", "1h"): {"ema_ret": {"pnl_total": 0.1, "max_drawdown": -0.05, "turnover": 0.2}}}
+    cube = build_indicator_cube("run1", [outcome], backtests)
+
+    assert cube.height == sum(len(ev.all_scores) for _, ev in outcome.best_candidates)
+    assert set(cube["family"].unique()) == {"ema", "div"}
+    assert cube["horizon_time_ms"].to_list() == [h * 3_600_000 for h in cube["horizon_bar"].to_list()]
+    assert cube["calibration_error"].is_not_null().all()
+
+    frontier = build_frontier(cube)
+    assert frontier.height == 2
+    ema = frontier.filter(pl.col("indicator_id") == "ema_ret").row(0, named=True)
+    assert ema["horizon_bar"] == outcome.best_candidates[0][1].best_horizon
+    assert ema["pnl_total"] == 0.1
+    assert cube.filter(~pl.col("is_best_horizon"))["pnl_total"].is_null().all()
+
+    entries = frontier_entries(frontier)
+    assert [e.indicator_id for e in entries] == frontier["indicator_id"].to_list()
+    assert all(0.0 <= e.novelty_score <= 1.0 for e in entries)
+
+    summary = write_cube(tmp_path, cube, frontier)
+    assert summary.rows == cube.height
+    assert summary.candidates == 2
+    assert sum(summary.family_counts.values()) == 2
+    assert pl.read_parquet(summary.path).equals(cube)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.container import get_cube_query_service
+from app.core.schemas import CubeQuery
+from app.data.storage import ArtifactStore
+from app.db.cube_query import JSON_MAX_ROWS, CubeQueryService, build_cube_sql
+from app.db.sqlite import Database
+from app.main import app
+from app.research.cube import CUBE_FILE, CUBE_SCHEMA
+
+
+def _cube(run_id: str, offset: float) -> pl.DataFrame:
+    rows = []
+    for tf, step in (("5m", 300_000), ("1h", 3_600_000)):
+        for i, expr in enumerate(["ema(logret,8)", "sma(close,30)", "std(close,21)"]):
+            for h in (4, 12):
+                rows.append(
+                    {
+                        "run_id": run_id,
+                        "symbol": "BTCUSDT",
+                        "timeframe": tf,
+                        "indicator_id": f"c{i}",
+                        "expression": expr,
+                        "family": expr.split("(")[0],
+                        "complexity": 2,
+                        "novelty_score": 0.5,
+                        "horizon_bar": h,
+                        "horizon_time_ms": h * step,
+                        "normalized_rmse": 1.0,
+                        "normalized_mae": 1.0,
+                        "calibration_error": 0.01,
+                        "composite_error": offset + i * 0.1 + h * 0.001,
+                        "directional_hit_rate": 0.5,
+                        "pnl_total": None,
+                        "max_drawdown": None,
+                        "turnover": None,
+                        "stability_score": 1.0,
+                        "is_best_horizon": h == 4,
+                    }
+                )
+    return pl.DataFrame(rows, schema=CUBE_SCHEMA)
+
+
+def _service(tmp_path: Path) -> tuple[Database, CubeQueryService]:
+    db = Database(tmp_path / "ni.sqlite3")
+    store = ArtifactStore(tmp_path / "runs")
+    for run_id, offset in (("r1", 1.0), ("r2", 0.5)):
+        db.create_run(run_id=run_id, config_json={}, config_hash="h")
+        _cube(run_id, offset).write_parquet(store.run_dir(run_id) / CUBE_FILE)
+    db.create_run(run_id="r3", config_json={}, config_hash="h")
+    return db, CubeQueryService(db, store)
+
+
+def test_best_expression_per_timeframe_across_runs(tmp_path: Path) -> None:
+    db, service = _service(tmp_path)
+    query = CubeQuery(
+        columns=["timeframe", "expression", "run_id", "composite_error"],
+        group_by=["timeframe"],
+        per_group=1,
+        order_by=[{"column": "composite_error"}],
+    )
+    result = service.execute(query)
+    db.close()
+
+    assert sorted(result.runs) == ["r1", "r2"]
+    assert result.columns == ["timeframe", "expression", "run_id", "composite_error"]
+    assert len(result.rows) == 2
+    assert {tuple(row[1:3]) for row in result.rows} == {("ema(logret,8)", "r2")}
+
+
+def test_aggregates_and_arrow_stream(tmp_path: Path) -> None:
+    db, service = _service(tmp_path)
+    query = CubeQuery(
+        run_ids=["r1"],
+        filters=[{"column": "is_best_horizon", "op": "eq", "value": True}],
+        group_by=["family"],
+        aggregates=[{"column": "composite_error", "agg": "min"}, {"column": "horizon_bar", "agg": "arg_min", "by": "composite_error"}],
+        order_by=[{"column": "min_composite_error"}],
+    )
+    result = service.execute(query)
+    assert result.columns == ["family", "min_composite_error", "arg_min_horizon_bar_by_composite_error"]
+    assert [row[0] for row in result.rows] == ["ema", "sma", "std"]
+
+    app.dependency_overrides[get_cube_query_service] = lambda: service
+    try:
+        with TestClient(app) as client:
+            response = client.post("/api/runs/query", params={"format": "arrow"}, json=query.model_dump(mode="json"))
+            bad = client.post("/api/runs/query", json={"columns": ["symbol; DROP TABLE runs"]})
+    finally:
+        app.dependency_overrides.clear()
+        db.close()
+
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column_names == result.columns
+    assert table.column("family").to_pylist() == ["ema", "sma", "std"]
+    assert bad.status_code == 400
+
+
+def test_build_cube_sql_rejects_unknown_columns() -> None:
+    with pytest.raises(ValueError):
+        build_cube_sql(CubeQuery(filters=[{"column": "1=1 OR run_id", "value": 1}]))
+    with pytest.raises(ValueError):
+        build_cube_sql(CubeQuery(columns=["symbol"], per_group=1))
+
+
+def test_query_rejects_unknown_and_escaping_run_ids(tmp_path: Path) -> None:
+    db, service = _service(tmp_path)
+    (tmp_path / CUBE_FILE).write_bytes(b"")
+    # A run row whose id walks out of runs_dir must still be refused by the path check.
+    db.create_run(run_id="..", config_json={}, config_hash="h")
+    try:
+        with pytest.raises(ValueError, match="Unknown run ids"):
+            service.resolve_runs(CubeQuery(run_ids=["r1", "../.."]))
+        with pytest.raises(ValueError, match="outside the runs directory"):
+            service.resolve_runs(CubeQuery(run_ids=[".."]))
+        assert [run_id for run_id, _ in service.resolve_runs(CubeQuery(run_ids=["r1", "r3"]))] == ["r1"]
+    finally:
+        db.close()
+
+
+def test_json_results_are_capped_and_large_queries_go_to_arrow(tmp_path: Path) -> None:
+    db, service = _service(tmp_path)
+    app.dependency_overrides[get_cube_query_service] = lambda: service
+    try:
+        with TestClient(app) as client:
+            body = {"columns": ["run_id"], "limit": JSON_MAX_ROWS + 1}
+            too_big = client.post("/api/runs/query", json=body)
+            streamed = client.post("/api/runs/query", params={"format": "arrow"}, json=body)
+    finally:
+        app.dependency_overrides.clear()
+        db.close()
+
+    assert too_big.status_code == 400
+    assert "format=arrow" in too_big.json()["detail"]
+    assert streamed.status_code == 200
+    assert pa.ipc.open_stream(streamed.content).read_all().num_rows == 24
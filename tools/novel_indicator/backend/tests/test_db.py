@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from app.core.schemas import RunStageEnum, RunStatusEnum
+from app.db.sqlite import Database
+
+
+def test_database_uses_wal_and_flushes_buffered_writes(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3", flush_interval_seconds=60.0)
+    try:
+        assert db.journal_mode().lower() == "wal"
+        db.create_run(run_id="r1", config_json={}, config_hash="h")
+        db.add_log("r1", RunStageEnum.created, "first")
+        db.record_progress("r1", RunStatusEnum.running, RunStageEnum.ingest, 0.2, "second")
+        db.add_log("r1", RunStageEnum.ingest, "third")
+        db.add_artifact("r1", "bars", "/tmp/bars.parquet")
+
+        assert [row["message"] for row in db.get_logs("r1")] == ["first", "second", "third"]
+        assert [row["path"] for row in db.get_artifacts("r1")] == ["/tmp/bars.parquet"]
+        assert db.get_run("r1")["stage"] == RunStageEnum.ingest.value
+    finally:
+        db.close()
+
+
+def test_database_reads_during_concurrent_writes(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3", flush_interval_seconds=0.01, max_buffered_writes=16)
+    errors: list[BaseException] = []
+    try:
+        for i in range(4):
+            db.create_run(run_id=f"r{i}", config_json={}, config_hash="h")
+
+        def writer(run_id: str) -> None:
+            try:
+                for step in range(50):
+                    db.record_progress(run_id, RunStatusEnum.running, RunStageEnum.discovery, step / 50, f"step {step}")
+                    db.add_log(run_id, RunStageEnum.discovery, f"detail {step}")
+            except BaseException as exc:  # pragma: no cover - surfaced through the assertion below
+                errors.append(exc)
+
+        def reader() -> None:
+            try:
+                for _ in range(100):
+                    db.list_runs(limit=10)
+                    db.get_run("r0")
+            except BaseException as exc:  # pragma: no cover
+                errors.append(exc)
+
+        threads = [threading.Thread(target=writer, args=(f"r{i}",)) for i in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert all(len(db.get_logs(f"r{i}")) == 100 for i in range(4))
+    finally:
+        db.close()
+
+
+def test_run_summaries_page_by_cursor_with_latest_log(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3")
+    try:
+        for i in range(5):
+            db.create_run(run_id=f"r{i}", config_json={}, config_hash="h")
+            db.add_log(f"r{i}", RunStageEnum.created, f"r{i} created")
+            db.add_log(f"r{i}", RunStageEnum.ingest, f"r{i} latest")
+        db.update_run_status("r3", RunStatusEnum.failed, RunStageEnum.ingest, 0.1, error="boom")
+
+        first = db.list_run_summaries(limit=3)
+        assert [row["run_id"] for row in first] == ["r4", "r3", "r2"]
+        assert first[0]["log_message"] == "r4 latest"
+        rest = db.list_run_summaries(limit=3, cursor=(first[-1]["created_at"], first[-1]["run_id"]))
+        assert [row["run_id"] for row in rest] == ["r1", "r0"]
+
+        failed = db.list_run_summaries(limit=10, status=RunStatusEnum.failed)
+        assert [row["run_id"] for row in failed] == ["r3"]
+
+        logs = db.get_logs_for_runs(["r0", "r1"], limit_per_run=1)
+        assert [row["message"] for row in logs["r0"]] == ["r0 created"]
+        assert len(logs["r1"]) == 1
+    finally:
+        db.close()
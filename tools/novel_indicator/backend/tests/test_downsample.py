@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.core.container import get_db
+from app.db.sqlite import Database
+from app.main import app
+from app.reporting.downsample import (
+    DEFAULT_MAX_POINTS,
+    downsample_line,
+    lttb_indices,
+    minmax_envelope,
+)
+
+
+def test_lttb_keeps_endpoints_and_spikes() -> None:
+    rng = np.random.default_rng(0)
+    y = np.cumsum(rng.normal(size=10_000))
+    y[7_321] += 500.0
+    picks = lttb_indices(y, 400)
+    assert len(picks) == 400
+    assert picks[0] == 0 and picks[-1] == len(y) - 1
+    assert np.all(np.diff(picks) > 0)
+    assert 7_321 in picks
+    np.testing.assert_array_equal(lttb_indices(y[:50], 400), np.arange(50))
+
+
+def test_envelope_brackets_every_bucket() -> None:
+    y = np.sin(np.linspace(0.0, 40.0, 5_000))
+    starts, means, lows, highs = minmax_envelope(y, 100)
+    assert len(starts) == 100
+    bounds = np.r_[starts, len(y)]
+    for b in range(100):
+        chunk = y[bounds[b] : bounds[b + 1]]
+        assert lows[0, b] == chunk.min() and highs[0, b] == chunk.max()
+        assert np.isclose(means[0, b], chunk.mean())
+
+
+def test_downsample_line_shares_x_across_ragged_series() -> None:
+    rng = np.random.default_rng(1)
+    payload = {
+        "title": "t",
+        "type": "line",
+        "x": list(range(6_000)),
+        "series": [
+            {"name": "long", "values": np.cumsum(rng.normal(size=6_000))},
+            {"name": "short", "values": np.cumsum(rng.normal(size=2_000)).tolist()},
+        ],
+    }
+    out = downsample_line(payload, 300)
+    assert len(out["x"]) == 300
+    assert len(out["series"][0]["values"]) == 300
+    assert len(out["series"][1]["values"]) == sum(1 for x in out["x"] if x < 2_000)
+    assert out["downsample"] == {"mode": "lttb", "source_points": 6_000}
+
+    again = downsample_line(out, 100, mode="envelope")
+    assert len(again["x"]) == 100
+    assert again["downsample"]["source_points"] == 6_000
+    assert all(lo <= hi for lo, hi in zip(again["series"][0]["min"], again["series"][0]["max"]))
+
+
+def test_plot_endpoint_downsamples_on_request(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3")
+    db.create_run(run_id="r1", config_json={}, config_hash="h")
+    values = np.sin(np.linspace(0.0, 20.0, 2_000)).tolist()
+    db.save_plot("r1", "p", {"title": "p", "type": "line", "x": list(range(2_000)), "series": [{"name": "s", "values": values}]})
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        with TestClient(app) as client:
+            full = client.get("/api/runs/r1/plots/p").json()["payload"]
+            small = client.get("/api/runs/r1/plots/p", params={"max_points": 200, "mode": "envelope"}).json()["payload"]
+            bad = client.get("/api/runs/r1/plots/p", params={"mode": "every_nth"})
+    finally:
+        app.dependency_overrides.clear()
+        db.close()
+
+    assert len(full["x"]) == 2_000
+    assert len(small["x"]) == 200 and "min" in small["series"][0]
+    assert small["downsample"]["source_points"] == 2_000
+    assert bad.status_code == 422
+
+
+def test_envelope_from_the_stored_series_keeps_a_spike_lttb_drops(tmp_path: Path) -> None:
+    n = 40_000
+    values = np.sin(np.linspace(0.0, 60.0, n))
+    values[20_000], values[20_001] = 50.0, -50.0
+    # Both spikes share one LTTB bucket at the default resolution, so a stored LTTB copy would keep one.
+    assert not {20_000, 20_001} <= set(lttb_indices(values, DEFAULT_MAX_POINTS).tolist())
+
+    db = Database(tmp_path / "ni.sqlite3")
+    db.create_run(run_id="r1", config_json={}, config_hash="h")
+    db.save_plot("r1", "p", {"title": "p", "type": "line", "x": list(range(n)), "series": [{"name": "s", "values": values.tolist()}]})
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        with TestClient(app) as client:
+            default = client.get("/api/runs/r1/plots/p").json()["payload"]
+            envelope = client.get("/api/runs/r1/plots/p", params={"max_points": 200, "mode": "envelope"}).json()["payload"]
+            fine = client.get("/api/runs/r1/plots/p", params={"max_points": 10_000}).json()["payload"]
+    finally:
+        app.dependency_overrides.clear()
+        db.close()
+
+    assert len(default["x"]) == DEFAULT_MAX_POINTS
+    assert max(envelope["series"][0]["max"]) == 50.0 and min(envelope["series"][0]["min"]) == -50.0
+    assert len(fine["x"]) == 10_000 and fine["downsample"]["source_points"] == n
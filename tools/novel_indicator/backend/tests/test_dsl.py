@@ -2,7 +2,8 @@
 
 import numpy as np
 
-from app.research.indicators.dsl import BinaryNode, FieldNode, RollingNode, sanitize_series
+from app.research.indicators.dsl import BinaryNode, FieldNode, RollingNode, sanitize_block, sanitize_series
+from app.research.indicators.generator import IndicatorGenerator
 
 
 def test_indicator_eval_and_pine_translation() -> None:
@@ -29,3 +30,54 @@ def test_indicator_eval_and_pine_translation() -> None:
     pine = node.to_pine()
     assert 'ta.ema' in pine
     assert 'ta.sma' in pine
+
+
+def test_indicator_eval_broadcasts_over_stacked_symbols() -> None:
+    rng = np.random.default_rng(5)
+    closes = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, (3, 300)), axis=1))
+    stacked = {
+        'open': closes,
+        'high': closes * 1.01,
+        'low': closes * 0.99,
+        'close': closes,
+        'volume': rng.uniform(1.0, 2.0, closes.shape),
+        'hlc3': closes,
+        'ohlc4': closes,
+        'logret': np.zeros_like(closes),
+        'range': closes * 0.02,
+    }
+    for cand in IndicatorGenerator(seed=9).generate_pool(size=30):
+        block = np.broadcast_to(cand.root.eval(stacked), closes.shape)
+        for row in range(closes.shape[0]):
+            single = cand.root.eval({name: values[row] for name, values in stacked.items()})
+            np.testing.assert_allclose(block[row], single, rtol=1e-12, equal_nan=True)
+
+
+def _reference_sanitize(x: np.ndarray) -> np.ndarray:
+    y = np.array(x, dtype=np.float64)
+    if np.isnan(y).all():
+        return np.zeros_like(y)
+    valid_idx = np.where(~np.isnan(y))[0]
+    y[: valid_idx[0]] = y[valid_idx[0]]
+    for i in range(valid_idx[0] + 1, len(y)):
+        if np.isnan(y[i]):
+            y[i] = y[i - 1]
+    y[np.isinf(y)] = 0.0
+    return y
+
+
+def test_sanitize_matches_reference_forward_fill() -> None:
+    rng = np.random.default_rng(4)
+    rows = []
+    for _ in range(200):
+        x = rng.normal(size=40)
+        x[rng.random(40) < rng.random()] = np.nan
+        x[rng.random(40) < 0.1] = np.inf
+        x[rng.random(40) < 0.05] = -np.inf
+        np.testing.assert_array_equal(sanitize_series(x), _reference_sanitize(x))
+        rows.append(x)
+    rows[3][:] = np.nan
+
+    block = np.vstack(rows)
+    np.testing.assert_array_equal(sanitize_block(block), np.vstack([_reference_sanitize(r) for r in rows]))
+    assert len(sanitize_series(np.array([]))) == 0
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.research.cv import build_purged_walk_forward_folds
+from app.research.indicators.evaluator import (
+    EvalCache,
+    evaluate_candidate_horizons,
+    evaluate_feature_combo,
+    materialize_predictions,
+)
+
+
+def test_cached_scores_are_compact_and_predictions_rematerialize_identically() -> None:
+    rng = np.random.default_rng(2)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 1500)))
+    feature = np.r_[0.0, np.diff(np.log(close))]
+    folds = build_purged_walk_forward_folds(n_rows=len(close), folds=3, max_horizon=30, purge_bars=5, embargo_bars=5)
+
+    evaluation = evaluate_candidate_horizons("f", feature, close, folds, 2, 30, 8, 2, EvalCache())
+    assert all(score.predictions is None for score in evaluation.all_scores.values())
+    with pytest.raises(ValueError):
+        _ = evaluation.best_score.y_true
+
+    full = evaluate_feature_combo("f", feature[:, None], close, folds, evaluation.best_horizon, keep_predictions=True)
+    lazy = materialize_predictions(evaluation.best_score, feature[:, None], close, folds)
+    assert lazy.composite_error == pytest.approx(evaluation.best_score.composite_error)
+    np.testing.assert_array_equal(lazy.y_pred, full.y_pred)
+    np.testing.assert_array_equal(lazy.y_true, full.y_true)
+    assert len(lazy.close_ref) == len(lazy.y_true) > 0
+
+
+def test_adaptive_horizon_search_finds_the_optimum_with_fewer_fits() -> None:
+    rng = np.random.default_rng(7)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 2000)))
+    folds = build_purged_walk_forward_folds(n_rows=len(close), folds=3, max_horizon=96, purge_bars=5, embargo_bars=5)
+    logc = np.log(close)
+    for lead in (11, 27, 40):
+        # A noisy leak of the return `lead` bars ahead puts the error minimum mid-range.
+        future = np.r_[logc[lead:] - logc[:-lead], np.zeros(lead)]
+        feature = future + rng.normal(0.0, 0.2 * future.std(), len(close))
+        feature /= feature.std()
+
+        dense = evaluate_candidate_horizons("f", feature, close, folds, 3, 96, 1, 0, EvalCache())
+        grid = evaluate_candidate_horizons("f", feature, close, folds, 3, 96, 12, 8, EvalCache())
+        adaptive = evaluate_candidate_horizons("f", feature, close, folds, 3, 96, 12, 8, EvalCache(), mode="adaptive")
+        assert adaptive.best_horizon == dense.best_horizon == lead
+        assert adaptive.best_score.composite_error == pytest.approx(dense.best_score.composite_error)
+        assert len(adaptive.all_scores) * 2 < len(grid.all_scores)
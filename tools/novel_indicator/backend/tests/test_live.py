@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import polars as pl
+import pytest
+
+from app.research.indicators.dsl import (
+    BinaryNode,
+    FieldNode,
+    RollingNode,
+    sanitize_series,
+)
+from app.research.indicators.evaluator import (
+    build_baseline_matrix,
+    build_context,
+    fit_final_model,
+)
+from app.research.live import LiveForecaster, LiveModelSpec, live_models_payload
+from app.research.search.candidate import CandidateIndicator
+from app.research.search.optimizer import run_indicator_search
+from benchmarks.suite import benchmark_config
+
+
+def test_live_forecaster_matches_batch_predictions_and_tracks_error(bars: Callable[..., pl.DataFrame]) -> None:
+    frame = bars(900, seed=3, step_ms=300_000)
+    ctx = build_context(frame)
+    combo = [
+        CandidateIndicator("c1", RollingNode("ema", FieldNode("logret"), 8), 2),
+        CandidateIndicator("c2", BinaryNode("div", FieldNode("range"), RollingNode("sma", FieldNode("close"), 13)), 4),
+    ]
+    features = np.column_stack([sanitize_series(c.root.eval(ctx)) for c in combo])
+    horizon = 6
+    model = fit_final_model(features, ctx["close"], horizon)
+
+    spec = LiveModelSpec.from_dict(
+        LiveModelSpec(symbol="BTCUSDT", timeframe="5m", horizon=horizon, candidates=combo, coef=model.coef_).to_dict()
+    )
+    forecaster = LiveForecaster(spec)
+    rows = list(frame.iter_rows(named=True))
+    forecaster.warm_up(rows[:600])
+    live = [forecaster.update(row) for row in rows[600:]]
+
+    design = np.column_stack([features, build_baseline_matrix(ctx["close"])])
+    expected = ctx["close"] * (1.0 + np.clip(model.predict(design), -0.8, 0.8))
+    np.testing.assert_allclose([f["forecast"] for f in live], expected[600:], rtol=1e-8)
+
+    status = forecaster.status()
+    assert status["realized"]["count"] == len(rows) - 600
+    assert status["mean_latency_us"] is not None
+
+
+def test_search_without_enough_rows_for_the_final_fit_has_no_live_model(
+    monkeypatch: pytest.MonkeyPatch, bars: Callable[..., pl.DataFrame]
+) -> None:
+    def too_few_rows(*_: object) -> None:
+        raise ValueError("Insufficient rows to fit final combo model")
+
+    monkeypatch.setattr("app.research.search.optimizer.fit_final_model", too_few_rows)
+    config = benchmark_config()
+    config.search.candidate_pool_size = 12
+    outcome = run_indicator_search(bars(900, seed=3, step_ms=300_000), "AAAUSDT", "5m", config)
+    assert outcome.combo_coef is None
+    assert live_models_payload("r", [outcome])["models"] == []
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.research.cv import build_purged_walk_forward_folds
+from app.research.indicators.evaluator import EvalCache, evaluate_candidate_horizons
+from app.research.profiling import (
+    Profiler,
+    cache_lookup,
+    current_profiler,
+    get_active_profiler,
+    profiling,
+    span,
+)
+
+
+def test_spans_and_cache_hits_are_recorded_only_while_active() -> None:
+    with span("outside"):
+        pass
+    cache_lookup("outside", True)
+
+    profiler = Profiler(run_id="r1")
+    with profiling(profiler):
+        assert current_profiler() is profiler
+        assert get_active_profiler("r1") is profiler
+        for _ in range(5):
+            with span("work"):
+                pass
+        cache_lookup("feature", True)
+        cache_lookup("feature", False)
+    assert current_profiler() is None
+    assert get_active_profiler("r1") is None
+
+    summary = profiler.summary()
+    assert set(summary["spans"]) == {"work"}
+    assert summary["spans"]["work"]["count"] == 5
+    assert summary["spans"]["work"]["p95_ms"] <= summary["spans"]["work"]["max_ms"]
+    assert summary["caches"]["feature"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_horizon_evaluation_reports_score_cache_hit_rate() -> None:
+    rng = np.random.default_rng(0)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, 1200)))
+    feature = np.r_[0.0, np.diff(np.log(close))]
+    folds = build_purged_walk_forward_folds(n_rows=len(close), folds=3, max_horizon=40, purge_bars=5, embargo_bars=5)
+    cache = EvalCache()
+
+    profiler = Profiler()
+    with profiling(profiler):
+        for _ in range(2):
+            evaluate_candidate_horizons("f", feature, close, folds, 2, 40, 8, 2, cache)
+
+    summary = profiler.summary()
+    scored = summary["spans"]["score_horizon"]["count"]
+    assert summary["spans"]["evaluate_candidate_horizons"]["count"] == 2
+    assert summary["caches"]["horizon_score"]["misses"] == scored
+    assert summary["caches"]["horizon_score"]["hits"] >= scored
+    assert summary["spans"]["ridge_fit"]["count"] >= scored
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.container import get_db, get_report_service
+from app.core.schemas import (
+    AssetRecommendation,
+    IndicatorSpec,
+    ReportStatusEnum,
+    ResultSummary,
+    ScoreCard,
+)
+from app.data.storage import ArtifactStore
+from app.db.sqlite import Database
+from app.main import app
+from app.reporting.report_builder import ReportBuilder
+from app.reporting.report_service import ReportService
+
+
+class _CountingBuilder(ReportBuilder):
+    def __init__(self, store: ArtifactStore) -> None:
+        super().__init__(store)
+        self.html_calls = 0
+        self.pdf_calls = 0
+        self.release = threading.Event()
+        self.html_gates: dict[str, threading.Event] = {}
+        self.fail_pdf = False
+
+    def render_html(self, run_id: str, summary: ResultSummary) -> str:
+        self.html_calls += 1
+        gate = self.html_gates.get(run_id)
+        if gate is not None:
+            gate.wait(5.0)
+        return super().render_html(run_id, summary)
+
+    def write_pdf(self, html: str, pdf_path: Path) -> None:
+        self.release.wait(5.0)
+        if self.fail_pdf:
+            raise RuntimeError("renderer crashed")
+        self.pdf_calls += 1
+        pdf_path.write_bytes(b"%PDF-stub")
+
+
+def _summary(error: float) -> ResultSummary:
+    score = ScoreCard(
+        normalized_rmse=error,
+        normalized_mae=error,
+        calibration_error=0.01,
+        composite_error=error,
+        directional_hit_rate=0.55,
+        pnl_total=0.02,
+        max_drawdown=-0.01,
+        turnover=0.1,
+        stability_score=3.0,
+    )
+    rec = AssetRecommendation(
+        symbol="BTCUSDT",
+        timeframe="1h",
+        best_horizon=12,
+        indicator_combo=[IndicatorSpec(indicator_id="c1", expression="ema(logret,8)", complexity=2)],
+        score=score,
+    )
+    return ResultSummary(
+        run_id="r1",
+        universal_recommendation=rec,
+        per_asset_recommendations=[rec],
+        generated_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_report_is_rendered_once_per_summary_digest(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path / "runs")
+    builder = _CountingBuilder(store)
+    service = ReportService(store, builder=builder)
+    try:
+        first = service.request("r1", _summary(0.9))
+        assert first.pdf_status == ReportStatusEnum.pending
+        assert not first.cached
+        assert Path(first.html_path).read_text(encoding="utf-8")
+        # A repeat request while the PDF is still rendering does not queue a second job.
+        assert service.request("r1", _summary(0.9)).pdf_status == ReportStatusEnum.pending
+
+        builder.release.set()
+        assert service.wait("r1", timeout=5.0).pdf_status == ReportStatusEnum.ready
+        again = service.request("r1", _summary(0.9))
+        assert again.cached and again.pdf_status == ReportStatusEnum.ready
+        assert (builder.html_calls, builder.pdf_calls) == (1, 1)
+
+        changed = service.request("r1", _summary(0.8))
+        assert changed.digest != first.digest and not changed.cached
+        assert service.wait("r1", timeout=5.0).pdf_status == ReportStatusEnum.ready
+        assert (builder.html_calls, builder.pdf_calls) == (2, 2)
+    finally:
+        builder.release.set()
+        service.shutdown()
+
+
+def test_slow_html_for_one_run_does_not_block_another(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path / "runs")
+    builder = _CountingBuilder(store)
+    builder.release.set()
+    builder.html_gates["slow"] = threading.Event()
+    service = ReportService(store, builder=builder)
+    try:
+        slow = threading.Thread(target=service.request, args=("slow", _summary(0.9)))
+        slow.start()
+        done = threading.Event()
+        threading.Thread(target=lambda: (service.request("fast", _summary(0.9)), done.set())).start()
+        assert done.wait(2.0)
+        assert slow.is_alive()
+    finally:
+        builder.html_gates["slow"].set()
+        slow.join(5.0)
+        service.shutdown()
+
+
+def test_report_artifacts_are_registered_once_and_pdf_only_when_written(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3")
+    db.create_run(run_id="r1", config_json={}, config_hash="h")
+    store = ArtifactStore(tmp_path / "runs")
+    builder = _CountingBuilder(store)
+    service = ReportService(store, builder=builder)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_report_service] = lambda: service
+    try:
+        with TestClient(app) as client:
+            db.save_result("r1", _summary(0.9).model_dump(mode="json"))
+            assert client.post("/api/runs/r1/report").json()["pdf_status"] == "pending"
+            queued = [row["artifact_type"] for row in db.get_artifacts("r1")]
+            builder.release.set()
+            service.wait("r1", timeout=5.0)
+
+            db.save_result("r1", _summary(0.8).model_dump(mode="json"))
+            client.post("/api/runs/r1/report")
+            service.wait("r1", timeout=5.0)
+            rerendered = [row["artifact_type"] for row in db.get_artifacts("r1")]
+
+            builder.fail_pdf = True
+            db.save_result("r1", _summary(0.7).model_dump(mode="json"))
+            client.post("/api/runs/r1/report")
+            failed = service.wait("r1", timeout=5.0)
+    finally:
+        app.dependency_overrides.clear()
+        service.shutdown()
+        pdf_rows = [row["path"] for row in db.get_artifacts("r1") if row["artifact_type"] == "report_pdf"]
+        db.close()
+
+    assert queued == ["report_html"]
+    assert sorted(rerendered) == ["report_html", "report_pdf"]
+    assert failed.pdf_status == ReportStatusEnum.failed
+    assert pdf_rows == []
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.container import get_db, get_run_manager
+from app.core.schemas import QueueStateEnum, RunConfig, RunPriorityEnum
+from app.db.sqlite import Database
+from app.main import app
+from app.research.manager import RunManager
+
+
+class _JobRunner:
+    # Stands in for ExperimentRunner: a run is `jobs` units of work with a checkpoint before each one.
+    def __init__(self, db: Database, jobs: dict[str, int], work: Callable[[], None]) -> None:
+        self.db = db
+        self.jobs = jobs
+        self.work = work
+        self.order: list[str] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def execute(
+        self,
+        run_id: str,
+        config: RunConfig,
+        is_cancelled: Callable[[], bool],
+        cancel_requested: Callable[[], bool] | None = None,
+    ) -> None:
+        for _ in range(self.jobs[run_id]):
+            if is_cancelled():
+                return
+            self.release.wait(5.0)
+            self.order.append(run_id)
+            self.work()
+
+
+def _manager(
+    tmp_path: Path, jobs: dict[str, int], work: Callable[[], None], slots: int = 1, max_active_runs: int = 16
+) -> tuple[Database, RunManager]:
+    db = Database(tmp_path / "ni.sqlite3")
+    for run_id in jobs:
+        db.create_run(run_id=run_id, config_json={}, config_hash="h")
+    runner = _JobRunner(db, jobs, work)
+    return db, RunManager(runner, max_workers=slots, max_active_runs=max_active_runs)  # type: ignore[arg-type]
+
+
+def _wait_for(predicate: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_urgent_run_overtakes_long_run_at_next_job_boundary(tmp_path: Path) -> None:
+    db, manager = _manager(tmp_path, {"long": 5, "small": 2}, lambda: time.sleep(0.02))
+    runner = manager.runner
+    runner.release.clear()
+    manager.submit("long", RunConfig(), priority=RunPriorityEnum.batch)
+    _wait_for(lambda: manager.queue().slots_in_use == 1)
+    manager.submit("small", RunConfig(), priority=RunPriorityEnum.urgent)
+    _wait_for(lambda: any(e.state == QueueStateEnum.waiting for e in manager.queue().entries))
+
+    queue = manager.queue()
+    assert [(e.run_id, e.state, e.position) for e in queue.entries] == [
+        ("small", QueueStateEnum.waiting, 1),
+        ("long", QueueStateEnum.running, None),
+    ]
+    time.sleep(0.6)
+    runner.release.set()
+    manager.join("long", 5.0)
+    manager.join("small", 5.0)
+
+    assert runner.order == ["long", "small", "small", "long", "long", "long", "long"]
+    assert manager.queue().entries == []
+    messages = [row["message"] for row in db.get_logs("small", limit=50)]
+    db.close()
+    assert any("urgent priority" in m for m in messages)
+    assert any(m.startswith("Granted worker slot") and "behind 0 run(s)" in m for m in messages)
+
+
+def test_runs_in_the_same_class_share_slots_fairly(tmp_path: Path) -> None:
+    db, manager = _manager(tmp_path, {"a": 4, "b": 4}, lambda: time.sleep(0.03))
+    manager.runner.release.clear()
+    manager.submit("a", RunConfig())
+    _wait_for(lambda: manager.queue().slots_in_use == 1)
+    manager.submit("b", RunConfig())
+    _wait_for(lambda: len(manager.queue().entries) == 2 and manager.queue().entries[1].state == QueueStateEnum.waiting)
+    manager.runner.release.set()
+    manager.join("a", 5.0)
+    manager.join("b", 5.0)
+    db.close()
+
+    order = manager.runner.order
+    assert order[:4] in (["a", "b", "a", "b"], ["a", "b", "b", "a"])
+    assert sorted(order) == ["a"] * 4 + ["b"] * 4
+
+
+def test_cpu_quota_throttles_between_jobs(tmp_path: Path) -> None:
+    def burn() -> None:
+        end = time.thread_time() + 0.2
+        while time.thread_time() < end:
+            pass
+
+    db, manager = _manager(tmp_path, {"q": 3}, burn)
+    started = time.monotonic()
+    manager.submit("q", RunConfig(), cpu_quota=0.25)
+    manager.join("q", 10.0)
+    elapsed = time.monotonic() - started
+    messages = [row["message"] for row in db.get_logs("q", limit=50)]
+    db.close()
+
+    # Two throttles of ~0.6s each: after a job the run may not start the next until CPU/wall <= 25%.
+    assert elapsed > 1.0
+    assert sum(m.startswith("Throttled") for m in messages) == 2
+
+
+def test_cpu_quota_charges_only_the_run_thread(tmp_path: Path) -> None:
+    def burn_on_helper() -> None:
+        def burn() -> None:
+            end = time.thread_time() + 0.2
+            while time.thread_time() < end:
+                pass
+
+        helper = threading.Thread(target=burn)
+        helper.start()
+        helper.join()
+
+    db, manager = _manager(tmp_path, {"q": 3}, burn_on_helper)
+    manager.submit("q", RunConfig(), cpu_quota=0.25)
+    manager.join("q", 10.0)
+    messages = [row["message"] for row in db.get_logs("q", limit=50)]
+    db.close()
+
+    # The helper's CPU is not charged to the run (documented on RunScheduler), so nothing is throttled.
+    assert not any(m.startswith("Throttled") for m in messages)
+
+
+def test_queue_endpoint_and_cancel_while_waiting(tmp_path: Path) -> None:
+    db, manager = _manager(tmp_path, {"x": 3, "y": 3}, lambda: time.sleep(0.01))
+    manager.runner.release.clear()
+    manager.submit("x", RunConfig())
+    _wait_for(lambda: manager.queue().slots_in_use == 1)
+    manager.submit("y", RunConfig(), priority=RunPriorityEnum.batch)
+    _wait_for(lambda: len(manager.queue().entries) == 2 and manager.queue().entries[1].state == QueueStateEnum.waiting)
+
+    app.dependency_overrides[get_run_manager] = lambda: manager
+    try:
+        with TestClient(app) as client:
+            body = client.get("/api/runs/queue").json()
+            assert manager.cancel("y")
+            manager.join("y", 5.0)
+            after = client.get("/api/runs/queue").json()
+            y_status = db.get_run("y")["status"]
+    finally:
+        app.dependency_overrides.clear()
+        manager.runner.release.set()
+        manager.join("x", 5.0)
+        db.close()
+
+    assert body["slots"] == 1 and body["slots_in_use"] == 1
+    assert [(e["run_id"], e["priority"], e["state"]) for e in body["entries"]] == [
+        ("x", "normal", "running"),
+        ("y", "batch", "waiting"),
+    ]
+    assert [e["run_id"] for e in after["entries"]] == ["x"]
+    assert "y" not in manager.runner.order
+    assert y_status == "canceled"
+
+
+def test_active_run_cap_and_resubmit_conflicts(tmp_path: Path) -> None:
+    db, manager = _manager(tmp_path, {"x": 2}, lambda: None, max_active_runs=1)
+    manager.runner.release.clear()
+    manager.submit("x", RunConfig())
+    _wait_for(lambda: manager.queue().slots_in_use == 1)
+
+    app.dependency_overrides[get_run_manager] = lambda: manager
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        with TestClient(app) as client:
+            resumed = client.post("/api/runs/x/resume")
+            created = client.post("/api/runs", json=RunConfig().model_dump(mode="json"))
+            runs = {row["run_id"]: row["status"] for row in db.list_runs()}
+    finally:
+        app.dependency_overrides.clear()
+        manager.runner.release.set()
+        manager.join("x", 5.0)
+        db.close()
+
+    assert resumed.status_code == 409
+    assert created.status_code == 429
+    assert manager.active_runs() == []
+    assert sorted(runs.values()) == ["failed", "queued"]
+
+
+def test_finished_runs_do_not_keep_reader_connections(tmp_path: Path) -> None:
+    runs = {f"r{i:02d}": 2 for i in range(24)}
+    db = Database(tmp_path / "ni.sqlite3")
+    for run_id in runs:
+        db.create_run(run_id=run_id, config_json={}, config_hash="h")
+    manager = RunManager(_JobRunner(db, runs, lambda: db.list_runs(limit=5)), max_workers=3)  # type: ignore[arg-type]
+    for run_id in runs:
+        manager.submit(run_id, RunConfig())
+    for run_id in runs:
+        manager.join(run_id, 5.0)
+    open_readers = db.open_readers()
+    db.close()
+
+    assert len(manager.runner.order) == 48
+    assert open_readers <= 4
+    # Finished runs drop out of the manager's thread table.
+    assert manager._threads == {}
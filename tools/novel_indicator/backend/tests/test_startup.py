@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from benchmarks.startup import STARTUP_BUDGET_SECONDS, profile_startup
+
+
+def test_app_import_stays_light_and_health_is_within_budget() -> None:
+    profile = profile_startup(top=10)
+    assert profile["health_status"] == 200
+    assert profile["loaded"] == [], f"heavy modules imported at startup: {profile['loaded']}"
+    assert profile["total_s"] < STARTUP_BUDGET_SECONDS, profile["slowest_imports"]
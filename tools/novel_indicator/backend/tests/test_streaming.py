@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+import polars as pl
+
+from app.research.indicators.dsl import FieldNode, RollingNode, sanitize_series
+from app.research.indicators.evaluator import build_context
+from app.research.indicators.generator import IndicatorGenerator
+from app.research.indicators.streaming import StreamingIndicator, StreamingIndicatorBank
+from app.research.search.candidate import CandidateIndicator
+
+
+def test_streaming_matches_batch_eval_for_random_trees(bars: Callable[..., pl.DataFrame]) -> None:
+    ctx = build_context(bars())
+    pool = IndicatorGenerator(seed=11).generate_pool(size=60)
+    for cand in pool:
+        batch = cand.root.eval(ctx)
+        streamed = StreamingIndicator.from_candidate(cand).replay(ctx)
+        np.testing.assert_allclose(streamed, batch, rtol=1e-7, atol=1e-9, equal_nan=True, err_msg=cand.expression())
+
+
+def test_streaming_bank_sanitizes_like_batch_after_warmup(bars: Callable[..., pl.DataFrame]) -> None:
+    frame = bars()
+    ctx = build_context(frame)
+    cand = CandidateIndicator(
+        indicator_id="std_close",
+        root=RollingNode(op="std", child=FieldNode("close"), window=21),
+        complexity=2,
+    )
+    bank = StreamingIndicatorBank([cand])
+    streamed = [bank.update_bar(row)["std_close"] for row in frame.iter_rows(named=True)]
+    batch = sanitize_series(cand.root.eval(ctx))
+    np.testing.assert_allclose(np.array(streamed[20:]), batch[20:], rtol=1e-9)
+    assert np.isnan(streamed[0])
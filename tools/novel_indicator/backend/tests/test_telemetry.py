@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.core.container import get_db, get_store
+from app.core.schemas import RunStageEnum, RunStatusEnum
+from app.data.storage import ArtifactStore
+from app.db.sqlite import Database
+from app.main import app
+from app.research.telemetry import (
+    TELEMETRY_FILE,
+    LiveTelemetry,
+    get_live_telemetry,
+    read_jsonl_since,
+    read_jsonl_tail,
+)
+
+
+def _write(path: Path, start: int, count: int) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        for i in range(start, start + count):
+            f.write(json.dumps({"seq": i, "pad": "x" * (i % 17)}) + "\n")
+
+
+def test_tail_and_offset_readers_only_consume_complete_lines(tmp_path: Path) -> None:
+    path = tmp_path / TELEMETRY_FILE
+    _write(path, 0, 500)
+
+    rows, end = read_jsonl_tail(path, limit=7, chunk_size=64)
+    assert [r["seq"] for r in rows] == list(range(493, 500))
+    assert end == path.stat().st_size
+
+    with path.open("a", encoding="utf-8") as f:
+        f.write('{"seq": 500}\n{"seq": 5')
+    rows, offset = read_jsonl_since(path, end)
+    assert [r["seq"] for r in rows] == [500]
+    with path.open("a", encoding="utf-8") as f:
+        f.write('01}\n')
+    rows, offset = read_jsonl_since(path, offset)
+    assert [r["seq"] for r in rows] == [501]
+
+    rows, partial = read_jsonl_since(path, 0, max_lines=3)
+    assert [r["seq"] for r in rows] == [0, 1, 2]
+    rows, _ = read_jsonl_since(path, partial, max_lines=1)
+    assert [r["seq"] for r in rows] == [3]
+
+    # An offset past the end means the file was replaced, so reading restarts from the top.
+    rows, restarted = read_jsonl_since(path, path.stat().st_size + 100, max_lines=1)
+    assert [r["seq"] for r in rows] == [0]
+    assert restarted == len(path.read_bytes().split(b"\n", 1)[0]) + 1
+
+
+def test_telemetry_stream_replays_from_offset_and_ends_with_run(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3")
+    store = ArtifactStore(tmp_path / "runs")
+    db.create_run(run_id="r1", config_json={}, config_hash="h")
+    path = store.run_dir("r1") / TELEMETRY_FILE
+    _write(path, 0, 3)
+    db.update_run_status("r1", RunStatusEnum.completed, RunStageEnum.finished, 1.0)
+
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_store] = lambda: store
+    try:
+        with TestClient(app) as client:
+            body = client.get("/api/runs/r1/telemetry/stream", params={"offset": 0, "poll_seconds": 0.05}).text
+    finally:
+        app.dependency_overrides.clear()
+        db.close()
+
+    events = [block for block in body.split("\n\n") if block.strip()]
+    snapshots = [json.loads(e.split("data: ", 1)[1]) for e in events if "event: snapshot" in e]
+    assert [s["seq"] for s in snapshots] == [0, 1, 2]
+    assert f"id: {path.stat().st_size}" in events[2]
+    assert "event: end" in events[-1]
+
+
+def _progress(telemetry: LiveTelemetry, stage: str, done: float) -> None:
+    telemetry.update(
+        stage=stage,
+        working_on="w",
+        achieved=str(done),
+        remaining="r",
+        overall_done=done,
+        overall_total=10.0,
+        stage_done=done,
+        stage_total=10.0,
+    )
+
+
+def test_live_telemetry_ring_offsets_match_the_flushed_file(tmp_path: Path) -> None:
+    telemetry = LiveTelemetry("r1", tmp_path, tick_seconds=60.0, console=False, min_update_seconds=3600.0)
+    telemetry.start()
+    assert get_live_telemetry("r1") is telemetry
+
+    _progress(telemetry, "ingest", 1.0)
+    _progress(telemetry, "ingest", 2.0)  # rate limited
+    _progress(telemetry, "discovery", 3.0)  # stage change always emits
+    rows, end = telemetry.recent(10)
+    assert [r["achieved"] for r in rows] == ["1.0", "3.0"]
+    assert (tmp_path / TELEMETRY_FILE).stat().st_size == 0
+
+    first, mid = telemetry.since(0, limit=1)
+    assert [r["stage"] for r in first] == ["ingest"]
+    telemetry.stop(final_status="completed", final_message="done")
+    assert get_live_telemetry("r1") is None
+
+    file_rows, file_mid = read_jsonl_since(tmp_path / TELEMETRY_FILE, 0, max_lines=1)
+    assert file_mid == mid and file_rows == first
+    rest, _ = read_jsonl_since(tmp_path / TELEMETRY_FILE, end)
+    assert [r["stage"] for r in rest] == ["discovery"]
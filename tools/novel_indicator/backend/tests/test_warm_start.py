@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.core.schemas import WarmStartModeEnum
+from app.data.storage import ArtifactStore
+from app.research.runner import ExperimentRunner, RunnerDeps
+from app.research.search.optimizer import run_indicator_search
+from app.research.search.warm_start import EliteArchive, run_seeds, warm_start_pool
+from benchmarks.suite import benchmark_config
+from benchmarks.synthetic import synthetic_ohlcv
+
+
+def test_seeded_search_matches_cold_quality_with_a_third_of_the_pool() -> None:
+    frame = synthetic_ohlcv("1h", bars=800, seed=3)
+    config = benchmark_config()
+    cold = run_indicator_search(frame, "AAAUSDT", "1h", config)
+
+    small = config.model_copy(deep=True)
+    small.search.candidate_pool_size = 16
+    seeds = warm_start_pool(run_seeds("AAAUSDT", [cold]), limit=8)
+    assert [cand.indicator_id for cand in seeds] == [f"warm_{i:04d}" for i in range(6)]
+    assert {cand.params["warm_start"] for cand in seeds} == {"sibling"}
+    warm = run_indicator_search(frame, "AAAUSDT", "1h", small, seeds=seeds)
+
+    assert warm.warm_start_seeds == 6
+    best_cold = cold.best_candidates[0][1].best_score.composite_error
+    assert warm.best_candidates[0][1].best_score.composite_error <= best_cold + 1e-12
+    assert warm.best_candidates[0][0].indicator_id.startswith("warm_")
+
+
+def test_elite_archive_keeps_the_best_per_market_and_ranks_seeds(tmp_path: Path) -> None:
+    config = benchmark_config()
+    config.search.candidate_pool_size = 24
+    outcomes = [
+        run_indicator_search(synthetic_ohlcv(timeframe, bars=600, seed=i), symbol, timeframe, config)
+        for i, (symbol, timeframe) in enumerate([("AAAUSDT", "1h"), ("AAAUSDT", "4h"), ("BBBUSDT", "1h")])
+    ]
+    archive = EliteArchive(tmp_path / "elite_archive.json", per_key=3)
+    assert archive.record("r1", outcomes) == 9
+    assert archive.record("r2", outcomes) == 9
+
+    entries = archive.load()
+    assert {e["run_id"] for e in entries} == {"r1"}
+    seeds = archive.seeds("AAAUSDT", "4h")
+    assert [source for source, _ in seeds] == ["archive"] * 9
+    # The 4h elites of the same symbol come first, then its 1h elites, then the other symbol's.
+    own = {cand.signature() for cand, _ in outcomes[1].best_candidates[:3]}
+    assert {cand.signature() for _, cand in seeds[:3]} == own
+
+
+def test_runner_seeds_from_archive_only_in_archive_mode(tmp_path: Path) -> None:
+    store = ArtifactStore(tmp_path / "runs")
+    store.save_bars("r", "CCCUSDT", "1h", synthetic_ohlcv("1h", bars=600, seed=9))
+    config = benchmark_config()
+    config.search.candidate_pool_size = 24
+    donor = run_indicator_search(synthetic_ohlcv("4h", bars=600, seed=8), "DDDUSDT", "4h", config)
+    archive = EliteArchive(tmp_path / "elite_archive.json")
+    archive.record("old", [donor])
+    runner = ExperimentRunner(RunnerDeps(db=None, store=store, binance=None, archive=archive))  # type: ignore[arg-type]
+
+    config.search.warm_start = WarmStartModeEnum.run
+    assert runner.run_search_job("r", "CCCUSDT", "1h", config).outcome.warm_start_seeds == 0
+    config.search.warm_start = WarmStartModeEnum.archive
+    config.search.warm_start_seeds = 4
+    assert runner.run_search_job("r", "CCCUSDT", "1h", config).outcome.warm_start_seeds == 4
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from app.core.schemas import RunConfig
+from app.data.storage import ArtifactStore
+from app.db.sqlite import Database
+from app.research.runner import ExperimentRunner, RunnerDeps, SearchJobResult
+from benchmarks.suite import benchmark_config
+from benchmarks.synthetic import synthetic_ohlcv
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_leases_expire_and_are_retried_until_max_attempts(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3")
+    db.create_run(run_id="r", config_json={}, config_hash="h")
+    db.publish_search_jobs("r", [("AAAUSDT", "1h"), ("BBBUSDT", "1h")], "{}", max_attempts=2)
+
+    first = db.claim_search_job("w1", lease_seconds=0.05)
+    second = db.claim_search_job("w2", lease_seconds=30.0)
+    assert (first["symbol"], second["symbol"]) == ("AAAUSDT", "BBBUSDT")
+    assert db.claim_search_job("w3", lease_seconds=30.0) is None
+
+    time.sleep(0.1)
+    retried = db.claim_search_job("w3", lease_seconds=0.05)
+    assert (retried["job_id"], retried["attempts"]) == (first["job_id"], 2)
+    assert not db.heartbeat_search_job(first["job_id"], "w1", 30.0)
+    assert not db.complete_search_job(first["job_id"], "w1", "stale.pkl")
+    assert db.heartbeat_search_job(second["job_id"], "w2", 30.0)
+    assert db.fail_search_job(second["job_id"], "w2", "boom")
+
+    time.sleep(0.1)
+    # The first job has used both attempts, so only the requeued second job is left to claim.
+    again = db.claim_search_job("w4", lease_seconds=30.0)
+    assert (again["symbol"], again["attempts"]) == ("BBBUSDT", 2)
+    assert db.complete_search_job(again["job_id"], "w4", "done.pkl")
+    jobs = {row["symbol"]: row for row in db.get_search_jobs("r")}
+    db.close()
+    assert jobs["AAAUSDT"]["status"] == "failed" and "Lease expired on attempt 2" in jobs["AAAUSDT"]["error"]
+    assert (jobs["BBBUSDT"]["status"], jobs["BBBUSDT"]["result_path"]) == ("done", "done.pkl")
+
+
+def _wait_for_jobs(db: Database, run_id: str, count: int, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while len(db.get_search_jobs(run_id)) < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def test_worker_processes_drain_the_queue_and_retry_a_dead_lease(tmp_path: Path) -> None:
+    db_path, runs_dir = tmp_path / "ni.sqlite3", tmp_path / "runs"
+    db, store = Database(db_path), ArtifactStore(runs_dir)
+    db.create_run(run_id="q", config_json={}, config_hash="h")
+    jobs = [(symbol, timeframe) for symbol in ("AAAUSDT", "BBBUSDT", "CCCUSDT") for timeframe in ("1h", "4h")]
+    for i, (symbol, timeframe) in enumerate(jobs):
+        store.save_bars("q", symbol, timeframe, synthetic_ohlcv(timeframe, bars=600, seed=i))
+    config: RunConfig = benchmark_config()
+    config.horizon.max_bar = 48
+
+    runner = ExperimentRunner(RunnerDeps(db=db, store=store, binance=None, search_backend="queue", search_poll_seconds=0.05))  # type: ignore[arg-type]
+    results: list[SearchJobResult] = []
+    collector = threading.Thread(target=lambda: results.extend(runner._queued_search_jobs("q", jobs, config, lambda: False)))
+    collector.start()
+    _wait_for_jobs(db, "q", len(jobs))
+    # A worker that leased a job and then died: nobody heartbeats it, so the lease lapses and is retried.
+    ghost = db.claim_search_job("ghost", lease_seconds=1.0)
+
+    env = {**os.environ, "NI_DB_PATH": str(db_path), "NI_RUNS_DIR": str(runs_dir), "NI_TELEMETRY_CONSOLE": "false"}
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-m", "app.worker", "--worker-id", f"w{i}", "--lease-seconds", "5", "--poll-seconds", "0.05", "--exit-when-idle", "2"],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        for i in range(3)
+    ]
+    collector.join(timeout=120)
+    logs = [proc.communicate(timeout=60)[1] for proc in workers]
+    rows = {(row["symbol"], row["timeframe"]): row for row in db.get_search_jobs("q")}
+    db.close()
+
+    assert not collector.is_alive()
+    assert all(proc.returncode == 0 for proc in workers), logs
+    assert sorted((r.symbol, r.timeframe) for r in results) == sorted(jobs)
+    assert all(row["status"] == "done" for row in rows.values())
+    retried = rows[(ghost["symbol"], ghost["timeframe"])]
+    assert retried["attempts"] == 2 and retried["worker_id"] != "ghost"
+    assert len({row["worker_id"] for row in rows.values()}) > 1
+    assert all(r.outcome.symbol == r.symbol and "pnl_total" in r.backtest for r in results)
+
+
+def test_run_thread_stops_waiting_on_canceled_exhausted_or_stalled_jobs(tmp_path: Path) -> None:
+    db = Database(tmp_path / "ni.sqlite3")
+    db.create_run(run_id="c", config_json={}, config_hash="h")
+    store = ArtifactStore(tmp_path / "runs")
+    runner = ExperimentRunner(
+        RunnerDeps(db=db, store=store, binance=None, search_poll_seconds=0.02, search_stall_seconds=0.3, search_job_max_attempts=1)  # type: ignore[arg-type]
+    )
+    jobs = [("AAAUSDT", "1h"), ("BBBUSDT", "1h")]
+    config = RunConfig()
+    polls = []
+
+    def cancel_first_job() -> bool:
+        polls.append(1)
+        if len(polls) == 2:
+            db.cancel_search_jobs("c")
+        return False
+
+    assert list(runner._queued_search_jobs("c", jobs, config, cancel_first_job)) == []
+    assert {row["status"] for row in db.get_search_jobs("c")} == {"canceled"}
+
+    gen = runner._queued_search_jobs("c", jobs, config, lambda: False)
+    claimed = []
+    threading.Timer(0.05, lambda: claimed.append(db.claim_search_job("dead", lease_seconds=0.05))).start()
+    try:
+        next(gen)
+        raise AssertionError("expected the lapsed final lease to fail the run")
+    except RuntimeError as exc:
+        assert "lease of dead expired on the final attempt" in str(exc)
+    assert claimed and claimed[0]["attempts"] == 1
+
+    started = time.monotonic()
+    try:
+        list(runner._queued_search_jobs("c", jobs, config, lambda: False))
+        raise AssertionError("expected a stall with no workers")
+    except RuntimeError as exc:
+        assert "No search worker progress" in str(exc)
+    db.close()
+    assert 0.3 <= time.monotonic() - started < 5.0
+
+
+def test_concurrent_job_result_writers_use_separate_temp_files(tmp_path: Path) -> None:
+    # Threads share a PID just like workers on different hosts can; each must still get its own temp file.
+    store = ArtifactStore(tmp_path / "runs")
+    payloads = [list(range(i, i + 50_000)) for i in range(8)]
+    errors: list[BaseException] = []
+
+    def write(payload: list[int]) -> None:
+        try:
+            for _ in range(5):
+                store.save_job_result("r", "BTCUSDT", "1h", payload)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(payload,)) for payload in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    path = store.jobs_dir("r") / "search_BTCUSDT_1h.pkl"
+    assert store.load_job_result(path) in payloads
+    assert [p.name for p in store.jobs_dir("r").iterdir()] == [path.name]